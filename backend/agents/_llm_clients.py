@@ -0,0 +1,228 @@
+"""Shared LLM plumbing for agents that call OpenAI.
+
+The graph runs several LLM-backed agents concurrently (silver KPIs, risk
+factors, events and governance, then gold risk and memo), and the API can
+run several tickers at once. Routing calls through ``ainvoke_limited`` keeps
+the process as a whole under a fixed number of in-flight requests instead of
+tripping the account's RPM/TPM limits. ``get_structured_llm`` hands out one
+client per (model, temperature, schema), all on one shared ``httpx``
+connection pool (``get_http_client``), so connections are reused across
+agents and tickers instead of rebuilt on every agent call.
+``ainvoke_structured`` adds the persistent response cache on top of both.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable, Hashable
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from backend.data.llm_cache import LlmCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+_M = TypeVar("_M", bound=BaseModel)
+_T = TypeVar("_T")
+
+# Max concurrent OpenAI requests across the whole process
+LLM_MAX_CONCURRENCY = 8
+
+_LLM_CACHE = LlmCache()
+
+# Objects bound to an event loop (semaphores, httpx pools and the clients
+# built on them), for the loop in _scoped_loop. A later ``asyncio.run`` gets
+# fresh ones instead of "bound to a different event loop" errors.
+_loop_scoped: dict[Hashable, Any] = {}
+_scoped_loop: asyncio.AbstractEventLoop | None = None
+
+_HTTP_CLIENT_KEY = "http_client"
+
+
+def loop_scoped(key: Hashable, factory: Callable[[], _T]) -> _T:
+    """Return the object cached under *key* for the running event loop.
+
+    Built with *factory* on first use per loop; everything cached for a
+    previous loop is dropped when the loop changes (the same rule
+    ``EdgarClient._client`` applies to its session). Outside a running loop
+    objects are cached under no loop.
+    """
+    global _scoped_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not _scoped_loop:
+        _loop_scoped.clear()
+        _scoped_loop = loop
+    try:
+        return _loop_scoped[key]
+    except KeyError:
+        value = _loop_scoped[key] = factory()
+        return value
+
+
+# Tokenizer used by gpt-4o / gpt-4o-mini, and the chars-per-token estimate
+# used when its BPE file can't be fetched (tiktoken downloads it on first use)
+_TOKEN_ENCODING = "o200k_base"
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(_TOKEN_ENCODING)
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count of *text* for the OpenAI chat models."""
+    enc = _encoding()
+    if enc is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(enc.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """*text* cut to at most *max_tokens* tokens, with "…" marking a cut."""
+    enc = _encoding()
+    if enc is None:
+        max_chars = max_tokens * _CHARS_PER_TOKEN
+        return text if len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens]).rstrip() + "…"
+
+
+def has_openai_key() -> bool:
+    """Whether OPENAI_API_KEY is set, checked at call time.
+
+    Not cached at import: api.py runs ``load_dotenv()`` after the agents are
+    imported, and tests toggle the key per case with ``patch.dict``.
+    """
+    return bool(os.environ.get("OPENAI_API_KEY"))
+
+
+async def ainvoke_limited(runnable: Any, prompt: Any) -> Any:
+    """``await runnable.ainvoke(prompt)`` under the process-wide concurrency cap."""
+    semaphore = loop_scoped(
+        "llm_semaphore", lambda: asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    )
+    async with semaphore:
+        return await runnable.ainvoke(prompt)
+
+
+def _build_http_client() -> Any:
+    import httpx
+    from openai import DefaultAsyncHttpxClient
+
+    # The OpenAI SDK's defaults (timeouts, redirects), with a larger pool
+    return DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+
+
+def get_http_client() -> Any:
+    """The ``httpx.AsyncClient`` shared by every OpenAI client on this loop.
+
+    One connection pool for all models, so keep-alive connections (and their
+    TLS sessions) to api.openai.com are reused across agents and tickers.
+    """
+    return loop_scoped(_HTTP_CLIENT_KEY, _build_http_client)
+
+
+async def aclose_http_client() -> None:
+    """Close this loop's OpenAI connection pool and the clients built on it."""
+    if _scoped_loop is not asyncio.get_running_loop():
+        return  # Nothing was opened on this loop
+    client = _loop_scoped.get(_HTTP_CLIENT_KEY)
+    _loop_scoped.clear()
+    if client is not None:
+        await client.aclose()
+
+
+def get_llm(model: str, temperature: float = 0) -> Any:
+    """Return the shared ``ChatOpenAI`` client for *model*/*temperature*.
+
+    Built on first use (per event loop), after ``load_dotenv()`` has
+    populated the API key.
+    """
+
+    def build() -> Any:
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            model=model, temperature=temperature, http_async_client=get_http_client()
+        )
+
+    return loop_scoped(("llm", model, temperature), build)
+
+
+def get_structured_llm(model: str, temperature: float, schema: type) -> Any:
+    """Return a cached ``with_structured_output(schema)`` runnable on ``get_llm``.
+
+    Pinned to OpenAI Structured Outputs with ``strict=True``: decoding is
+    constrained to the schema, so a response always parses on the first
+    round-trip instead of failing validation and being re-requested.
+    """
+    return loop_scoped(
+        ("structured_llm", model, temperature, schema),
+        lambda: get_llm(model, temperature).with_structured_output(
+            schema, method="json_schema", strict=True
+        ),
+    )
+
+
+async def lookup_cached(
+    model: str, temperature: float, schema: type[_M], prompt: Any
+) -> _M | None:
+    """Return the cached response for these inputs, or None on a miss.
+
+    *model* may be any label that identifies how the response was produced,
+    e.g. a tier list, as long as the writer used the same one.
+    """
+    key = cache_key(model, temperature, schema, prompt)
+    cached = await asyncio.to_thread(_LLM_CACHE.get, key)
+    if cached is None:
+        return None
+    try:
+        return schema.model_validate_json(cached)
+    except ValueError:
+        return None  # Schema changed since the entry was written
+
+
+async def store_cached(
+    model: str, temperature: float, schema: type[_M], prompt: Any, result: _M
+) -> None:
+    """Persist *result* under the same key ``lookup_cached`` reads."""
+    key = cache_key(model, temperature, schema, prompt)
+    await asyncio.to_thread(_LLM_CACHE.put, key, result.model_dump_json())
+
+
+async def ainvoke_structured(
+    model: str, temperature: float, schema: type[_M], prompt: Any
+) -> _M:
+    """Structured LLM call served from the response cache when possible.
+
+    Identical (model, temperature, schema, prompt) inputs return the stored
+    response without calling OpenAI; misses are invoked under the concurrency
+    cap and written back.
+    """
+    cached = await lookup_cached(model, temperature, schema, prompt)
+    if cached is not None:
+        return cached
+
+    result = await ainvoke_limited(
+        get_structured_llm(model, temperature, schema), prompt
+    )
+    await store_cached(model, temperature, schema, prompt, result)
+    return result
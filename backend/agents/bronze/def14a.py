@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from backend.data.csv_writer import CsvWriter
-from backend.data.edgar_filings import EdgarFilingsClient, EdgarFilingsError
+from backend.data.edgar_filings import EdgarFilingsError, get_shared_client
 from backend.models import PipelineState
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ async def bronze_def14a_agent(state: PipelineState) -> dict:
     errors: list[str] = []
 
     try:
-        client = EdgarFilingsClient()
+        client = get_shared_client()
         proxy_data = await client.get_def14a(ticker)
     except (EdgarFilingsError, Exception) as e:
         logger.warning(f"DEF 14A fetch failed for {ticker}: {e}")
@@ -40,9 +41,10 @@ async def bronze_def14a_agent(state: PipelineState) -> dict:
     logger.info("DEF 14A for %s: %d chars", ticker, len(raw_text))
 
     writer = CsvWriter(ticker)
-    path = writer.write_bronze(
+    path = await asyncio.to_thread(
+        writer.write_bronze,
         "def14a_proxy",
-        [{"ticker": ticker.upper(), "filing_date": proxy_data.get("filing_date", ""), "proxy_text": raw_text}],
+        [{"ticker": ticker, "filing_date": proxy_data.get("filing_date", ""), "proxy_text": raw_text}],
         source_url="https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&type=DEF+14A",
     )
 
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from backend.data.csv_writer import CsvWriter
-from backend.data.edgar_filings import EdgarFilingsClient, EdgarFilingsError
+from backend.data.edgar_filings import EdgarFilingsError, get_shared_client
 from backend.models import PipelineState
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ async def bronze_8k_agent(state: PipelineState) -> dict:
     errors: list[str] = []
 
     try:
-        client = EdgarFilingsClient()
+        client = get_shared_client()
         events = await client.get_8k_filings(ticker, months=12)
     except (EdgarFilingsError, Exception) as e:
         logger.warning(f"8-K fetch failed for {ticker}: {e}")
@@ -37,7 +38,8 @@ async def bronze_8k_agent(state: PipelineState) -> dict:
         }
 
     writer = CsvWriter(ticker)
-    path = writer.write_bronze(
+    path = await asyncio.to_thread(
+        writer.write_bronze,
         "8k_filings",
         events,
         source_url="https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&type=8-K",
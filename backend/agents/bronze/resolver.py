@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
 from backend.data.csv_writer import CsvWriter
-from backend.data.edgar_client import EdgarClient, EdgarClientError
+from backend.data.edgar_client import EdgarClientError, get_shared_client
 from backend.models import CompanyInfo, PipelineState
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,7 @@ async def bronze_resolver_agent(state: PipelineState) -> dict:
     errors: list[str] = []
 
     try:
-        client = EdgarClient()
+        client = get_shared_client()
         cik = await client.resolve_cik(ticker)
         company_info = await client.get_company_info(cik)
     except EdgarClientError as e:
@@ -30,8 +31,8 @@ async def bronze_resolver_agent(state: PipelineState) -> dict:
         errors.append(f"Bronze resolver: {e}")
         # Minimal offline company info
         company_info = CompanyInfo(
-            ticker=ticker.upper(),
-            company_name=f"{ticker.upper()} (offline)",
+            ticker=ticker,
+            company_name=f"{ticker} (offline)",
             cik="0000000000",
         )
 
@@ -40,7 +41,8 @@ async def bronze_resolver_agent(state: PipelineState) -> dict:
     row = company_info.model_dump()
     # Flatten exchanges list to comma-separated string for CSV
     row["exchanges"] = ",".join(row.get("exchanges", []))
-    path = writer.write_bronze(
+    path = await asyncio.to_thread(
+        writer.write_bronze,
         "company_info",
         [row],
         source_url="https://data.sec.gov/submissions/",
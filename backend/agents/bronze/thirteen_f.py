@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from backend.data.csv_writer import CsvWriter
-from backend.data.edgar_filings import EdgarFilingsClient, EdgarFilingsError
+from backend.data.edgar_filings import EdgarFilingsError, get_shared_client
 from backend.models import PipelineState
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,7 @@ async def bronze_13f_agent(state: PipelineState) -> dict:
     errors: list[str] = []
 
     try:
-        client = EdgarFilingsClient()
+        client = get_shared_client()
         holders = await client.get_institutional_holders(ticker)
     except (EdgarFilingsError, Exception) as e:
         logger.warning(f"SC 13G fetch failed for {ticker}: {e}")
@@ -41,7 +42,8 @@ async def bronze_13f_agent(state: PipelineState) -> dict:
         }
 
     writer = CsvWriter(ticker)
-    path = writer.write_bronze(
+    path = await asyncio.to_thread(
+        writer.write_bronze,
         "13f_holdings",
         holders,
         source_url="https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&type=SC+13G",
@@ -2,16 +2,51 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
+import pandas as pd
+
 from backend.data.csv_writer import CsvWriter
-from backend.data.edgar_client import EdgarClient, EdgarClientError
+from backend.data.edgar_client import EdgarClient, EdgarClientError, get_shared_client
 from backend.models import FinancialFact, PipelineState
 
 logger = logging.getLogger(__name__)
 
 
+def _try_fallback(ticker: str) -> list[FinancialFact] | None:
+    """Load the bundled offline facts for ``ticker``, or None if there are none.
+
+    Only reached once the live fetch is unavailable, so the happy path never
+    touches the filesystem.
+    """
+    fallback_path = Path("examples") / f"{ticker}_bronze_facts.csv"
+    if not fallback_path.exists():
+        return None
+    return EdgarClient.load_bronze_csv(fallback_path)
+
+
+def _write_facts(writer: CsvWriter, facts: list[FinancialFact]) -> Path:
+    # FinancialFact holds only flat scalars, so its __dict__ round-trips to CSV
+    # losslessly; skipping model_dump() matters for filers with 50k+ facts.
+    df = pd.DataFrame([f.__dict__ for f in facts], columns=list(FinancialFact.model_fields))
+    return writer.write_bronze(
+        "xbrl_facts",
+        df,
+        source_url="https://data.sec.gov/api/xbrl/companyfacts/",
+    )
+
+
+def _no_data(errors: list[str], message: str) -> dict:
+    return {
+        "bronze_facts": [],
+        "bronze_xbrl_facts_path": None,
+        "errors": errors,
+        "progress_messages": [message],
+    }
+
+
 async def bronze_xbrl_agent(state: PipelineState) -> dict:
     """Fetch all XBRL company facts for the resolved CIK.
 
@@ -24,47 +59,28 @@ async def bronze_xbrl_agent(state: PipelineState) -> dict:
     errors: list[str] = []
 
     if not company_info or company_info.cik == "0000000000":
-        # Try offline fallback
-        fallback_path = Path("examples") / f"{ticker.upper()}_bronze_facts.csv"
-        if fallback_path.exists():
-            facts = EdgarClient.load_bronze_csv(fallback_path)
-            errors.append("Using offline fallback for XBRL facts")
-        else:
+        facts = _try_fallback(ticker)
+        if facts is None:
             errors.append("No CIK available and no offline data for XBRL facts")
-            return {
-                "bronze_facts": [],
-                "bronze_xbrl_facts_path": None,
-                "errors": errors,
-                "progress_messages": ["Bronze XBRL: no data available"],
-            }
+            return _no_data(errors, "Bronze XBRL: no data available")
+        errors.append("Using offline fallback for XBRL facts")
     else:
         try:
-            client = EdgarClient()
+            client = get_shared_client()
             facts = await client.get_company_facts(company_info.cik)
         except EdgarClientError as e:
             logger.warning(f"XBRL fetch failed for {ticker}: {e}")
-            # Try offline fallback
-            fallback_path = Path("examples") / f"{ticker.upper()}_bronze_facts.csv"
-            if fallback_path.exists():
-                facts = EdgarClient.load_bronze_csv(fallback_path)
-                errors.append(f"Using offline fallback: {e}")
-            else:
+            facts = _try_fallback(ticker)
+            if facts is None:
                 errors.append(f"Bronze XBRL: {e}")
-                return {
-                    "bronze_facts": [],
-                    "bronze_xbrl_facts_path": None,
-                    "errors": errors,
-                    "progress_messages": [f"Bronze XBRL: fetch failed — {e}"],
-                }
+                return _no_data(errors, f"Bronze XBRL: fetch failed — {e}")
+            errors.append(f"Using offline fallback: {e}")
 
     # Write bronze table
     writer = CsvWriter(ticker)
-    records = [f.model_dump() for f in facts]
-    path = writer.write_bronze(
-        "xbrl_facts",
-        records,
-        source_url="https://data.sec.gov/api/xbrl/companyfacts/",
-    )
+    # Frame building and CSV encoding run off the event loop so concurrent
+    # bronze agents keep streaming their network responses meanwhile
+    path = await asyncio.to_thread(_write_facts, writer, facts)
 
     logger.info(f"Bronze XBRL: {ticker} → {len(facts)} facts")
 
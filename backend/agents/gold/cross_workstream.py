@@ -2,122 +2,223 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 
+from backend.agents.silver.material_events import index_events_by_code
 from backend.data.csv_writer import CsvWriter
-from backend.models import CrossWorkstreamFlag, PipelineState
+from backend.models import PipelineState
 
 logger = logging.getLogger(__name__)
 
 
-def _evaluate_correlations(state: PipelineState) -> list[dict]:
-    """Apply 6 cross-workstream correlation rules."""
-    flags: list[dict] = []
+# ---------------------------------------------------------------------------
+# Correlation rules — each is a predicate over a shared context plus the
+# evidence it reports; the context is built once per evaluation.
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class _Context:
+    """Snapshot of the silver/gold inputs the rules read, unpacked once."""
+
+    has_kpis: bool
+    revenue_yoy_change: float | None
+    gross_margin: float | None
+    cluster_detected: bool
+    insider_signal: str | None
+    cluster_description: str
+    ceo_pay_growth: float | None
+    board_independence_pct: float | None
+    governance_flags: list[str]
+    items_by_code: dict[str, list[dict]]
+    large_reduction_count: int
+    novel_regulatory: bool
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A cross-workstream correlation rule."""
+
+    name: str
+    severity: str  # Critical / High / Medium
+    description: str
+    workstreams: tuple[str, ...]
+    predicate: Callable[[_Context], bool]
+    evidence: Callable[[_Context], list[str]]
+
+    def build(self, ctx: _Context) -> dict:
+        """Render the flag row for this rule."""
+        return _flag(
+            self.name, self.severity, self.description, list(self.workstreams), self.evidence(ctx)
+        )
+
+
+def _flag(
+    rule_name: str,
+    severity: str,
+    description: str,
+    workstreams_involved: list[str],
+    evidence: list[str],
+) -> dict:
+    """Build a flag dict shaped like ``CrossWorkstreamFlag.model_dump()``.
+
+    The inputs are fixed rule metadata and formatted strings, so validating
+    them through the model on every run would only round-trip the dict.
+    """
+    return {
+        "rule_name": rule_name,
+        "severity": severity,
+        "description": description,
+        "workstreams_involved": workstreams_involved,
+        "evidence": evidence,
+    }
+
+
+def _build_context(state: PipelineState) -> _Context:
+    """Gather every silver/gold input the rules read, pre-aggregated once."""
     kpis = state.get("silver_kpis")
     insider = state.get("silver_insider_signal", {})
-    events = state.get("silver_material_events", [])
     governance = state.get("silver_governance", {})
+    events = state.get("silver_material_events", [])
     holders = state.get("silver_institutional_holders", [])
     risk_factors = state.get("silver_risk_factors", [])
 
-    # Rule 1 — Critical: Insider cluster selling + Revenue decline >10% + Auditor change
-    has_cluster_sell = insider.get("cluster_detected") and insider.get("signal") == "bearish"
-    has_revenue_decline = kpis and kpis.revenue_yoy_change is not None and kpis.revenue_yoy_change < -0.10
-    has_auditor_change = any(e.get("item_code") == "4.01" for e in events)
-    if has_cluster_sell and has_revenue_decline and has_auditor_change:
-        flags.append(CrossWorkstreamFlag(
-            rule_name="Insider+Revenue+Auditor", severity="Critical",
-            description="Insider cluster selling coincides with >10% revenue decline and an auditor change.",
-            workstreams_involved=["insider_signal", "financial_kpis", "material_events"],
-            evidence=[
-                f"Revenue decline: {kpis.revenue_yoy_change:.1%}",
-                f"Insider: {insider.get('cluster_description', '')}",
-                "8-K Item 4.01: auditor change filed",
-            ],
-        ).model_dump())
+    # silver_material_events indexes events by item code; only re-index when
+    # the state carries the flat list alone
+    items_by_code = state.get("silver_material_events_by_code") or index_events_by_code(events)
+
+    return _Context(
+        has_kpis=kpis is not None,
+        revenue_yoy_change=kpis.revenue_yoy_change if kpis else None,
+        gross_margin=kpis.gross_margin if kpis else None,
+        cluster_detected=bool(insider.get("cluster_detected")),
+        insider_signal=insider.get("signal"),
+        cluster_description=insider.get("cluster_description", ""),
+        ceo_pay_growth=governance.get("ceo_pay_growth"),
+        board_independence_pct=governance.get("board_independence_pct"),
+        governance_flags=governance.get("governance_flags", []),
+        items_by_code=items_by_code,
+        # Only the count matters to rule 5, so don't materialize the matches
+        large_reduction_count=sum(
+            1 for h in holders
+            if (change := h.get("change_pct")) is not None and change < -0.20
+        ),
+        novel_regulatory=any(
+            rf.get("is_novel") and rf.get("category") == "regulatory" for rf in risk_factors
+        ),
+    )
 
-    # Rule 2 — Critical: 8-K Item 4.02 (non-reliance on financials)
-    if any(e.get("item_code") == "4.02" for e in events) and kpis:
-        flags.append(CrossWorkstreamFlag(
-            rule_name="Non-Reliance on Financials", severity="Critical",
-            description="Company issued non-reliance statement. All financial analysis may be unreliable.",
-            workstreams_involved=["material_events", "financial_kpis"],
-            evidence=["8-K Item 4.02 filed", "All financial metrics should be treated with caution"],
-        ).model_dump())
 
-    # Rule 3 — High: CEO pay growth significantly outpaces revenue growth + Low board independence
+def _insider_revenue_auditor(ctx: _Context) -> bool:
+    return (
+        ctx.cluster_detected and ctx.insider_signal == "bearish"
+        and ctx.revenue_yoy_change is not None and ctx.revenue_yoy_change < -0.10
+        and "4.01" in ctx.items_by_code
+    )
+
+
+def _pay_performance_mismatch(ctx: _Context) -> bool:
     # Fires when: (a) CEO pay is rising while revenue is flat/declining, OR
     #              (b) CEO pay growth > 3x positive revenue growth
     # Both cases with board independence below 67%.
-    ceo_pay_growth = governance.get("ceo_pay_growth")
-    rev_growth = kpis.revenue_yoy_change if kpis else None
-    board_indep = governance.get("board_independence_pct")
-    if (ceo_pay_growth is not None and ceo_pay_growth > 0
+    ceo_pay_growth = ctx.ceo_pay_growth
+    rev_growth = ctx.revenue_yoy_change
+    board_indep = ctx.board_independence_pct
+    if not (ceo_pay_growth is not None and ceo_pay_growth > 0
             and rev_growth is not None
             and board_indep is not None and board_indep < 0.67):
-        pay_mismatch = (
-            rev_growth <= 0  # Revenue flat/declining while CEO pay rises
-            or ceo_pay_growth > 3 * rev_growth  # CEO pay growth dwarfs revenue growth
-        )
-        if pay_mismatch:
-            flags.append(CrossWorkstreamFlag(
-                rule_name="Pay-Performance Mismatch + Weak Board", severity="High",
-                description="CEO pay growth significantly exceeds revenue growth with low board independence.",
-                workstreams_involved=["governance", "financial_kpis"],
-                evidence=[
-                    f"CEO pay growth: {ceo_pay_growth:.1%}",
-                    f"Revenue growth: {rev_growth:.1%}",
-                    f"Board independence: {board_indep:.0%}",
-                ],
-            ).model_dump())
+        return False
+    return (
+        rev_growth <= 0  # Revenue flat/declining while CEO pay rises
+        or ceo_pay_growth > 3 * rev_growth  # CEO pay growth dwarfs revenue growth
+    )
 
-    # Rule 4 — High: Novel regulatory risk + Insider selling
-    novel_regulatory = any(rf.get("is_novel") and rf.get("category") == "regulatory" for rf in risk_factors)
-    if novel_regulatory and insider.get("signal") == "bearish":
-        flags.append(CrossWorkstreamFlag(
-            rule_name="Novel Regulatory Risk + Insider Selling", severity="High",
-            description="New regulatory risk factor identified alongside insider selling activity.",
-            workstreams_involved=["risk_factors", "insider_signal"],
-            evidence=["Novel regulatory risk factor in 10-K", f"Insider signal: {insider.get('signal')}"],
-        ).model_dump())
 
+RULES: list[Rule] = [
+    # Rule 1 — Critical: Insider cluster selling + Revenue decline >10% + Auditor change
+    Rule(
+        name="Insider+Revenue+Auditor", severity="Critical",
+        description="Insider cluster selling coincides with >10% revenue decline and an auditor change.",
+        workstreams=("insider_signal", "financial_kpis", "material_events"),
+        predicate=_insider_revenue_auditor,
+        evidence=lambda ctx: [
+            f"Revenue decline: {ctx.revenue_yoy_change:.1%}",
+            f"Insider: {ctx.cluster_description}",
+            "8-K Item 4.01: auditor change filed",
+        ],
+    ),
+    # Rule 2 — Critical: 8-K Item 4.02 (non-reliance on financials)
+    Rule(
+        name="Non-Reliance on Financials", severity="Critical",
+        description="Company issued non-reliance statement. All financial analysis may be unreliable.",
+        workstreams=("material_events", "financial_kpis"),
+        predicate=lambda ctx: "4.02" in ctx.items_by_code and ctx.has_kpis,
+        evidence=lambda ctx: ["8-K Item 4.02 filed", "All financial metrics should be treated with caution"],
+    ),
+    # Rule 3 — High: CEO pay growth significantly outpaces revenue growth + Low board independence
+    Rule(
+        name="Pay-Performance Mismatch + Weak Board", severity="High",
+        description="CEO pay growth significantly exceeds revenue growth with low board independence.",
+        workstreams=("governance", "financial_kpis"),
+        predicate=_pay_performance_mismatch,
+        evidence=lambda ctx: [
+            f"CEO pay growth: {ctx.ceo_pay_growth:.1%}",
+            f"Revenue growth: {ctx.revenue_yoy_change:.1%}",
+            f"Board independence: {ctx.board_independence_pct:.0%}",
+        ],
+    ),
+    # Rule 4 — High: Novel regulatory risk + Insider selling
+    Rule(
+        name="Novel Regulatory Risk + Insider Selling", severity="High",
+        description="New regulatory risk factor identified alongside insider selling activity.",
+        workstreams=("risk_factors", "insider_signal"),
+        predicate=lambda ctx: ctx.novel_regulatory and ctx.insider_signal == "bearish",
+        evidence=lambda ctx: ["Novel regulatory risk factor in 10-K", f"Insider signal: {ctx.insider_signal}"],
+    ),
     # Rule 5 — Medium: Institutional holders reducing >20% + Declining margins
-    large_reductions = [h for h in holders if h.get("change_pct") is not None and h["change_pct"] < -0.20]
-    if len(large_reductions) >= 2 and kpis and kpis.gross_margin is not None:
-        flags.append(CrossWorkstreamFlag(
-            rule_name="Institutional Exodus + Margin Pressure", severity="Medium",
-            description="Multiple institutional holders reducing positions alongside margin concerns.",
-            workstreams_involved=["institutional", "financial_kpis"],
-            evidence=[f"{len(large_reductions)} holders reduced >20% QoQ", f"Gross margin: {kpis.gross_margin:.1%}"],
-        ).model_dump())
-
+    Rule(
+        name="Institutional Exodus + Margin Pressure", severity="Medium",
+        description="Multiple institutional holders reducing positions alongside margin concerns.",
+        workstreams=("institutional", "financial_kpis"),
+        predicate=lambda ctx: ctx.large_reduction_count >= 2 and ctx.gross_margin is not None,
+        evidence=lambda ctx: [
+            f"{ctx.large_reduction_count} holders reduced >20% QoQ",
+            f"Gross margin: {ctx.gross_margin:.1%}",
+        ],
+    ),
     # Rule 6 — Medium: Multiple leadership changes + Governance flags
-    leadership_changes = [e for e in events if e.get("item_code") == "5.02"]
-    gov_flags = governance.get("governance_flags", [])
-    if len(leadership_changes) >= 2 and len(gov_flags) >= 1:
-        flags.append(CrossWorkstreamFlag(
-            rule_name="Leadership Instability + Governance Concerns", severity="Medium",
-            description="Multiple executive changes alongside governance red flags signal instability.",
-            workstreams_involved=["material_events", "governance"],
-            evidence=[
-                f"{len(leadership_changes)} leadership changes (8-K Item 5.02)",
-                f"Governance flags: {', '.join(gov_flags[:3])}",
-            ],
-        ).model_dump())
-
-    return flags
+    Rule(
+        name="Leadership Instability + Governance Concerns", severity="Medium",
+        description="Multiple executive changes alongside governance red flags signal instability.",
+        workstreams=("material_events", "governance"),
+        predicate=lambda ctx: (
+            len(ctx.items_by_code.get("5.02", [])) >= 2 and len(ctx.governance_flags) >= 1
+        ),
+        evidence=lambda ctx: [
+            f"{len(ctx.items_by_code.get('5.02', []))} leadership changes (8-K Item 5.02)",
+            f"Governance flags: {', '.join(ctx.governance_flags[:3])}",
+        ],
+    ),
+]
+
+
+def _evaluate_correlations(state: PipelineState) -> list[dict]:
+    """Apply the cross-workstream correlation rules in RULES order."""
+    ctx = _build_context(state)
+    return [rule.build(ctx) for rule in RULES if rule.predicate(ctx)]
 
 
 def _compute_deal_recommendation(state: PipelineState, cross_flags: list[dict]) -> str:
     """Compute deal recommendation based on all signals."""
-    critical_flags = [f for f in cross_flags if f.get("severity") == "Critical"]
-    high_flags = [f for f in cross_flags if f.get("severity") == "High"]
     risk_scores = state.get("gold_risk_scores")
     composite = risk_scores.composite_score if risk_scores else 2.5
 
-    if critical_flags or composite >= 4.5:
+    if composite >= 4.5 or any(f.get("severity") == "Critical" for f in cross_flags):
         return "DO_NOT_PROCEED"
-    elif high_flags or composite >= 3.5:
+    elif composite >= 3.5 or any(f.get("severity") == "High" for f in cross_flags):
         return "PROCEED_WITH_CONDITIONS"
     else:
         return "PROCEED"
@@ -136,7 +237,8 @@ async def gold_cross_workstream_agent(state: PipelineState) -> dict:
     deal_rec = _compute_deal_recommendation(state, cross_flags)
 
     writer = CsvWriter(ticker)
-    path = writer.write_gold(
+    path = await asyncio.to_thread(
+        writer.write_gold,
         "cross_workstream_flags",
         cross_flags,
         source_tables="all silver tables + gold_risk_assessment.csv",
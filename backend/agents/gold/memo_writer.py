@@ -2,23 +2,66 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
 from datetime import datetime, timezone
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
-from langchain_openai import ChatOpenAI
 
-from backend.agents.silver.financial_kpis import _format_kpis_for_prompt
+from backend.agents._llm_clients import (
+    ainvoke_structured,
+    count_tokens,
+    has_openai_key,
+    lookup_cached,
+    store_cached,
+    truncate_tokens,
+)
+from backend.agents.silver.financial_kpis import _kpi_summary
 from backend.data.csv_writer import CsvWriter
 from backend.models import DiligenceMemo, PipelineState
 
 logger = logging.getLogger(__name__)
 
-MEMO_V2_PROMPT = """\
-You are a senior M&A analyst writing a comprehensive due diligence report for \
-{company_name} ({ticker}).
+# Built once per process: templates are read, parsed and compiled on first
+# get_template() and then served from the environment's cache. auto_reload is
+# off so cached templates are never re-checked against the filesystem.
+_TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "templates"
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader(_TEMPLATE_DIR),
+    auto_reload=False,
+    keep_trailing_newline=True,
+)
+_MEMO_TEMPLATE = _JINJA_ENV.get_template("diligence_memo.md.j2")
+
+# Static instructions go in the system message so every memo call shares an
+# identical prompt prefix, which OpenAI's automatic prompt caching can reuse.
+MEMO_V2_SYSTEM_PROMPT = """\
+You are a senior M&A analyst writing a comprehensive due diligence report. \
+The user message contains the company's pipeline data.
+
+## Instructions
+Write a professional 10-section due diligence report:
+
+1. **Executive Summary** (4-6 sentences): Key takeaway, the deal \
+recommendation given in the data, top 3 risks, confidence level
+2. **Company Overview** (3-5 sentences): Business description, market position
+3. **Financial Analysis** (paragraph): Revenue, profitability, balance sheet. \
+Cite [source: TagName, FY<fiscal year>].
+4. **Risk Factor Analysis** (paragraph): Summarize key risks by category
+5. **Insider Trading Signals** (paragraph): Buy/sell patterns, cluster activity
+6. **Institutional Ownership** (paragraph): Major holders, notable changes
+7. **Material Events** (paragraph): Significant 8-K filings
+8. **Governance & Compensation** (paragraph): CEO pay, board independence
+9. **Cross-Workstream Red Flags** (paragraph): Correlated signals
+10. **Recommendation & Caveats** (paragraph): Final verdict with conditions
+
+Be specific — cite actual numbers. Do not be generic.
+"""
+
+MEMO_V2_DATA_PROMPT = """\
+Write the due diligence report for {company_name} ({ticker}), fiscal year \
+FY{fiscal_year}.
 
 ## Financial KPIs (from SEC 10-K XBRL data)
 {kpi_summary}
@@ -49,25 +92,70 @@ Composite Risk: {risk_level} ({composite_score}/5.0)
 {cross_flags_summary}
 
 ## Deal Recommendation: {deal_recommendation}
+"""
 
-## Instructions
-Write a professional 10-section due diligence report:
+# Token budgets that keep the variable-length prompt sections bounded
+_RISK_FACTOR_SUMMARY_TOKENS = 64
+_SECTION_TOKEN_BUDGET = 1500
 
-1. **Executive Summary** (4-6 sentences): Key takeaway, deal recommendation \
-({deal_recommendation}), top 3 risks, confidence level
-2. **Company Overview** (3-5 sentences): Business description, market position
-3. **Financial Analysis** (paragraph): Revenue, profitability, balance sheet. \
-Cite [source: TagName, FY{fiscal_year}].
-4. **Risk Factor Analysis** (paragraph): Summarize key risks by category
-5. **Insider Trading Signals** (paragraph): Buy/sell patterns, cluster activity
-6. **Institutional Ownership** (paragraph): Major holders, notable changes
-7. **Material Events** (paragraph): Significant 8-K filings
-8. **Governance & Compensation** (paragraph): CEO pay, board independence
-9. **Cross-Workstream Red Flags** (paragraph): Correlated signals
-10. **Recommendation & Caveats** (paragraph): Final verdict with conditions
 
-Be specific — cite actual numbers. Do not be generic.
-"""
+def _within_budget(lines: list[str], budget: int = _SECTION_TOKEN_BUDGET) -> list[str]:
+    """The leading *lines* whose combined token count fits *budget*."""
+    kept: list[str] = []
+    used = 0
+    for line in lines:
+        used += count_tokens(line)
+        if used > budget:
+            break
+        kept.append(line)
+    return kept
+
+
+# Cheapest model first; escalate when a tier errors or returns a hollow memo
+MEMO_MODEL_TIERS = ("gpt-4o-mini", "gpt-4o")
+
+# Sections that must be non-empty for a tier's memo to be accepted
+_REQUIRED_MEMO_FIELDS = (
+    "executive_summary", "company_overview", "financial_analysis",
+    "risk_assessment", "recommendation",
+)
+
+
+def _memo_is_complete(memo: DiligenceMemo) -> bool:
+    """True when every required section and the key findings are filled in."""
+    return bool(memo.key_findings) and all(
+        getattr(memo, name).strip() for name in _REQUIRED_MEMO_FIELDS
+    )
+
+
+async def _generate_memo(prompt: list[tuple[str, str]]) -> DiligenceMemo:
+    """Run the memo prompt through MEMO_MODEL_TIERS until one is acceptable.
+
+    Temperature is pinned to 0 so repeat runs hit the response cache, and an
+    accepted memo is also cached under the whole tier list so an unchanged
+    prompt skips the tier walk entirely. If no tier produces a complete memo,
+    the last one returned is used; if every tier fails outright, the final
+    tier's error is raised.
+    """
+    tiers_label = "+".join(MEMO_MODEL_TIERS)
+    memo = await lookup_cached(tiers_label, 0, DiligenceMemo, prompt)
+    if memo is not None:
+        return memo
+
+    for model in MEMO_MODEL_TIERS:
+        try:
+            candidate = await ainvoke_structured(model, 0, DiligenceMemo, prompt)
+        except Exception as e:
+            if model == MEMO_MODEL_TIERS[-1] and memo is None:
+                raise
+            logger.warning(f"Memo generation with {model} failed: {e}")
+            continue
+        memo = candidate
+        if _memo_is_complete(memo):
+            await store_cached(tiers_label, 0, DiligenceMemo, prompt, memo)
+            return memo
+        logger.warning(f"Memo from {model} is missing sections")
+    return memo
 
 
 async def gold_memo_agent(state: PipelineState) -> dict:
@@ -96,84 +184,36 @@ async def gold_memo_agent(state: PipelineState) -> dict:
     company_name = company_info.company_name if company_info else ticker
     cross_flags = state.get("gold_cross_workstream_flags", [])
     deal_rec = state.get("deal_recommendation", "PROCEED")
-
-    # Build summaries
-    kpi_summary = _format_kpis_for_prompt(kpis)
-    risk_details = "\n".join(
-        f"- {d.dimension}: {d.score}/5 — {d.reasoning}" for d in risk_scores.dimensions
-    )
-    red_flags_text = "\n".join(
-        f"- {f.flag} ({f.severity}): {f.evidence}" for f in risk_scores.red_flags
-    ) or "No critical red flags identified."
-
-    risk_factors = state.get("silver_risk_factors", [])
-    risk_factors_summary = "\n".join(
-        f"- [{rf.get('category', 'unknown')}] {rf.get('title', '')}: "
-        f"{rf.get('summary', '')} (severity {rf.get('severity', '?')}/5"
-        f"{', NOVEL' if rf.get('is_novel') else ''})"
-        for rf in risk_factors[:10]
-    ) or "No risk factor data available."
-
     insider = state.get("silver_insider_signal", {})
-    insider_summary = (
+
+    # Lines shared verbatim by the prompt and the rendered memo
+    insider_line = (
         f"Signal: {insider.get('signal', 'N/A')}, "
         f"Buys: {insider.get('total_buys', 0)}, "
-        f"Sells: {insider.get('total_sells', 0)}, "
-        f"Buy/Sell Ratio: {insider.get('buy_sell_ratio', 'N/A')}"
+        f"Sells: {insider.get('total_sells', 0)}"
     )
-    if insider.get("cluster_detected"):
-        insider_summary += f"\nCLUSTER: {insider.get('cluster_description', '')}"
-
-    holders = state.get("silver_institutional_holders", [])
-    institutional_summary = "\n".join(
+    holder_lines = [
         f"- {h.get('holder_name', 'Unknown')}: "
         f"{h.get('shares', 0):,.0f} shares ({h.get('holder_type', 'unknown')})"
-        for h in holders[:5]
-    ) or "No institutional data available."
-
-    events = state.get("silver_material_events", [])
-    events_summary = "\n".join(
+        for h in state.get("silver_institutional_holders", [])[:5]
+    ]
+    event_lines = [
         f"- {e.get('filing_date', '')}: {e.get('item_code', '')} "
         f"{e.get('item_description', '')} (severity {e.get('severity', '?')}/5)"
-        for e in events[:10]
-    ) or "No material events in the past 12 months."
-
-    governance = state.get("silver_governance", {})
-    gov_parts = []
-    if governance.get("ceo_name"):
-        gov_parts.append(f"CEO: {governance['ceo_name']}")
-    if governance.get("ceo_total_comp"):
-        gov_parts.append(f"CEO Comp: ${governance['ceo_total_comp']:,.0f}")
-    if governance.get("board_independence_pct") is not None:
-        gov_parts.append(f"Board Independence: {governance['board_independence_pct']:.0%}")
-    if governance.get("governance_flags"):
-        gov_parts.append(f"Flags: {', '.join(governance['governance_flags'][:3])}")
-    governance_summary = "\n".join(gov_parts) or "No governance data available."
-
-    cross_flags_summary = "\n".join(
-        f"- [{cf.get('severity', '')}] {cf.get('rule_name', '')}: {cf.get('description', '')}"
-        for cf in cross_flags
-    ) or "No cross-workstream red flags identified."
+        for e in state.get("silver_material_events", [])[:10]
+    ]
+    ceo_name = state.get("silver_governance", {}).get("ceo_name")
 
     # Generate memo
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not has_openai_key():
         logger.warning("OPENAI_API_KEY not set, generating placeholder memo")
         memo = _placeholder_memo(company_name, ticker, kpis, risk_scores, deal_rec)
     else:
-        prompt = MEMO_V2_PROMPT.format(
-            company_name=company_name, ticker=ticker, kpi_summary=kpi_summary,
-            risk_level=risk_scores.risk_level, composite_score=risk_scores.composite_score,
-            risk_details=risk_details, red_flags=red_flags_text,
-            risk_factors_summary=risk_factors_summary, insider_summary=insider_summary,
-            institutional_summary=institutional_summary, events_summary=events_summary,
-            governance_summary=governance_summary, cross_flags_summary=cross_flags_summary,
-            deal_recommendation=deal_rec, fiscal_year=kpis.fiscal_year,
+        prompt = _memo_prompt(
+            state, company_name, insider_line, holder_lines, event_lines
         )
-        llm = ChatOpenAI(model="gpt-4o", temperature=0.3)
-        structured_llm = llm.with_structured_output(DiligenceMemo)
         try:
-            memo = await structured_llm.ainvoke(prompt)
+            memo = await _generate_memo(prompt)
         except Exception as e:
             logger.error(f"LLM memo generation failed: {e}")
             memo = _placeholder_memo(company_name, ticker, kpis, risk_scores, deal_rec)
@@ -182,14 +222,15 @@ async def gold_memo_agent(state: PipelineState) -> dict:
     memo.generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     confidence = _calculate_confidence(state, memo)
 
-    # Render memo content
-    memo_content = _plain_memo(
-        company_name, ticker, memo, confidence, risk_scores,
-        deal_rec, cross_flags, state,
-    )
-
+    # Render and write together in a worker thread, keeping both the template
+    # render and the disk write off the event loop
     writer = CsvWriter(ticker)
-    memo_path = writer.write_result("diligence_memo", memo_content)
+    memo_path = await asyncio.to_thread(
+        _write_memo, writer,
+        company_name, ticker, memo, confidence, risk_scores, deal_rec,
+        cross_flags, insider_line if insider else None, holder_lines,
+        event_lines[:5], ceo_name,
+    )
 
     return {
         "result_memo": memo,
@@ -201,47 +242,115 @@ async def gold_memo_agent(state: PipelineState) -> dict:
     }
 
 
+def _memo_prompt(
+    state: PipelineState,
+    company_name: str,
+    insider_line: str,
+    holder_lines: list[str],
+    event_lines: list[str],
+) -> list[tuple[str, str]]:
+    """Build the system + data messages for the LLM memo.
+
+    Only called when a key is set, so placeholder runs skip the summaries.
+    """
+    kpis = state["silver_kpis"]
+    risk_scores = state["gold_risk_scores"]
+    insider = state.get("silver_insider_signal", {})
+    governance = state.get("silver_governance", {})
+
+    risk_details = "\n".join(
+        f"- {d.dimension}: {d.score}/5 — {d.reasoning}" for d in risk_scores.dimensions
+    )
+    red_flags_text = "\n".join(
+        f"- {f.flag} ({f.severity}): {f.evidence}" for f in risk_scores.red_flags
+    ) or "No critical red flags identified."
+
+    risk_factors_summary = "\n".join(_within_budget([
+        f"- [{rf.get('category', 'unknown')}] {rf.get('title', '')}: "
+        f"{truncate_tokens(rf.get('summary', ''), _RISK_FACTOR_SUMMARY_TOKENS)} "
+        f"(severity {rf.get('severity', '?')}/5"
+        f"{', NOVEL' if rf.get('is_novel') else ''})"
+        for rf in state.get("silver_risk_factors", [])[:10]
+    ])) or "No risk factor data available."
+
+    insider_summary = f"{insider_line}, Buy/Sell Ratio: {insider.get('buy_sell_ratio', 'N/A')}"
+    if insider.get("cluster_detected"):
+        insider_summary += f"\nCLUSTER: {insider.get('cluster_description', '')}"
+
+    institutional_summary = (
+        "\n".join(_within_budget(holder_lines)) or "No institutional data available."
+    )
+    events_summary = (
+        "\n".join(_within_budget(event_lines)) or "No material events in the past 12 months."
+    )
+
+    gov_parts = []
+    if governance.get("ceo_name"):
+        gov_parts.append(f"CEO: {governance['ceo_name']}")
+    if governance.get("ceo_total_comp"):
+        gov_parts.append(f"CEO Comp: ${governance['ceo_total_comp']:,.0f}")
+    if governance.get("board_independence_pct") is not None:
+        gov_parts.append(f"Board Independence: {governance['board_independence_pct']:.0%}")
+    if governance.get("governance_flags"):
+        gov_parts.append(f"Flags: {', '.join(governance['governance_flags'][:3])}")
+    governance_summary = "\n".join(gov_parts) or "No governance data available."
+
+    cross_flags_summary = "\n".join(
+        f"- [{cf.get('severity', '')}] {cf.get('rule_name', '')}: {cf.get('description', '')}"
+        for cf in state.get("gold_cross_workstream_flags", [])
+    ) or "No cross-workstream red flags identified."
+
+    data = MEMO_V2_DATA_PROMPT.format(
+        company_name=company_name, ticker=state["ticker"], kpi_summary=_kpi_summary(state),
+        risk_level=risk_scores.risk_level, composite_score=risk_scores.composite_score,
+        risk_details=risk_details, red_flags=red_flags_text,
+        risk_factors_summary=risk_factors_summary, insider_summary=insider_summary,
+        institutional_summary=institutional_summary, events_summary=events_summary,
+        governance_summary=governance_summary, cross_flags_summary=cross_flags_summary,
+        deal_recommendation=state.get("deal_recommendation", "PROCEED"),
+        fiscal_year=kpis.fiscal_year,
+    )
+    return [("system", MEMO_V2_SYSTEM_PROMPT), ("human", data)]
+
+
+# Completeness checks behind _calculate_confidence; the weights sum to 1.0
+_KPI_FIELDS = (
+    "revenue", "net_income", "gross_margin", "operating_margin",
+    "total_assets", "total_liabilities", "stockholders_equity",
+    "debt_to_equity", "cash_and_equivalents", "operating_cash_flow",
+)
+_WORKSTREAM_KEYS = (
+    "silver_risk_factors", "silver_insider_trades",
+    "silver_institutional_holders", "silver_material_events",
+)
+
+
 def _calculate_confidence(state: PipelineState, memo) -> float:
     """Score pipeline confidence based on data completeness."""
     score = 0.0
-    total = 0.0
     kpis = state.get("silver_kpis")
     risk_scores = state.get("gold_risk_scores")
 
     # KPI completeness (25%)
     if kpis:
-        kpi_fields = [
-            kpis.revenue, kpis.net_income, kpis.gross_margin, kpis.operating_margin,
-            kpis.total_assets, kpis.total_liabilities, kpis.stockholders_equity,
-            kpis.debt_to_equity, kpis.cash_and_equivalents, kpis.operating_cash_flow,
-        ]
-        score += 0.25 * (sum(1 for f in kpi_fields if f is not None) / len(kpi_fields))
-    total += 0.25
+        present = sum(getattr(kpis, name) is not None for name in _KPI_FIELDS)
+        score += 0.25 * present / len(_KPI_FIELDS)
 
     # Risk assessment (15%)
     if risk_scores and risk_scores.dimensions:
         score += 0.15 * (len(risk_scores.dimensions) / 5)
-    total += 0.15
 
     # Memo (15%)
     if memo:
-        memo_fields = [memo.executive_summary, memo.company_overview, memo.financial_analysis,
-                       memo.risk_assessment, memo.recommendation]
-        score += 0.15 * (sum(1 for f in memo_fields if f) / len(memo_fields))
-    total += 0.15
-
-    # Workstream completeness (45%)
-    workstream_checks = [
-        bool(state.get("silver_risk_factors")),
-        bool(state.get("silver_insider_trades")),
-        bool(state.get("silver_institutional_holders")),
-        bool(state.get("silver_material_events")),
-        bool(state.get("silver_governance", {}).get("ceo_name")),
-    ]
-    score += 0.45 * (sum(workstream_checks) / len(workstream_checks))
-    total += 0.45
+        filled = sum(bool(getattr(memo, name)) for name in _REQUIRED_MEMO_FIELDS)
+        score += 0.15 * filled / len(_REQUIRED_MEMO_FIELDS)
 
-    return round(score / total, 2) if total > 0 else 0.0
+    # Workstream completeness (45%): four silver outputs plus a named CEO
+    complete = sum(bool(state.get(key)) for key in _WORKSTREAM_KEYS)
+    complete += bool(state.get("silver_governance", {}).get("ceo_name"))
+    score += 0.45 * complete / (len(_WORKSTREAM_KEYS) + 1)
+
+    return round(score, 2)
 
 
 def _placeholder_memo(company_name, ticker, kpis, risk_scores, deal_rec):
@@ -282,52 +391,23 @@ def _placeholder_memo(company_name, ticker, kpis, risk_scores, deal_rec):
     )
 
 
-def _plain_memo(company_name, ticker, memo, confidence, risk_scores, deal_rec, cross_flags, state):
-    """Generate a plain markdown DD report."""
-    lines = [
-        f"# Due Diligence Report: {company_name} ({ticker})",
-        f"\n**Generated:** {memo.generated_at}",
-        f"**Confidence:** {confidence:.2f}",
-        f"**Risk Level:** {risk_scores.risk_level if risk_scores else 'N/A'}",
-        f"**Deal Recommendation:** {deal_rec}",
-        "\n---\n",
-        "## 1. Executive Summary\n", memo.executive_summary,
-        "\n## 2. Company Overview\n", memo.company_overview,
-        "\n## 3. Financial Analysis\n", memo.financial_analysis,
-        "\n## 4. Risk Factor Analysis\n", memo.risk_assessment,
-        "\n## 5. Insider Trading Signals\n",
-    ]
-    insider = state.get("silver_insider_signal", {})
-    if insider:
-        lines.append(f"Signal: {insider.get('signal', 'N/A')}, Buys: {insider.get('total_buys', 0)}, Sells: {insider.get('total_sells', 0)}")
-    else:
-        lines.append("No insider trading data available.")
-
-    lines.append("\n## 6. Institutional Ownership\n")
-    for h in state.get("silver_institutional_holders", [])[:5]:
-        lines.append(f"- {h.get('holder_name', 'Unknown')}: {h.get('shares', 0):,.0f} shares ({h.get('holder_type', 'unknown')})")
+def _plain_memo(
+    company_name, ticker, memo, confidence, risk_scores, deal_rec,
+    cross_flags, insider_line, holder_lines, event_lines, ceo_name,
+):
+    """Generate a plain markdown DD report.
 
-    lines.append("\n## 7. Material Events\n")
-    for e in state.get("silver_material_events", [])[:5]:
-        lines.append(f"- {e.get('filing_date', '')}: {e.get('item_code', '')} {e.get('item_description', '')} (severity {e.get('severity', '?')}/5)")
+    Workstream lines arrive pre-formatted from gold_memo_agent, which builds
+    them once for both the LLM prompt and this rendering.
+    """
+    return _MEMO_TEMPLATE.render(
+        company_name=company_name, ticker=ticker, memo=memo, confidence=confidence,
+        risk_scores=risk_scores, deal_rec=deal_rec, cross_flags=cross_flags,
+        insider_line=insider_line, holder_lines=holder_lines,
+        event_lines=event_lines, ceo_name=ceo_name,
+    )
 
-    lines.append("\n## 8. Governance & Compensation\n")
-    gov = state.get("silver_governance", {})
-    lines.append(f"CEO: {gov.get('ceo_name', 'N/A')}" if gov.get("ceo_name") else "No governance data available.")
 
-    lines.append("\n## 9. Cross-Workstream Red Flags\n")
-    if cross_flags:
-        for cf in cross_flags:
-            lines.append(f"- **[{cf.get('severity', '')}] {cf.get('rule_name', '')}**: {cf.get('description', '')}")
-    else:
-        lines.append("No cross-workstream red flags identified.")
-
-    lines.extend([
-        "\n## 10. Recommendation & Caveats\n",
-        f"**Deal Recommendation: {deal_rec}**\n", memo.recommendation,
-        "\n## Key Findings\n",
-    ])
-    for finding in memo.key_findings:
-        lines.append(f"- {finding}")
-    lines.append(f"\n---\n*Generated by DiligenceOps v0.3 | Confidence: {confidence:.2f} | {memo.generated_at}*")
-    return "\n".join(lines)
+def _write_memo(writer: CsvWriter, *render_args) -> Path:
+    """Render the markdown memo and write it; runs in a worker thread."""
+    return writer.write_result("diligence_memo", _plain_memo(*render_args))
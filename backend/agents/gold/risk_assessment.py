@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
 
-from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
 
-from backend.agents.silver.financial_kpis import _format_kpis_for_prompt
+from backend.agents._llm_clients import ainvoke_structured, has_openai_key
+from backend.agents.silver.financial_kpis import _kpi_summary
 from backend.data.csv_writer import CsvWriter
 from backend.models import (
     FinancialKPIs,
@@ -19,20 +23,12 @@ from backend.models import (
 
 logger = logging.getLogger(__name__)
 
-RISK_ANALYSIS_PROMPT = """\
-You are a senior financial analyst performing due diligence on {company_name} ({ticker}).
-
-Based on the following financial KPIs extracted from their latest SEC 10-K filing, \
-score the company across five risk dimensions.
-
-## Financial KPIs
-{kpi_summary}
-
-## Company Information
-- Ticker: {ticker}
-- Company: {company_name}
-- SIC: {sic_description}
-- Fiscal Year End: {fiscal_year_end}
+# Static instructions go in the system message so every scoring call shares an
+# identical prompt prefix, which OpenAI's automatic prompt caching can reuse.
+RISK_ANALYSIS_SYSTEM_PROMPT = """\
+You are a senior financial analyst performing due diligence. Based on the \
+financial KPIs extracted from a company's latest SEC 10-K filing (given in the \
+user message), score the company across five risk dimensions.
 
 ## Instructions
 For each risk dimension, provide:
@@ -51,78 +47,119 @@ Also identify the top 3 red flags (if any) with severity (Low/Medium/High/Critic
 and specific evidence from the data.
 """
 
+RISK_ANALYSIS_DATA_PROMPT = """\
+Score {company_name} ({ticker}).
 
-def _placeholder_risk(kpis: FinancialKPIs) -> RiskAssessment:
-    """Generate rule-based risk scores when LLM is unavailable."""
-    dimensions = []
-
-    margin_score = 1
-    reasoning = "No margin data available."
-    if kpis.gross_margin is not None:
-        if kpis.gross_margin < 0.2:
-            margin_score = 4
-        elif kpis.gross_margin < 0.35:
-            margin_score = 3
-        elif kpis.gross_margin < 0.5:
-            margin_score = 2
-        reasoning = f"Gross margin is {kpis.gross_margin:.1%}."
-    dimensions.append(RiskDimension(
-        dimension="Financial Health", score=margin_score,
-        reasoning=reasoning, key_metrics=["gross_margin", "operating_margin", "net_income"],
-    ))
+## Financial KPIs
+{kpi_summary}
 
-    growth_score = 2
-    if kpis.revenue_yoy_change is not None:
-        if kpis.revenue_yoy_change < -0.1:
-            growth_score = 5
-        elif kpis.revenue_yoy_change < 0:
-            growth_score = 3
-        elif kpis.revenue_yoy_change > 0.1:
-            growth_score = 1
-    dimensions.append(RiskDimension(
-        dimension="Market Position", score=growth_score,
-        reasoning=f"Revenue YoY change: {kpis.revenue_yoy_change:.1%}." if kpis.revenue_yoy_change else "No YoY data.",
-        key_metrics=["revenue", "revenue_yoy_change"],
-    ))
+## Company Information
+- Ticker: {ticker}
+- Company: {company_name}
+- SIC: {sic_description}
+- Fiscal Year End: {fiscal_year_end}
+"""
 
-    op_score = 2
-    if kpis.operating_margin is not None:
-        if kpis.operating_margin < 0:
-            op_score = 5
-        elif kpis.operating_margin < 0.1:
-            op_score = 3
-    dimensions.append(RiskDimension(
-        dimension="Operational Risk", score=op_score,
-        reasoning=f"Operating margin: {kpis.operating_margin:.1%}." if kpis.operating_margin else "No operating margin data.",
-        key_metrics=["operating_margin", "operating_income"],
-    ))
+RISK_BATCH_SYSTEM_PROMPT = RISK_ANALYSIS_SYSTEM_PROMPT + """
+The user message contains several companies, each under a "# Company N" \
+heading. Return exactly one assessment per company, in the order given.
+"""
 
-    gov_score = 2
-    if kpis.debt_to_equity is not None:
-        if kpis.debt_to_equity > 5:
-            gov_score = 4
-        elif kpis.debt_to_equity > 2:
-            gov_score = 3
-    dimensions.append(RiskDimension(
-        dimension="Governance", score=gov_score,
-        reasoning=f"Debt-to-equity: {kpis.debt_to_equity:.2f}." if kpis.debt_to_equity else "No D/E data.",
-        key_metrics=["debt_to_equity", "long_term_debt"],
-    ))
+# Companies per batched scoring call: enough to amortize per-request latency,
+# few enough that each call's output length and latency stay bounded
+RISK_BATCH_SIZE = 4
 
-    liq_score = 2
-    if kpis.current_ratio is not None:
-        if kpis.current_ratio < 1.0:
-            liq_score = 4
-        elif kpis.current_ratio < 1.5:
-            liq_score = 3
-    dimensions.append(RiskDimension(
-        dimension="Liquidity", score=liq_score,
-        reasoning=f"Current ratio: {kpis.current_ratio:.2f}." if kpis.current_ratio else "No current ratio data.",
-        key_metrics=["current_ratio", "cash_and_equivalents"],
-    ))
 
-    scores = [d.score for d in dimensions]
-    composite = sum(scores) / len(scores) if scores else 2.5
+class RiskAssessmentBatch(BaseModel):
+    """Structured output for one multi-company scoring call."""
+
+    assessments: list[RiskAssessment]
+
+
+def _risk_prompt_data(state: PipelineState) -> str:
+    """Format the per-ticker half of the risk prompt."""
+    ticker = state["ticker"]
+    company_info = state.get("company_info")
+    return RISK_ANALYSIS_DATA_PROMPT.format(
+        company_name=company_info.company_name if company_info else ticker,
+        ticker=ticker, kpi_summary=_kpi_summary(state),
+        sic_description=company_info.sic_description if company_info else "Unknown",
+        fiscal_year_end=company_info.fiscal_year_end if company_info else "Unknown",
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _PlaceholderDimension:
+    """Threshold table that scores one risk dimension from a single KPI.
+
+    ``ladder`` rungs are ``(comparison, threshold, score)`` checked in order;
+    the first rung whose comparison holds sets the score, else ``default``.
+    """
+
+    dimension: str
+    kpi: str
+    ladder: tuple[tuple[Callable[[float, float], bool], float, int], ...]
+    default: int
+    reasoning: str
+    missing: str
+    key_metrics: tuple[str, ...]
+
+    def score(self, kpis: FinancialKPIs) -> RiskDimension:
+        value = getattr(kpis, self.kpi)
+        if value is None:
+            return RiskDimension(
+                dimension=self.dimension, score=self.default,
+                reasoning=self.missing, key_metrics=list(self.key_metrics),
+            )
+        score = next(
+            (s for compare, threshold, s in self.ladder if compare(value, threshold)),
+            self.default,
+        )
+        return RiskDimension(
+            dimension=self.dimension, score=score,
+            reasoning=self.reasoning.format(value), key_metrics=list(self.key_metrics),
+        )
+
+
+_PLACEHOLDER_DIMENSIONS = (
+    _PlaceholderDimension(
+        "Financial Health", "gross_margin",
+        ((operator.lt, 0.2, 4), (operator.lt, 0.35, 3), (operator.lt, 0.5, 2)), 1,
+        "Gross margin is {:.1%}.", "No margin data available.",
+        ("gross_margin", "operating_margin", "net_income"),
+    ),
+    _PlaceholderDimension(
+        "Market Position", "revenue_yoy_change",
+        ((operator.lt, -0.1, 5), (operator.lt, 0, 3), (operator.gt, 0.1, 1)), 2,
+        "Revenue YoY change: {:.1%}.", "No YoY data.",
+        ("revenue", "revenue_yoy_change"),
+    ),
+    _PlaceholderDimension(
+        "Operational Risk", "operating_margin",
+        ((operator.lt, 0, 5), (operator.lt, 0.1, 3)), 2,
+        "Operating margin: {:.1%}.", "No operating margin data.",
+        ("operating_margin", "operating_income"),
+    ),
+    _PlaceholderDimension(
+        "Governance", "debt_to_equity",
+        ((operator.gt, 5, 4), (operator.gt, 2, 3)), 2,
+        "Debt-to-equity: {:.2f}.", "No D/E data.",
+        ("debt_to_equity", "long_term_debt"),
+    ),
+    _PlaceholderDimension(
+        "Liquidity", "current_ratio",
+        ((operator.lt, 1.0, 4), (operator.lt, 1.5, 3)), 2,
+        "Current ratio: {:.2f}.", "No current ratio data.",
+        ("current_ratio", "cash_and_equivalents"),
+    ),
+)
+
+
+def _placeholder_risk(kpis: FinancialKPIs) -> RiskAssessment:
+    """Generate rule-based risk scores when LLM is unavailable."""
+    dimensions = [rule.score(kpis) for rule in _PLACEHOLDER_DIMENSIONS]
+
+    composite = sum(d.score for d in dimensions) / len(dimensions)
     level = "Low" if composite <= 2 else "Medium" if composite <= 3 else "High" if composite <= 4 else "Critical"
 
     return RiskAssessment(
@@ -139,7 +176,6 @@ async def gold_risk_assessment_agent(state: PipelineState) -> dict:
     """
     ticker = state["ticker"]
     kpis = state.get("silver_kpis")
-    company_info = state.get("company_info")
     errors: list[str] = []
 
     if not kpis:
@@ -152,48 +188,45 @@ async def gold_risk_assessment_agent(state: PipelineState) -> dict:
             "progress_messages": ["Gold risk: no KPI data"],
         }
 
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not has_openai_key():
         logger.warning("OPENAI_API_KEY not set, generating placeholder risk scores")
         risk = _placeholder_risk(kpis)
         errors.append("Risk analysis used placeholder scores (no API key)")
     else:
-        kpi_summary = _format_kpis_for_prompt(kpis)
-        prompt = RISK_ANALYSIS_PROMPT.format(
-            company_name=company_info.company_name if company_info else ticker,
-            ticker=ticker, kpi_summary=kpi_summary,
-            sic_description=company_info.sic_description if company_info else "Unknown",
-            fiscal_year_end=company_info.fiscal_year_end if company_info else "Unknown",
-        )
-        llm = ChatOpenAI(model="gpt-4o", temperature=0)
-        structured_llm = llm.with_structured_output(RiskAssessment)
+        prompt = [("system", RISK_ANALYSIS_SYSTEM_PROMPT), ("human", _risk_prompt_data(state))]
         try:
-            risk = await structured_llm.ainvoke(prompt)
+            risk = await ainvoke_structured("gpt-4o", 0, RiskAssessment, prompt)
         except Exception as e:
             logger.error(f"LLM risk analysis failed: {e}")
             risk = _placeholder_risk(kpis)
             errors.append(f"LLM risk analysis failed, using placeholder: {e}")
 
     # Write gold table
-    rows = []
-    for dim in risk.dimensions:
-        rows.append({
+    rows = [
+        {
             "dimension": dim.dimension, "score": dim.score,
             "reasoning": dim.reasoning, "key_metrics": "; ".join(dim.key_metrics),
-        })
+        }
+        for dim in risk.dimensions
+    ]
     rows.append({
         "dimension": "COMPOSITE", "score": round(risk.composite_score, 2),
         "reasoning": f"Risk Level: {risk.risk_level}", "key_metrics": "",
     })
-    for flag in risk.red_flags:
-        rows.append({
+    rows.extend(
+        {
             "dimension": f"RED_FLAG: {flag.flag}", "score": flag.severity,
             "reasoning": flag.evidence, "key_metrics": "",
-        })
+        }
+        for flag in risk.red_flags
+    )
 
     writer = CsvWriter(ticker)
-    path = writer.write_gold(
-        "risk_assessment", rows, source_tables="silver_financial_kpis.csv"
+    path = await asyncio.to_thread(
+        writer.write_gold,
+        "risk_assessment",
+        rows,
+        source_tables="silver_financial_kpis.csv",
     )
 
     return {
@@ -203,3 +236,45 @@ async def gold_risk_assessment_agent(state: PipelineState) -> dict:
         "current_stage": "gold",
         "progress_messages": [f"Risk analysis: {risk.risk_level} ({risk.composite_score:.1f}/5.0)"],
     }
+
+
+async def gold_risk_assessment_batch(
+    states: list[PipelineState], k: int = RISK_BATCH_SIZE
+) -> list[RiskAssessment | None]:
+    """Score many tickers with one LLM call per *k* companies.
+
+    Meant for watchlist screening: no gold CSVs are written. Returns one
+    entry per state, in order; None where the state has no silver KPIs.
+    Uses placeholder scores without an API key, and for any chunk whose
+    call fails or returns the wrong number of assessments.
+    """
+    results: list[RiskAssessment | None] = [None] * len(states)
+    scorable = [(i, s) for i, s in enumerate(states) if s.get("silver_kpis")]
+
+    if not has_openai_key():
+        for i, s in scorable:
+            results[i] = _placeholder_risk(s["silver_kpis"])
+        return results
+
+    async def _score_chunk(chunk: list[tuple[int, PipelineState]]) -> None:
+        data = "\n\n".join(
+            f"# Company {n}\n{_risk_prompt_data(s)}" for n, (_, s) in enumerate(chunk, 1)
+        )
+        prompt = [("system", RISK_BATCH_SYSTEM_PROMPT), ("human", data)]
+        try:
+            batch = await ainvoke_structured("gpt-4o", 0, RiskAssessmentBatch, prompt)
+            if len(batch.assessments) != len(chunk):
+                raise ValueError(
+                    f"expected {len(chunk)} assessments, got {len(batch.assessments)}"
+                )
+            scored = batch.assessments
+        except Exception as e:
+            logger.error(f"Batched risk analysis failed, using placeholders: {e}")
+            scored = [_placeholder_risk(s["silver_kpis"]) for _, s in chunk]
+        for (i, _), risk in zip(chunk, scored):
+            results[i] = risk
+
+    await asyncio.gather(*(
+        _score_chunk(scorable[j:j + k]) for j in range(0, len(scorable), k)
+    ))
+    return results
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
-from collections import Counter
+from dataclasses import dataclass
 
-from langchain_openai import ChatOpenAI
+import numpy as np
 from pydantic import BaseModel, Field
 
+from backend.agents._llm_clients import ainvoke_structured, has_openai_key
 from backend.data.csv_writer import CsvWriter
 from backend.models import FinancialFact, FinancialKPIs, PipelineState
 
@@ -36,6 +37,12 @@ XBRL_KPI_MAP: list[tuple[str, str]] = [
     ("PaymentsToAcquirePropertyPlantAndEquipment", "_capex"),
 ]
 
+# XBRL_KPI_MAP grouped by KPI: candidate tags in priority order
+_KPI_TAGS: dict[str, tuple[str, ...]] = {}
+for _tag, _kpi in XBRL_KPI_MAP:
+    _KPI_TAGS[_kpi] = _KPI_TAGS.get(_kpi, ()) + (_tag,)
+del _tag, _kpi
+
 
 class AnomalyAnalysis(BaseModel):
     """LLM-generated anomaly flags for financial KPIs."""
@@ -46,202 +53,338 @@ class AnomalyAnalysis(BaseModel):
     )
 
 
-def _get_value_for_period(
-    facts: list[FinancialFact], tag: str, end_date: str
-) -> tuple[float | None, str | None]:
-    """Get the value for a tag at a specific period end date."""
-    matching = [f for f in facts if f.tag == tag and f.end == end_date]
-    if not matching:
-        return None, None
-    latest = max(matching, key=lambda f: f.filed)
-    return latest.value, latest.tag
+@dataclass(slots=True)
+class _FactIndex:
+    """Lookups over bronze facts, built in a single pass by ``_index_facts``."""
+
+    by_key: dict[tuple[str, str], FinancialFact]  # (tag, end) → latest-filed fact
+    end_dates: list[str]  # Annual period end dates, newest first
+    max_fy: dict[str, int]  # Highest fiscal year reported per period end
+
+
+def _index_facts(facts: list[FinancialFact]) -> _FactIndex:
+    """Walk ``facts`` once, keeping the latest-filed fact per (tag, end)."""
+    by_key: dict[tuple[str, str], FinancialFact] = {}
+    max_fy: dict[str, int] = {}
+    duration_ends: set[str] = set()
+    fy_ends: set[str] = set()
+    for f in facts:
+        key = (f.tag, f.end)
+        current = by_key.get(key)
+        if current is None or f.filed > current.filed:
+            by_key[key] = f
+        fy = max_fy.get(f.end)
+        if fy is None or f.fy > fy:
+            max_fy[f.end] = f.fy
+        if f.fp == "FY" and f.taxonomy == "us-gaap":
+            fy_ends.add(f.end)
+            if f.start is not None:
+                duration_ends.add(f.end)
+    # Prefer duration (income-statement) periods; fall back to any FY fact
+    end_dates = sorted(duration_ends or fy_ends, reverse=True)
+    return _FactIndex(by_key=by_key, end_dates=end_dates, max_fy=max_fy)
+
+
+def _first_fact(index: _FactIndex, kpi_name: str, end: str) -> FinancialFact | None:
+    """Highest-priority fact reported for *kpi_name* at period *end*."""
+    for tag in _KPI_TAGS[kpi_name]:
+        fact = index.by_key.get((tag, end))
+        if fact is not None:
+            return fact
+    return None
 
 
 def _get_annual_end_dates(facts: list[FinancialFact]) -> list[str]:
     """Get distinct annual period end dates sorted descending."""
-    duration_facts = [
-        f for f in facts
-        if f.fp == "FY" and f.start is not None and f.taxonomy == "us-gaap"
-    ]
-    if not duration_facts:
-        duration_facts = [f for f in facts if f.fp == "FY" and f.taxonomy == "us-gaap"]
-    if not duration_facts:
-        return []
+    return _index_facts(facts).end_dates
 
-    end_counts = Counter(f.end for f in duration_facts)
-    return sorted(end_counts.keys(), reverse=True)
 
+@dataclass(slots=True)
+class _RawKpis:
+    """Reported (non-derived) KPI values for one ticker's latest fiscal year."""
 
-def _extract_kpis(facts: list[FinancialFact]) -> FinancialKPIs:
-    """Deterministically extract KPIs from bronze facts."""
-    if not facts:
-        return FinancialKPIs()
+    raw: dict[str, float]  # KPI name → value, for KPIs reported at latest_end
+    source_tags: dict[str, str]
+    latest_end: str
+    latest_fy: int
+    revenue_prior: float | None
+    net_income_prior: float | None
 
-    end_dates = _get_annual_end_dates(facts)
-    if not end_dates:
-        return FinancialKPIs()
 
-    latest_end = end_dates[0]
-    prior_end = end_dates[1] if len(end_dates) > 1 else None
+def _collect_raw_kpis(
+    facts: list[FinancialFact], index: _FactIndex | None = None
+) -> _RawKpis | None:
+    """Look up each reported KPI for the latest annual period (None if none).
+
+    Pass *index* when the caller already holds ``_index_facts(facts)`` to
+    skip rebuilding it.
+    """
+    if index is None:
+        if not facts:
+            return None
+        index = _index_facts(facts)
+    if not index.end_dates:
+        return None
 
-    latest_fy_facts = [f for f in facts if f.end == latest_end]
-    latest_fy = max(f.fy for f in latest_fy_facts) if latest_fy_facts else 0
+    latest_end = index.end_dates[0]
+    prior_end = index.end_dates[1] if len(index.end_dates) > 1 else None
 
-    raw: dict[str, float | None] = {}
+    raw: dict[str, float] = {}
     source_tags: dict[str, str] = {}
 
-    for xbrl_tag, kpi_name in XBRL_KPI_MAP:
-        if kpi_name in raw and raw[kpi_name] is not None:
-            continue
-        value, actual_tag = _get_value_for_period(facts, xbrl_tag, latest_end)
-        if value is not None:
-            raw[kpi_name] = value
-            source_tags[kpi_name] = actual_tag or xbrl_tag
+    for kpi_name in _KPI_TAGS:
+        fact = _first_fact(index, kpi_name, latest_end)
+        if fact is not None:
+            raw[kpi_name] = fact.value
+            source_tags[kpi_name] = fact.tag
 
     # Prior year revenue for YoY
     revenue_prior = None
-    if prior_end:
-        for xbrl_tag, kpi_name in XBRL_KPI_MAP:
-            if kpi_name == "revenue":
-                val, _ = _get_value_for_period(facts, xbrl_tag, prior_end)
-                if val is not None:
-                    revenue_prior = val
-                    break
-
     net_income_prior = None
     if prior_end:
-        net_income_prior, _ = _get_value_for_period(facts, "NetIncomeLoss", prior_end)
-
-    # Compute derived metrics
-    revenue = raw.get("revenue")
-    gross_profit = raw.get("gross_profit")
-    operating_income = raw.get("operating_income")
-    total_liabilities = raw.get("total_liabilities")
-    stockholders_equity = raw.get("stockholders_equity")
-    operating_cash_flow = raw.get("operating_cash_flow")
-    capex = raw.get("_capex")
-
-    gross_margin = (gross_profit / revenue) if revenue and gross_profit else None
-    operating_margin = (operating_income / revenue) if revenue and operating_income else None
-    debt_to_equity = (
-        (total_liabilities / stockholders_equity)
-        if stockholders_equity and total_liabilities
-        else None
-    )
-    revenue_yoy = (
-        ((revenue - revenue_prior) / abs(revenue_prior))
-        if revenue and revenue_prior and revenue_prior != 0
-        else None
-    )
+        fact = _first_fact(index, "revenue", prior_end)
+        revenue_prior = fact.value if fact is not None else None
+        fact = index.by_key.get(("NetIncomeLoss", prior_end))
+        net_income_prior = fact.value if fact is not None else None
 
-    assets_current = raw.get("_assets_current")
-    liabilities_current = raw.get("_liabilities_current")
-    current_ratio = (
-        (assets_current / liabilities_current)
-        if assets_current and liabilities_current and liabilities_current != 0
-        else None
+    return _RawKpis(
+        raw=raw,
+        source_tags=source_tags,
+        latest_end=latest_end,
+        latest_fy=index.max_fy.get(latest_end, 0),
+        revenue_prior=revenue_prior,
+        net_income_prior=net_income_prior,
     )
 
-    free_cash_flow = (
-        (operating_cash_flow - capex)
-        if operating_cash_flow is not None and capex is not None
-        else None
+
+# Derived metric → source_tags note, in FinancialKPIs field order
+_DERIVED_SOURCES = {
+    "revenue_yoy_change": "derived: YoY change",
+    "gross_margin": "derived: gross_profit / revenue",
+    "operating_margin": "derived: operating_income / revenue",
+    "debt_to_equity": "derived: total_liabilities / stockholders_equity",
+    "current_ratio": "derived: assets_current / liabilities_current",
+    "free_cash_flow": "derived: operating_cash_flow - capex",
+}
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Elementwise num / den, NaN wherever either side is missing or zero."""
+    valid = (num != 0) & (den != 0) & ~np.isnan(num) & ~np.isnan(den)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid, num / den, np.nan)
+
+
+def _derive_kpis(cols: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Compute every derived metric over a batch of tickers at once.
+
+    *cols* maps raw KPI names to float64 columns with NaN for "not reported";
+    results use NaN for "not computable".
+    """
+    revenue = cols["revenue"]
+    revenue_prior = cols["revenue_prior"]
+    yoy_valid = (
+        (revenue != 0) & (revenue_prior != 0)
+        & ~np.isnan(revenue) & ~np.isnan(revenue_prior)
     )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        revenue_yoy = np.where(
+            yoy_valid, (revenue - revenue_prior) / np.abs(revenue_prior), np.nan
+        )
+    return {
+        "revenue_yoy_change": revenue_yoy,
+        "gross_margin": _ratio(cols["gross_profit"], revenue),
+        "operating_margin": _ratio(cols["operating_income"], revenue),
+        "debt_to_equity": _ratio(
+            cols["total_liabilities"], cols["stockholders_equity"]
+        ),
+        "current_ratio": _ratio(
+            cols["_assets_current"], cols["_liabilities_current"]
+        ),
+        "free_cash_flow": cols["operating_cash_flow"] - cols["_capex"],
+    }
+
+
+def extract_kpis_batch(
+    facts_per_ticker: list[list[FinancialFact]],
+) -> list[FinancialKPIs]:
+    """Extract KPIs for many tickers, deriving all ratios in one NumPy pass.
+
+    Reported values are looked up per ticker; the derived margins, leverage,
+    liquidity and growth metrics are then computed column-wise across the
+    whole batch. Results are identical to calling ``_extract_kpis`` per ticker.
+    """
+    return _build_kpis([_collect_raw_kpis(facts) for facts in facts_per_ticker])
+
+
+def _build_kpis(collected: list[_RawKpis | None]) -> list[FinancialKPIs]:
+    """Derive ratios for every collected ticker and assemble the models."""
+    present = [r for r in collected if r is not None]
+    if not present:
+        return [FinancialKPIs() for _ in collected]
 
-    # Record derived metric sources
-    if gross_margin is not None:
-        source_tags["gross_margin"] = "derived: gross_profit / revenue"
-    if operating_margin is not None:
-        source_tags["operating_margin"] = "derived: operating_income / revenue"
-    if debt_to_equity is not None:
-        source_tags["debt_to_equity"] = "derived: total_liabilities / stockholders_equity"
-    if revenue_yoy is not None:
-        source_tags["revenue_yoy_change"] = "derived: YoY change"
-    if current_ratio is not None:
-        source_tags["current_ratio"] = "derived: assets_current / liabilities_current"
-    if free_cash_flow is not None:
-        source_tags["free_cash_flow"] = "derived: operating_cash_flow - capex"
+    nan = float("nan")
+    cols = {
+        name: np.array([r.raw.get(name, nan) for r in present], dtype=np.float64)
+        for name in _KPI_TAGS
+    }
+    cols["revenue_prior"] = np.array(
+        [nan if r.revenue_prior is None else r.revenue_prior for r in present],
+        dtype=np.float64,
+    )
+    derived = {
+        name: [None if np.isnan(v) else v for v in values.tolist()]
+        for name, values in _derive_kpis(cols).items()
+    }
 
+    results: list[FinancialKPIs] = []
+    row = 0
+    for r in collected:
+        if r is None:
+            results.append(FinancialKPIs())
+            continue
+        results.append(
+            _assemble_kpis(r, {name: derived[name][row] for name in _DERIVED_SOURCES})
+        )
+        row += 1
+    return results
+
+
+def _assemble_kpis(r: _RawKpis, derived: dict[str, float | None]) -> FinancialKPIs:
+    """Build the FinancialKPIs model from reported and derived values."""
+    source_tags = dict(r.source_tags)
+    for name, note in _DERIVED_SOURCES.items():
+        if derived[name] is not None:
+            source_tags[name] = note
     return FinancialKPIs(
-        revenue=revenue,
-        revenue_prior=revenue_prior,
-        revenue_yoy_change=revenue_yoy,
-        net_income=raw.get("net_income"),
-        net_income_prior=net_income_prior,
-        gross_profit=gross_profit,
-        gross_margin=gross_margin,
-        operating_income=operating_income,
-        operating_margin=operating_margin,
-        total_assets=raw.get("total_assets"),
-        total_liabilities=total_liabilities,
-        stockholders_equity=stockholders_equity,
-        debt_to_equity=debt_to_equity,
-        long_term_debt=raw.get("long_term_debt"),
-        cash_and_equivalents=raw.get("cash_and_equivalents"),
-        current_ratio=current_ratio,
-        operating_cash_flow=operating_cash_flow,
-        free_cash_flow=free_cash_flow,
-        eps_basic=raw.get("eps_basic"),
-        fiscal_year=latest_fy,
-        period_end=latest_end,
+        revenue=r.raw.get("revenue"),
+        revenue_prior=r.revenue_prior,
+        net_income=r.raw.get("net_income"),
+        net_income_prior=r.net_income_prior,
+        gross_profit=r.raw.get("gross_profit"),
+        operating_income=r.raw.get("operating_income"),
+        total_assets=r.raw.get("total_assets"),
+        total_liabilities=r.raw.get("total_liabilities"),
+        stockholders_equity=r.raw.get("stockholders_equity"),
+        long_term_debt=r.raw.get("long_term_debt"),
+        cash_and_equivalents=r.raw.get("cash_and_equivalents"),
+        operating_cash_flow=r.raw.get("operating_cash_flow"),
+        eps_basic=r.raw.get("eps_basic"),
+        fiscal_year=r.latest_fy,
+        period_end=r.latest_end,
         source_tags=source_tags,
+        **derived,
     )
 
 
+def _scalar_ratio(num: float | None, den: float | None) -> float | None:
+    """num / den, None when either side is missing or zero."""
+    return num / den if num and den else None
+
+
+def _derive_kpis_scalar(r: _RawKpis) -> dict[str, float | None]:
+    """``_derive_kpis`` for a single ticker, in plain floats."""
+    raw = r.raw
+    revenue, revenue_prior = raw.get("revenue"), r.revenue_prior
+    operating_cash_flow, capex = raw.get("operating_cash_flow"), raw.get("_capex")
+    return {
+        "revenue_yoy_change": (
+            (revenue - revenue_prior) / abs(revenue_prior)
+            if revenue and revenue_prior
+            else None
+        ),
+        "gross_margin": _scalar_ratio(raw.get("gross_profit"), revenue),
+        "operating_margin": _scalar_ratio(raw.get("operating_income"), revenue),
+        "debt_to_equity": _scalar_ratio(
+            raw.get("total_liabilities"), raw.get("stockholders_equity")
+        ),
+        "current_ratio": _scalar_ratio(
+            raw.get("_assets_current"), raw.get("_liabilities_current")
+        ),
+        "free_cash_flow": (
+            operating_cash_flow - capex
+            if operating_cash_flow is not None and capex is not None
+            else None
+        ),
+    }
+
+
+def _extract_kpis(
+    facts: list[FinancialFact], *, index: _FactIndex | None = None
+) -> FinancialKPIs:
+    """Deterministically extract KPIs from bronze facts.
+
+    *index* is an optional prebuilt ``_index_facts(facts)``; with it the
+    fact scan is skipped and *facts* is not read. A single ticker derives
+    its ratios in plain Python; ``extract_kpis_batch`` is the NumPy path.
+    """
+    r = _collect_raw_kpis(facts, index)
+    if r is None:
+        return FinancialKPIs()
+    return _assemble_kpis(r, _derive_kpis_scalar(r))
+
+
+# (FinancialKPIs field, prompt line template), in prompt order
+_PROMPT_LINES: tuple[tuple[str, str], ...] = (
+    ("revenue", "Revenue: ${:,.0f}"),
+    ("revenue_prior", "Revenue (Prior Year): ${:,.0f}"),
+    ("revenue_yoy_change", "Revenue YoY Change: {:.1%}"),
+    ("net_income", "Net Income: ${:,.0f}"),
+    ("gross_margin", "Gross Margin: {:.1%}"),
+    ("operating_margin", "Operating Margin: {:.1%}"),
+    ("total_assets", "Total Assets: ${:,.0f}"),
+    ("total_liabilities", "Total Liabilities: ${:,.0f}"),
+    ("stockholders_equity", "Stockholders' Equity: ${:,.0f}"),
+    ("debt_to_equity", "Debt-to-Equity: {:.2f}"),
+    ("long_term_debt", "Long-term Debt: ${:,.0f}"),
+    ("cash_and_equivalents", "Cash & Equivalents: ${:,.0f}"),
+    ("current_ratio", "Current Ratio: {:.2f}"),
+    ("operating_cash_flow", "Operating Cash Flow: ${:,.0f}"),
+    ("free_cash_flow", "Free Cash Flow: ${:,.0f}"),
+    ("eps_basic", "EPS (Basic): ${:.2f}"),
+)
+
+
 def _format_kpis_for_prompt(kpis: FinancialKPIs) -> str:
     """Format KPIs as readable text for LLM prompts."""
     lines = [f"Fiscal Year: {kpis.fiscal_year}", f"Period End: {kpis.period_end}"]
-    if kpis.revenue is not None:
-        lines.append(f"Revenue: ${kpis.revenue:,.0f}")
-    if kpis.revenue_prior is not None:
-        lines.append(f"Revenue (Prior Year): ${kpis.revenue_prior:,.0f}")
-    if kpis.revenue_yoy_change is not None:
-        lines.append(f"Revenue YoY Change: {kpis.revenue_yoy_change:.1%}")
-    if kpis.net_income is not None:
-        lines.append(f"Net Income: ${kpis.net_income:,.0f}")
-    if kpis.gross_margin is not None:
-        lines.append(f"Gross Margin: {kpis.gross_margin:.1%}")
-    if kpis.operating_margin is not None:
-        lines.append(f"Operating Margin: {kpis.operating_margin:.1%}")
-    if kpis.total_assets is not None:
-        lines.append(f"Total Assets: ${kpis.total_assets:,.0f}")
-    if kpis.total_liabilities is not None:
-        lines.append(f"Total Liabilities: ${kpis.total_liabilities:,.0f}")
-    if kpis.stockholders_equity is not None:
-        lines.append(f"Stockholders' Equity: ${kpis.stockholders_equity:,.0f}")
-    if kpis.debt_to_equity is not None:
-        lines.append(f"Debt-to-Equity: {kpis.debt_to_equity:.2f}")
-    if kpis.long_term_debt is not None:
-        lines.append(f"Long-term Debt: ${kpis.long_term_debt:,.0f}")
-    if kpis.cash_and_equivalents is not None:
-        lines.append(f"Cash & Equivalents: ${kpis.cash_and_equivalents:,.0f}")
-    if kpis.current_ratio is not None:
-        lines.append(f"Current Ratio: {kpis.current_ratio:.2f}")
-    if kpis.operating_cash_flow is not None:
-        lines.append(f"Operating Cash Flow: ${kpis.operating_cash_flow:,.0f}")
-    if kpis.free_cash_flow is not None:
-        lines.append(f"Free Cash Flow: ${kpis.free_cash_flow:,.0f}")
-    if kpis.eps_basic is not None:
-        lines.append(f"EPS (Basic): ${kpis.eps_basic:.2f}")
+    lines.extend(
+        template.format(value)
+        for field_name, template in _PROMPT_LINES
+        if (value := getattr(kpis, field_name)) is not None
+    )
     return "\n".join(lines)
 
 
-async def _flag_anomalies(kpis: FinancialKPIs, company_name: str) -> list[str]:
-    """Use GPT-4o to flag anomalies in the extracted KPIs."""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+# FinancialKPIs fields that are row metadata or lists, not CSV metrics
+_NON_METRIC_FIELDS = frozenset(
+    {"fiscal_year", "period_end", "currency", "source_tags", "anomalies"}
+)
+
+
+def _kpi_summary(state: PipelineState) -> str:
+    """KPI prompt text for gold agents, reusing the copy formatted here."""
+    return state.get("silver_kpis_summary") or _format_kpis_for_prompt(state["silver_kpis"])
+
+
+async def _flag_anomalies(kpi_summary: str, company_name: str) -> list[str]:
+    """Use GPT-4o to flag anomalies in the formatted KPI summary.
+
+    Goes through the persistent LLM response cache, so re-running a ticker
+    whose KPIs haven't changed returns the stored flags without a call.
+    """
+    if not has_openai_key():
         logger.warning("OPENAI_API_KEY not set, skipping anomaly detection")
         return []
 
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    structured_llm = llm.with_structured_output(AnomalyAnalysis)
-
-    kpi_summary = _format_kpis_for_prompt(kpis)
-    result = await structured_llm.ainvoke(
+    result = await ainvoke_structured(
+        "gpt-4o",
+        0,
+        AnomalyAnalysis,
         f"You are a financial analyst. Review these KPIs for {company_name} "
         f"and identify any anomalies, red flags, or concerns. "
         f"Focus on: negative margins, declining revenue, high leverage, "
-        f"low liquidity, or unusual ratios.\n\n{kpi_summary}"
+        f"low liquidity, or unusual ratios.\n\n{kpi_summary}",
     )
     return result.anomalies
 
@@ -268,36 +411,44 @@ async def silver_financial_kpis_agent(state: PipelineState) -> dict:
         }
 
     kpis = _extract_kpis(facts)
+    # Formatted once here; the gold agents reuse it via silver_kpis_summary
+    kpi_summary = _format_kpis_for_prompt(kpis)
 
     # Flag anomalies with LLM
     company_name = company_info.company_name if company_info else ticker
     try:
-        anomalies = await _flag_anomalies(kpis, company_name)
+        anomalies = await _flag_anomalies(kpi_summary, company_name)
         kpis.anomalies = anomalies
     except Exception as e:
         logger.warning(f"Anomaly detection failed: {e}")
         errors.append(f"Anomaly detection skipped: {e}")
 
     # Write silver table
-    kpi_dict = kpis.model_dump(exclude={"source_tags", "anomalies"})
-    rows = []
-    for field_name, value in kpi_dict.items():
-        if field_name in ("fiscal_year", "period_end", "currency"):
-            continue
-        rows.append({
+    # One row per metric, read straight off the model (no model_dump copy)
+    rows = [
+        {
             "metric": field_name,
-            "value": value,
+            "value": getattr(kpis, field_name),
             "source_tag": kpis.source_tags.get(field_name, "derived"),
             "fiscal_year": kpis.fiscal_year,
             "period_end": kpis.period_end,
             "currency": kpis.currency,
-        })
+        }
+        for field_name in FinancialKPIs.model_fields
+        if field_name not in _NON_METRIC_FIELDS
+    ]
 
     writer = CsvWriter(ticker)
-    path = writer.write_silver("financial_kpis", rows, source_bronze="bronze_xbrl_facts.csv")
+    path = await asyncio.to_thread(
+        writer.write_silver,
+        "financial_kpis",
+        rows,
+        source_bronze="bronze_xbrl_facts.csv",
+    )
 
     return {
         "silver_kpis": kpis,
+        "silver_kpis_summary": kpi_summary,
         "silver_kpis_path": str(path),
         "errors": errors,
         "current_stage": "silver",
@@ -1,21 +1,33 @@
 """Silver: Governance — extracts governance data from bronze DEF 14A proxy text.
 
 Uses chunked map-reduce extraction:
-  1. Split full proxy text into ~30K char chunks
-  2. Extract governance data points from each chunk in parallel (gpt-4o-mini)
-  3. Merge all extracted data into final GovernanceData (gpt-4o)
+  1. Split full proxy text into ~24K-token chunks on paragraph boundaries
+  2. Extract governance data points from each chunk concurrently (gpt-4o-mini,
+     at most GOV_MAP_CONCURRENCY requests in flight)
+  3. Merge all extracted data into final GovernanceData (gpt-4o), or in
+     Python when only one chunk yielded anything
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
-
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel
-
+import re
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from backend.agents._llm_clients import (
+    ainvoke_limited,
+    count_tokens,
+    get_http_client,
+    get_llm,
+    get_structured_llm,
+    has_openai_key,
+    loop_scoped,
+)
 from backend.data.csv_writer import CsvWriter
 from backend.models import (
     DirectorInfo,
@@ -26,7 +38,78 @@ from backend.models import (
 
 logger = logging.getLogger(__name__)
 
-CHUNK_SIZE = 30_000  # chars per chunk for map phase
+# Tokens per map-phase chunk. Proxies are mostly prose, so the old 30K-char
+# chunks were only ~7.5K tokens; 24K cuts the number of map calls ~3× while
+# staying well inside the range where gpt-4o-mini extraction recall holds up.
+CHUNK_TOKENS = 24_000
+
+# Proxies up to this size go to one structured gpt-4o call instead of
+# map-reduce (~30K chars, the pre-token-budget cutoff). Kept separate from
+# CHUNK_TOKENS so bigger map chunks don't route most full proxies to gpt-4o.
+SINGLE_CALL_TOKENS = 7_500
+
+# Serialized empty GovernanceData, built once; copy via _empty_governance()
+_EMPTY_GOV: dict = GovernanceData().model_dump()
+
+
+def _empty_governance() -> dict:
+    """A fresh empty governance dict (list fields are not shared)."""
+    return {k: list(v) if isinstance(v, list) else v for k, v in _EMPTY_GOV.items()}
+
+
+# OpenAI JSON mode for the map and reduce calls
+_JSON_MODE = {"type": "json_object"}
+
+# Arrays each map-phase chunk result carries (see EXTRACT_PROMPT)
+_CHUNK_KEYS = ("compensation", "directors", "neo_compensation", "governance")
+
+# Max in-flight map-phase requests per process (override: GOV_MAP_CONCURRENCY).
+# Large proxies split into hundreds of chunks; firing them all at once trips
+# the gpt-4o-mini rate limit and turns into a retry storm.
+GOV_MAP_CONCURRENCY = 20
+
+
+def _map_semaphore() -> asyncio.Semaphore:
+    """Map-phase concurrency cap for the running loop, sized from the env."""
+    return loop_scoped(
+        "gov_map_semaphore",
+        lambda: asyncio.Semaphore(
+            int(os.environ.get("GOV_MAP_CONCURRENCY", GOV_MAP_CONCURRENCY))
+        ),
+    )
+
+
+def _map_llm() -> Any:
+    """Shared gpt-4o-mini client for the map phase (one per event loop).
+
+    Reused across chunks and tickers so its HTTP connection pool stays warm;
+    extra retries absorb the occasional 429 at the concurrency ceiling.
+    JSON mode makes the API return a bare object, with no markdown fences.
+    """
+
+    def build() -> Any:
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0,
+            max_retries=5,
+            http_async_client=get_http_client(),
+            model_kwargs={"response_format": _JSON_MODE},
+        )
+
+    return loop_scoped("gov_map_llm", build)
+
+
+def _parse_json(content: str) -> dict:
+    """Parse an LLM JSON reply, stripping markdown fences only if needed."""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        content = content.strip()
+        if not content.startswith("```"):
+            raise
+        return orjson.loads(content.split("\n", 1)[1].rsplit("```", 1)[0])
 
 
 # ---------------------------------------------------------------------------
@@ -140,7 +223,7 @@ Set fields to null if not found. Return ONLY the JSON object.
 
 
 async def _extract_chunk(
-    llm: ChatOpenAI,
+    llm: Any,
     company_name: str,
     chunk: str,
     chunk_num: int,
@@ -154,33 +237,89 @@ async def _extract_chunk(
         text=chunk,
     )
     try:
-        resp = await llm.ainvoke(prompt)
-        content = resp.content.strip()
-        # Strip markdown code fences
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        return json.loads(content)
+        async with _map_semaphore():
+            resp = await llm.ainvoke(prompt)
+        return _parse_json(resp.content)
     except Exception as e:
         logger.warning("Chunk %d extraction failed: %s", chunk_num, e)
-        return {"compensation": [], "directors": [], "neo_compensation": [], "governance": []}
+        return {key: [] for key in _CHUNK_KEYS}
+
+
+def _combine_chunks(chunk_results: list[dict]) -> dict[str, list]:
+    """Concatenate each map-phase array across all chunk results."""
+    combined: dict[str, list] = {key: [] for key in _CHUNK_KEYS}
+    for cr in chunk_results:
+        for key in combined:
+            combined[key].extend(cr.get(key) or [])
+    return combined
+
+
+def _norm(value: Any) -> Any:
+    """Case/whitespace-insensitive form of a string for dedupe keys."""
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def _dedupe(items: list, key: Any) -> list[dict]:
+    """Collapse dicts sharing ``key(item)``, filling gaps from later copies.
+
+    The first occurrence keeps its position and values; a later duplicate
+    only contributes fields the first one left empty, so nothing extracted
+    is lost, only repeated.
+    """
+    merged: dict[Any, dict] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        k = key(item)
+        try:
+            hash(k)
+        except TypeError:  # e.g. the LLM returned a list for "year"
+            k = repr(k)
+        kept = merged.get(k)
+        if kept is None:
+            merged[k] = dict(item)
+            continue
+        for field, value in item.items():
+            if kept.get(field) in (None, "", []):
+                kept[field] = value
+    return list(merged.values())
+
+
+def _prededuplicate(combined: dict[str, list]) -> dict[str, list]:
+    """Drop repeated data points before they reach the gpt-4o merge prompt.
+
+    Large proxies repeat the same directors and pay figures in many chunks
+    (bios, committee tables, the summary compensation table), and the merge
+    prompt grows with every copy. Distinct values are all kept for the LLM
+    to reconcile; only exact repeats of a data point are collapsed.
+    """
+    return {
+        "compensation": _dedupe(
+            combined["compensation"],
+            lambda c: (c.get("field"), c.get("year"), _norm(str(c.get("value")))),
+        ),
+        "directors": _dedupe(
+            combined["directors"],
+            lambda d: (_norm(d.get("name")), d.get("director_since")),
+        ),
+        "neo_compensation": _dedupe(
+            combined["neo_compensation"],
+            lambda n: (_norm(n.get("name")), n.get("fiscal_year")),
+        ),
+        "governance": _dedupe(
+            combined["governance"],
+            lambda g: (g.get("field"), _norm(str(g.get("value")))),
+        ),
+    }
 
 
 async def _merge_chunks(
-    llm: ChatOpenAI,
+    llm: Any,
     company_name: str,
     chunk_results: list[dict],
 ) -> dict:
     """Merge extracted data from all chunks into final GovernanceData."""
-    # Combine all chunk results into one consolidated object
-    combined = {
-        "compensation": [],
-        "directors": [],
-        "neo_compensation": [],
-        "governance": [],
-    }
-    for cr in chunk_results:
-        for key in combined:
-            combined[key].extend(cr.get(key, []))
+    combined = _prededuplicate(_combine_chunks(chunk_results))
 
     # If nothing was extracted at all, short-circuit
     total_items = sum(len(v) for v in combined.values())
@@ -190,32 +329,190 @@ async def _merge_chunks(
     prompt = MERGE_PROMPT.format(
         company_name=company_name,
         n_chunks=len(chunk_results),
-        extracted_json=json.dumps(combined, indent=2, default=str),
+        extracted_json=orjson.dumps(
+            combined, default=str, option=orjson.OPT_INDENT_2
+        ).decode(),
     )
-    resp = await llm.ainvoke(prompt)
-    content = resp.content.strip()
-    if content.startswith("```"):
-        content = content.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-    return json.loads(content)
+    resp = await ainvoke_limited(llm, prompt)
+    return _parse_json(resp.content)
+
+
+# ---------------------------------------------------------------------------
+# Deterministic reduce: used when only one chunk produced data
+# ---------------------------------------------------------------------------
+
+_COMP_FIELDS = (
+    "ceo_total_comp", "ceo_comp_prior", "ceo_pay_growth",
+    "median_employee_pay", "ceo_pay_ratio",
+)
+_BOOL_FIELDS = ("has_poison_pill", "has_staggered_board", "has_dual_class")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_NO_YEAR = float("-inf")  # Sorts undated items below any dated one
+
+
+def _as_number(value: Any) -> float | None:
+    """Parse an extracted value like 63209845, "$63,209,845", "15%" or "533:1"."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    text = value.replace(",", "").replace("$", "")
+    match = _NUMBER_RE.search(text)
+    if match is None:
+        return None
+    number = float(match.group())
+    return number / 100 if "%" in text else number
+
+
+def _as_bool(value: Any) -> bool | None:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "yes", "y"):
+            return True
+        if lowered in ("false", "no", "n", "none"):
+            return False
+    return None
+
+
+def _as_year(value: Any) -> float:
+    """Fiscal year of an extracted item, or _NO_YEAR when missing/unparseable."""
+    year = _as_number(value)
+    return _NO_YEAR if year is None else year
+
+
+def _is_ceo(title: Any) -> bool:
+    title = str(title or "").lower()
+    return "ceo" in title or "chief executive" in title
+
+
+def _deterministic_merge(combined: dict[str, list]) -> dict:
+    """Reduce single-source chunk data in Python instead of a gpt-4o call.
+
+    Returns a dict with the ``MERGE_PROMPT`` output shape: directors and NEOs
+    deduplicated by normalized name (NEOs keeping their latest fiscal year),
+    the most recent value per compensation field, governance booleans OR-ed,
+    and the same derived fields.
+    """
+    merged: dict[str, Any] = {}
+
+    # Per field, the value from the latest year (largest on a same-year tie);
+    # undated values rank below dated ones. A chunk holding the multi-year
+    # summary compensation table also yields the prior years' CEO totals.
+    latest: dict[str, tuple[float, float]] = {}
+    ceo_totals: dict[float, float] = {}
+    for item in combined["compensation"]:
+        if not isinstance(item, dict) or item.get("field") not in _COMP_FIELDS:
+            continue
+        value = _as_number(item.get("value"))
+        if value is None:
+            continue
+        field = item["field"]
+        year = _as_year(item.get("year"))
+        rank = (year, value)
+        if field not in latest or rank > latest[field]:
+            latest[field] = rank
+        if field == "ceo_total_comp" and year != _NO_YEAR:
+            ceo_totals[year] = max(value, ceo_totals.get(year, value))
+    merged.update({field: value for field, (_, value) in latest.items()})
+
+    if "ceo_comp_prior" not in merged and "ceo_total_comp" in latest:
+        current_year = latest["ceo_total_comp"][0]
+        earlier = [year for year in ceo_totals if year < current_year]
+        if earlier:
+            merged["ceo_comp_prior"] = ceo_totals[max(earlier)]
+
+    directors = {
+        d["name"].strip().lower(): d
+        for d in combined["directors"]
+        if isinstance(d, dict) and str(d.get("name") or "").strip()
+    }
+    merged["directors"] = list(directors.values())
+    if directors:
+        merged["board_size"] = len(directors)
+        merged["independent_directors"] = sum(
+            1 for d in directors.values() if d.get("is_independent") is True
+        )
+        merged["board_independence_pct"] = (
+            merged["independent_directors"] / merged["board_size"]
+        )
+
+    # One row per executive: the most recent fiscal year's
+    neos: dict[str, dict] = {}
+    for n in combined["neo_compensation"]:
+        if not isinstance(n, dict) or not str(n.get("name") or "").strip():
+            continue
+        key = n["name"].strip().lower()
+        seen = neos.get(key)
+        if seen is None or _as_year(n.get("fiscal_year")) >= _as_year(
+            seen.get("fiscal_year")
+        ):
+            neos[key] = n
+    merged["neo_compensation"] = list(neos.values())
+    ceo = next((n for n in neos.values() if _is_ceo(n.get("title"))), None)
+    if ceo is not None:
+        merged["ceo_name"] = ceo["name"].strip()
+        if merged.get("ceo_total_comp") is None:
+            merged["ceo_total_comp"] = _as_number(ceo.get("total_comp"))
+
+    flags: dict[str, list[bool]] = {field: [] for field in _BOOL_FIELDS}
+    anti_takeover: list[str] = []
+    governance_flags: list[str] = []
+    for item in combined["governance"]:
+        if not isinstance(item, dict):
+            continue
+        field, value = item.get("field"), item.get("value")
+        if field in flags:
+            parsed = _as_bool(value)
+            if parsed is not None:
+                flags[field].append(parsed)
+        elif value and field == "anti_takeover_provision":
+            anti_takeover.append(str(value))
+        elif value and field == "governance_flag":
+            governance_flags.append(str(value))
+    for field, values in flags.items():
+        merged[field] = any(values) if values else None
+    merged["anti_takeover_provisions"] = list(dict.fromkeys(anti_takeover))
+    merged["governance_flags"] = list(dict.fromkeys(governance_flags))
+
+    current, prior = merged.get("ceo_total_comp"), merged.get("ceo_comp_prior")
+    if merged.get("ceo_pay_growth") is None and current is not None and prior:
+        merged["ceo_pay_growth"] = (current - prior) / prior
+
+    return merged
+
+
+_DIRECTORS = TypeAdapter(list[DirectorInfo])
+_NEOS = TypeAdapter(list[NEOCompensation])
+
+
+def _validate_items(adapter: TypeAdapter, items: Any, label: str) -> list:
+    """Validate a list of LLM-extracted dicts in one pydantic-core call.
+
+    Only if the batch fails are items re-validated one by one, so a single
+    malformed entry is skipped instead of discarding the rest.
+    """
+    items = [item for item in items or [] if isinstance(item, dict)]
+    try:
+        return adapter.validate_python(items)
+    except ValidationError:
+        pass
+    valid = []
+    for item in items:
+        try:
+            valid.extend(adapter.validate_python([item]))
+        except ValidationError:
+            logger.warning("Skipping invalid %s: %s", label, item)
+    return valid
 
 
 def _build_governance_data(merged: dict) -> GovernanceData:
     """Convert merged JSON dict into GovernanceData model."""
-    directors = []
-    for d in merged.get("directors", []):
-        if isinstance(d, dict):
-            try:
-                directors.append(DirectorInfo(**d))
-            except Exception:
-                logger.warning("Skipping invalid director: %s", d)
-
-    neo_comp = []
-    for n in merged.get("neo_compensation", []):
-        if isinstance(n, dict):
-            try:
-                neo_comp.append(NEOCompensation(**n))
-            except Exception:
-                logger.warning("Skipping invalid NEO: %s", n)
+    directors = _validate_items(_DIRECTORS, merged.get("directors"), "director")
+    neo_comp = _validate_items(_NEOS, merged.get("neo_compensation"), "NEO")
 
     return GovernanceData(
         ceo_name=merged.get("ceo_name") or "",
@@ -279,13 +576,14 @@ Set fields to null if not found. Do not guess values.
 async def silver_governance_agent(state: PipelineState) -> dict:
     """Extract governance data from bronze DEF 14A proxy text.
 
-    Uses chunked map-reduce for large proxy texts (>30K chars):
+    Uses chunked map-reduce for large proxy texts (>SINGLE_CALL_TOKENS tokens):
       - Map: parallel gpt-4o-mini calls extract data from each chunk
       - Reduce: gpt-4o merges all extracted data into GovernanceData
+        (done deterministically when only one chunk yielded data)
 
     Falls back to single gpt-4o call for short texts.
 
-    Reads: state.bronze_def14a_proxy
+    Reads: state.bronze_def14a_proxy (releases its text once consumed)
     Writes: silver_governance.csv
     """
     ticker = state["ticker"]
@@ -296,7 +594,7 @@ async def silver_governance_agent(state: PipelineState) -> dict:
 
     proxy_text = proxy_data.get("text", "")
     if not proxy_text:
-        governance = GovernanceData().model_dump()
+        governance = _empty_governance()
         return {
             "silver_governance": governance,
             "silver_governance_path": None,
@@ -304,35 +602,32 @@ async def silver_governance_agent(state: PipelineState) -> dict:
             "progress_messages": ["Silver governance: no bronze DEF 14A data"],
         }
 
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not has_openai_key():
         logger.warning("OPENAI_API_KEY not set, generating placeholder governance")
-        governance = GovernanceData().model_dump()
+        governance = _empty_governance()
         errors.append("Governance used placeholder mode (no API key)")
-    elif len(proxy_text) <= CHUNK_SIZE:
+    elif count_tokens(proxy_text) <= SINGLE_CALL_TOKENS:
         # Short text — single LLM call
-        llm = ChatOpenAI(model="gpt-4o", temperature=0)
-        structured_llm = llm.with_structured_output(GovernanceAnalysis)
+        structured_llm = get_structured_llm("gpt-4o", 0, GovernanceAnalysis)
         prompt = GOVERNANCE_PROMPT.format(
             company_name=company_name,
             proxy_text=proxy_text,
         )
         try:
-            result = await structured_llm.ainvoke(prompt)
+            result = await ainvoke_limited(structured_llm, prompt)
             governance = result.governance.model_dump()
         except Exception as e:
             logger.error(f"LLM governance analysis failed: {e}")
-            governance = GovernanceData().model_dump()
+            governance = _empty_governance()
             errors.append(f"Governance LLM failed: {e}")
     else:
         # Chunked map-reduce extraction
         try:
-            governance = await _chunked_extraction(
-                company_name, proxy_text, errors
-            )
+            chunks = _split_on_tokens(proxy_text, CHUNK_TOKENS)
+            governance = await _chunked_extraction(company_name, chunks, errors)
         except Exception as e:
             logger.error(f"Chunked governance extraction failed: {e}")
-            governance = GovernanceData().model_dump()
+            governance = _empty_governance()
             errors.append(f"Governance chunked extraction failed: {e}")
 
     # Flatten governance for CSV (exclude nested lists-of-models)
@@ -342,43 +637,107 @@ async def silver_governance_agent(state: PipelineState) -> dict:
     }
 
     writer = CsvWriter(ticker)
-    path = writer.write_silver(
-        "governance", [gov_flat], source_bronze="bronze_def14a_proxy.csv"
+    path = await asyncio.to_thread(
+        writer.write_silver,
+        "governance",
+        [gov_flat],
+        source_bronze="bronze_def14a_proxy.csv",
     )
 
     # Write directors as a separate flat CSV table
     directors = governance.get("directors", [])
     if directors:
-        writer.write_silver(
-            "governance_directors", directors, source_bronze="bronze_def14a_proxy.csv"
+        await asyncio.to_thread(
+            writer.write_silver,
+            "governance_directors",
+            directors,
+            source_bronze="bronze_def14a_proxy.csv",
         )
 
     return {
         "silver_governance": governance,
         "silver_governance_path": str(path),
+        # This agent is the proxy text's only reader: drop the multi-MB blob
+        # from state now (it stays on disk in bronze_def14a_proxy.csv)
+        "bronze_def14a_proxy": {k: v for k, v in proxy_data.items() if k != "text"},
         "errors": errors,
         "progress_messages": [f"Governance analysis complete for {company_name}"],
     }
 
 
+# Preferred chunk breaks, strongest first: paragraph, line, sentence
+_BREAKS = ("\n\n", "\n", ". ")
+
+
+def _split_on_boundaries(text: str, size: int, slack: int = 2048) -> list[str]:
+    """Split *text* into ~*size*-char chunks, breaking on natural boundaries.
+
+    Each cut lands on the last paragraph break within ±*slack* chars of the
+    nominal boundary, falling back to a line break, then a sentence end,
+    then a hard cut, so tables and director bios rarely straddle two chunks.
+    """
+    chunks: list[str] = []
+    start, n = 0, len(text)
+    while n - start > size + slack:
+        lo, hi = start + max(size - slack, 1), start + size + slack
+        for sep in _BREAKS:
+            cut = text.rfind(sep, lo, hi)
+            if cut != -1:
+                cut += len(sep)
+                break
+        else:
+            cut = start + size
+        chunks.append(text[start:cut])
+        start = cut
+    if start < n:
+        chunks.append(text[start:])
+    return chunks
+
+
+def _split_on_tokens(text: str, budget: int) -> list[str]:
+    """Pack whole paragraphs of *text* into chunks of at most ~*budget* tokens.
+
+    Each paragraph is tokenized once. A paragraph that alone exceeds the
+    budget is cut with ``_split_on_boundaries`` at a char size scaled from
+    its own chars-per-token ratio.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    paragraphs = text.split("\n\n")
+    last = len(paragraphs) - 1
+    for i, para in enumerate(paragraphs):
+        if i < last:
+            para += "\n\n"
+        tokens = count_tokens(para)
+        if current and current_tokens + tokens > budget:
+            chunks.append("".join(current))
+            current, current_tokens = [], 0
+        if tokens > budget:
+            size = len(para) * budget // tokens
+            slack = min(2048, size // 16)
+            chunks.extend(_split_on_boundaries(para, size - slack, slack))
+            continue
+        current.append(para)
+        current_tokens += tokens
+    if current and (joined := "".join(current)):
+        chunks.append(joined)
+    return chunks
+
+
 async def _chunked_extraction(
     company_name: str,
-    proxy_text: str,
+    chunks: list[str],
     errors: list[str],
 ) -> dict:
-    """Run chunked map-reduce governance extraction."""
-    # Split into chunks
-    chunks = [
-        proxy_text[i : i + CHUNK_SIZE]
-        for i in range(0, len(proxy_text), CHUNK_SIZE)
-    ]
+    """Run chunked map-reduce governance extraction over pre-split *chunks*."""
     logger.info(
         "Chunked governance extraction: %d chars → %d chunks",
-        len(proxy_text), len(chunks),
+        sum(len(c) for c in chunks), len(chunks),
     )
 
-    # Map phase: extract from each chunk in parallel using gpt-4o-mini
-    map_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    # Map phase: extract from each chunk concurrently (capped) using gpt-4o-mini
+    map_llm = _map_llm()
     tasks = [
         _extract_chunk(map_llm, company_name, chunk, i + 1, len(chunks))
         for i, chunk in enumerate(chunks)
@@ -387,12 +746,10 @@ async def _chunked_extraction(
 
     # Log extraction stats
     total_items = sum(
-        sum(len(cr.get(k, [])) for k in ("compensation", "directors", "neo_compensation", "governance"))
-        for cr in chunk_results
+        sum(len(cr.get(k) or []) for k in _CHUNK_KEYS) for cr in chunk_results
     )
     active_chunks = sum(
-        1 for cr in chunk_results
-        if any(cr.get(k) for k in ("compensation", "directors", "neo_compensation", "governance"))
+        1 for cr in chunk_results if any(cr.get(k) for k in _CHUNK_KEYS)
     )
     logger.info(
         "Map phase: %d data points from %d/%d chunks",
@@ -401,11 +758,15 @@ async def _chunked_extraction(
 
     if total_items == 0:
         errors.append("Chunked extraction found no governance data")
-        return GovernanceData().model_dump()
+        return _empty_governance()
 
-    # Reduce phase: merge all data using gpt-4o
-    reduce_llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    merged = await _merge_chunks(reduce_llm, company_name, chunk_results)
+    if active_chunks <= 1:
+        # Single source: nothing to reconcile, so skip the gpt-4o round-trip
+        merged = _deterministic_merge(_combine_chunks(chunk_results))
+    else:
+        # Reduce phase: merge multi-sourced data using gpt-4o
+        reduce_llm = get_llm("gpt-4o", 0).bind(response_format=_JSON_MODE)
+        merged = await _merge_chunks(reduce_llm, company_name, chunk_results)
 
     governance_data = _build_governance_data(merged)
     return governance_data.model_dump()
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
+from collections import Counter
+from datetime import date
 
 from backend.data.csv_writer import CsvWriter
 from backend.models import InsiderSignal, PipelineState
@@ -20,30 +22,37 @@ def _detect_clusters(
         if len(dir_trades) < min_insiders:
             continue
 
-        all_dated: list[tuple[datetime, str]] = []
+        # Day ordinals rather than datetimes: fromisoformat is much cheaper
+        # than strptime and the window test becomes plain int arithmetic
+        all_dated: list[tuple[int, str]] = []
         for t in dir_trades:
             try:
-                dt = datetime.strptime(t["transaction_date"], "%Y-%m-%d")
+                dt = date.fromisoformat(t["transaction_date"]).toordinal()
                 all_dated.append((dt, t["insider_name"]))
             except (ValueError, KeyError):
                 continue
 
         all_dated.sort()
 
-        for i in range(len(all_dated)):
-            window_insiders: set[str] = set()
-            for j in range(i, len(all_dated)):
-                if (all_dated[j][0] - all_dated[i][0]).days <= window_days:
-                    window_insiders.add(all_dated[j][1])
-                else:
-                    break
-            if len(window_insiders) >= min_insiders:
-                start_date = all_dated[i][0].strftime("%Y-%m-%d")
+        # Sliding window: [i, j) holds the trades within window_days of trade
+        # i, with per-insider trade counts so each step is O(1) amortized
+        window_counts: Counter[str] = Counter()
+        j = 0
+        for i, (start, _) in enumerate(all_dated):
+            while j < len(all_dated) and all_dated[j][0] - start <= window_days:
+                window_counts[all_dated[j][1]] += 1
+                j += 1
+            if len(window_counts) >= min_insiders:
+                start_date = date.fromordinal(start).isoformat()
                 return (
                     True,
-                    f"Cluster {direction}: {len(window_insiders)} insiders "
+                    f"Cluster {direction}: {len(window_counts)} insiders "
                     f"within {window_days} days starting {start_date}",
                 )
+            insider = all_dated[i][1]
+            window_counts[insider] -= 1
+            if not window_counts[insider]:
+                del window_counts[insider]
     return False, ""
 
 
@@ -67,11 +76,17 @@ async def silver_insider_signal_agent(state: PipelineState) -> dict:
             "progress_messages": ["Silver insider: no bronze Form 4 data"],
         }
 
-    buys = [t for t in raw_trades if t.get("transaction_code") == "P"]
-    sells = [t for t in raw_trades if t.get("transaction_code") == "S"]
-
-    total_buy_shares = sum(t.get("shares", 0) for t in buys)
-    total_sell_shares = sum(t.get("shares", 0) for t in sells)
+    # One pass over the trades for open-market purchase/sale counts and shares
+    n_buys = n_sells = 0
+    total_buy_shares = total_sell_shares = 0
+    for t in raw_trades:
+        code = t.get("transaction_code")
+        if code == "P":
+            n_buys += 1
+            total_buy_shares += t.get("shares") or 0
+        elif code == "S":
+            n_sells += 1
+            total_sell_shares += t.get("shares") or 0
     net_shares = total_buy_shares - total_sell_shares
 
     if total_sell_shares > 0:
@@ -86,16 +101,16 @@ async def silver_insider_signal_agent(state: PipelineState) -> dict:
         signal_str = "bearish"
     elif cluster_detected and "buy" in cluster_desc.lower():
         signal_str = "bullish"
-    elif len(sells) > len(buys) * 2:
+    elif n_sells > n_buys * 2:
         signal_str = "bearish"
-    elif len(buys) > len(sells) * 2:
+    elif n_buys > n_sells * 2:
         signal_str = "bullish"
     else:
         signal_str = "neutral"
 
     signal = InsiderSignal(
-        total_buys=len(buys),
-        total_sells=len(sells),
+        total_buys=n_buys,
+        total_sells=n_sells,
         net_shares=net_shares,
         buy_sell_ratio=buy_sell_ratio,
         cluster_detected=cluster_detected,
@@ -104,8 +119,11 @@ async def silver_insider_signal_agent(state: PipelineState) -> dict:
     ).model_dump()
 
     writer = CsvWriter(ticker)
-    path = writer.write_silver(
-        "insider_transactions", raw_trades, source_bronze="bronze_form4_transactions.csv"
+    path = await asyncio.to_thread(
+        writer.write_silver,
+        "insider_transactions",
+        raw_trades,
+        source_bronze="bronze_form4_transactions.csv",
     )
 
     return {
@@ -114,6 +132,6 @@ async def silver_insider_signal_agent(state: PipelineState) -> dict:
         "silver_insider_signal": signal,
         "errors": errors,
         "progress_messages": [
-            f"Insider signal: {len(buys)} buys, {len(sells)} sells, signal={signal_str}"
+            f"Insider signal: {n_buys} buys, {n_sells} sells, signal={signal_str}"
         ],
     }
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
+import re
 
 from backend.data.csv_writer import CsvWriter
 from backend.models import PipelineState
@@ -14,6 +17,9 @@ PASSIVE_MANAGERS = {
     "fidelity index", "schwab", "spdr", "invesco",
 }
 
+# All passive-manager names as one alternation: one scan per holder name
+_PASSIVE_RE = re.compile("|".join(re.escape(p) for p in sorted(PASSIVE_MANAGERS)))
+
 
 async def silver_institutional_agent(state: PipelineState) -> dict:
     """Classify passive/active holders from bronze 13F data.
@@ -36,19 +42,19 @@ async def silver_institutional_agent(state: PipelineState) -> dict:
     # Classify passive vs active
     for holder in raw_holders:
         name_lower = holder.get("holder_name", "").lower()
-        if any(p in name_lower for p in PASSIVE_MANAGERS):
-            holder["holder_type"] = "passive"
-        else:
-            holder["holder_type"] = "active"
+        holder["holder_type"] = "passive" if _PASSIVE_RE.search(name_lower) else "active"
 
-    # Take top 10 by shares
-    sorted_holders = sorted(
-        raw_holders, key=lambda h: h.get("shares", 0), reverse=True
-    )[:10]
+    # Take top 10 by shares (same order as a stable descending sort)
+    sorted_holders = heapq.nlargest(
+        10, raw_holders, key=lambda h: h.get("shares", 0)
+    )
 
     writer = CsvWriter(ticker)
-    path = writer.write_silver(
-        "institutional_holders", sorted_holders, source_bronze="bronze_13f_holdings.csv"
+    path = await asyncio.to_thread(
+        writer.write_silver,
+        "institutional_holders",
+        sorted_holders,
+        source_bronze="bronze_13f_holdings.csv",
     )
 
     return {
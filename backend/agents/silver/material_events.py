@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import logging
-import os
 
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
+from backend.agents._llm_clients import ainvoke_structured, has_openai_key
 from backend.data.csv_writer import CsvWriter
 from backend.models import MaterialEvent, PipelineState
 
@@ -32,6 +31,19 @@ ITEM_CODE_MAP: dict[str, tuple[str, int]] = {
     "9.01": ("Financial Statements and Exhibits", 1),
 }
 
+# ITEM_CODE_MAP with match needles prebuilt, in lookup order:
+# (code, "Item <code>", lowercased description, description, severity)
+_ITEM_MATCHERS: tuple[tuple[str, str, str, str, int], ...] = tuple(
+    (code, f"Item {code}", code_desc.lower(), code_desc, sev)
+    for code, (code_desc, sev) in ITEM_CODE_MAP.items()
+)
+
+# ITEM_CODE_MAP as listed in EVENT_PROMPT (static, so rendered once)
+_ITEM_CODES_TEXT = "\n".join(
+    f"- {code}: {desc} (default severity {sev})"
+    for code, (desc, sev) in ITEM_CODE_MAP.items()
+)
+
 
 class EventClassification(BaseModel):
     """LLM structured output for 8-K event classification."""
@@ -58,39 +70,52 @@ Flag any Item 4.01, 4.02, or 5.02 events with severity >= 4.
 """
 
 
+def index_events_by_code(events: list[dict]) -> dict[str, list[dict]]:
+    """Group classified events by 8-K item code (shares the event dicts)."""
+    by_code: dict[str, list[dict]] = {}
+    for e in events:
+        by_code.setdefault(e.get("item_code"), []).append(e)
+    return by_code
+
+
 def _rule_based_classify(raw_events: list[dict]) -> list[dict]:
     """Classify 8-K events using item code lookup (no LLM)."""
-    classified = []
-    for event in raw_events:
-        desc = event.get("description", "")
-        matched_code = "8.01"
-        matched_severity = 2
-        matched_desc = "Other Events"
-        for code, (code_desc, sev) in ITEM_CODE_MAP.items():
-            # Match "Item X.XX" or code at start of description.
-            # Avoids false positives on dates like "2025-01-01" embedded mid-string.
-            if f"Item {code}" in desc or desc.startswith(code) or code_desc.lower() in desc.lower():
-                matched_code = code
-                matched_severity = sev
-                matched_desc = code_desc
-                break
-        classified.append(
-            MaterialEvent(
-                filing_date=event.get("filing_date", ""),
-                item_code=matched_code,
-                item_description=matched_desc,
-                severity=matched_severity,
-                summary=desc[:200] if desc else "8-K filing",
-            ).model_dump()
-        )
-    return classified
+    return [_classify_event(event) for event in raw_events]
+
+
+def _classify_event(event: dict) -> dict:
+    """Rule-based MaterialEvent dict for one bronze 8-K filing.
+
+    Built as a plain dict in ``MaterialEvent`` field order: every value comes
+    from ITEM_CODE_MAP or the filing itself, so model validation is skipped.
+    """
+    desc = event.get("description", "")
+    desc_lower = desc.lower()
+    matched_code = "8.01"
+    matched_severity = 2
+    matched_desc = "Other Events"
+    for code, item_needle, code_desc_lower, code_desc, sev in _ITEM_MATCHERS:
+        # Match "Item X.XX" or code at start of description.
+        # Avoids false positives on dates like "2025-01-01" embedded mid-string.
+        if item_needle in desc or desc.startswith(code) or code_desc_lower in desc_lower:
+            matched_code = code
+            matched_severity = sev
+            matched_desc = code_desc
+            break
+    return {
+        "filing_date": event.get("filing_date", ""),
+        "item_code": matched_code,
+        "item_description": matched_desc,
+        "severity": matched_severity,
+        "summary": desc[:200] if desc else "8-K filing",
+    }
 
 
 async def silver_material_events_agent(state: PipelineState) -> dict:
     """Classify 8-K events from bronze filings.
 
     Reads: state.bronze_8k_filings
-    Writes: silver_material_events.csv
+    Writes: silver_material_events.csv, state.silver_material_events_by_code
     """
     ticker = state["ticker"]
     company_info = state.get("company_info")
@@ -101,30 +126,24 @@ async def silver_material_events_agent(state: PipelineState) -> dict:
     if not raw_events:
         return {
             "silver_material_events": [],
+            "silver_material_events_by_code": {},
             "silver_events_path": None,
             "errors": errors,
             "progress_messages": ["Silver events: no bronze 8-K data"],
         }
 
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if api_key:
+    if has_openai_key():
         try:
             events_text = "\n".join(
                 f"- {e['filing_date']}: {e.get('description', 'No description')}"
                 for e in raw_events
             )
-            item_codes_text = "\n".join(
-                f"- {code}: {desc} (default severity {sev})"
-                for code, (desc, sev) in ITEM_CODE_MAP.items()
-            )
-            llm = ChatOpenAI(model="gpt-4o", temperature=0)
-            structured_llm = llm.with_structured_output(EventClassification)
             prompt = EVENT_PROMPT.format(
                 company_name=company_name,
                 events_text=events_text,
-                item_codes=item_codes_text,
+                item_codes=_ITEM_CODES_TEXT,
             )
-            result = await structured_llm.ainvoke(prompt)
+            result = await ainvoke_structured("gpt-4o", 0, EventClassification, prompt)
             classified = [e.model_dump() for e in result.events]
         except Exception as e:
             logger.warning(f"LLM event classification failed: {e}")
@@ -141,6 +160,8 @@ async def silver_material_events_agent(state: PipelineState) -> dict:
 
     return {
         "silver_material_events": classified,
+        # Gold rules look events up by item code; index once here
+        "silver_material_events_by_code": index_events_by_code(classified),
         "silver_events_path": str(path),
         "errors": errors,
         "progress_messages": [f"Classified {len(classified)} material events"],
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
+import re
 
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
+from backend.agents._llm_clients import ainvoke_structured, has_openai_key
 from backend.data.csv_writer import CsvWriter
 from backend.models import PipelineState, RiskFactorItem
 
@@ -18,6 +19,17 @@ RISK_CATEGORIES = [
     "legal", "technology", "macroeconomic", "esg",
 ]
 
+# RISK_CATEGORIES as listed in RISK_NARRATIVE_PROMPT (static, so rendered once)
+_CATEGORIES_TEXT = ", ".join(RISK_CATEGORIES)
+
+# Item 1A is classified in overlapping windows so long disclosures (60K+
+# chars at large financials) are read in full rather than cut off; the
+# overlap keeps a risk that straddles a cut whole in at least one window.
+# Requests share the process-wide cap in ``ainvoke_structured``.
+RISK_CHUNK_CHARS = 15_000
+RISK_CHUNK_OVERLAP = 3_000
+MAX_RISK_FACTORS = 20
+
 
 class RiskFactorAnalysis(BaseModel):
     """LLM structured output: classified risk factors."""
@@ -44,11 +56,70 @@ For each risk factor provide:
 Identify the 15-20 most significant risk factors. Prioritize by severity.
 """
 
+# Per-window prompt for disclosures split by _chunk_risk_text: each window
+# lists everything it covers, and the top MAX_RISK_FACTORS are picked after
+# the merge, instead of every window padding itself out to 15-20 risks.
+RISK_EXCERPT_PROMPT = """You are a senior financial analyst performing due diligence. Below is excerpt {part} of {total} from {company_name}'s 10-K risk factor disclosures (Item 1A). Neighbouring excerpts overlap slightly.
+
+## Item 1A Excerpt
+{risk_text}
+
+## Instructions
+List every distinct risk factor discussed in this excerpt, and nothing that is not discussed in it. Classify each into one of these categories: {categories}
+
+For each risk factor provide:
+1. **category** — from the list above
+2. **title** — short descriptive name (5-10 words)
+3. **summary** — 1-2 sentence explanation of the risk
+4. **severity** — 1 to 5 (1=low impact, 5=existential threat to the business)
+5. **is_novel** — true if this risk appears specific/unique rather than boilerplate
+"""
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+_PLACEHOLDER_FACTOR = RiskFactorItem(
+    category="operational", title="General Business Risk",
+    summary="Risk factors were identified but require LLM for classification.",
+    severity=3, is_novel=False,
+)
+
+
+def _chunk_risk_text(text: str) -> list[str]:
+    """Split *text* into RISK_CHUNK_CHARS windows overlapping by RISK_CHUNK_OVERLAP.
+
+    The last window is anchored to the end of the text, so it is full-size
+    rather than a short tail that the previous window already covers.
+    """
+    if len(text) <= RISK_CHUNK_CHARS:
+        return [text]
+    step = RISK_CHUNK_CHARS - RISK_CHUNK_OVERLAP
+    last = len(text) - RISK_CHUNK_CHARS
+    return [text[i:i + RISK_CHUNK_CHARS] for i in range(0, last, step)] + [text[last:]]
+
+
+def _title_key(title: str) -> str:
+    """*title* lowercased with punctuation and whitespace runs collapsed."""
+    return _NON_ALNUM.sub(" ", title.lower()).strip()
+
+
+def _merge_risk_factors(results: list[RiskFactorAnalysis]) -> list[dict]:
+    """Dedupe per-chunk factors by normalized title, most severe first."""
+    merged: dict[str, RiskFactorItem] = {}
+    for result in results:
+        for factor in result.risk_factors:
+            key = _title_key(factor.title)
+            seen = merged.get(key)
+            if seen is None or factor.severity > seen.severity:
+                merged[key] = factor
+    ranked = sorted(merged.values(), key=lambda f: f.severity, reverse=True)
+    return [f.model_dump() for f in ranked[:MAX_RISK_FACTORS]]
+
 
 async def silver_risk_factors_agent(state: PipelineState) -> dict:
     """Classify risk factors from bronze 10-K text.
 
-    Reads: state.bronze_10k_risk_text
+    Reads: state.bronze_10k_risk_text (releases it once consumed)
     Writes: silver_risk_factors.csv
     """
     ticker = state["ticker"]
@@ -65,38 +136,39 @@ async def silver_risk_factors_agent(state: PipelineState) -> dict:
             "progress_messages": ["Silver risk factors: no bronze 10-K data"],
         }
 
-    # Item 1A from edgartools is typically 15-30K chars, but some companies
-    # (e.g. large financials) can have 60K+ risk disclosures.
-    risk_text_truncated = risk_text[:45000]
-
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not has_openai_key():
         logger.warning("OPENAI_API_KEY not set, generating placeholder risk factors")
-        factors = [RiskFactorItem(
-            category="operational", title="General Business Risk",
-            summary="Risk factors were identified but require LLM for classification.",
-            severity=3, is_novel=False,
-        ).model_dump()]
+        factors = [_PLACEHOLDER_FACTOR.model_dump()]
         errors.append("Risk factors used placeholder mode (no API key)")
     else:
-        llm = ChatOpenAI(model="gpt-4o", temperature=0)
-        structured_llm = llm.with_structured_output(RiskFactorAnalysis)
-        prompt = RISK_NARRATIVE_PROMPT.format(
-            company_name=company_name,
-            risk_text=risk_text_truncated,
-            categories=", ".join(RISK_CATEGORIES),
+        chunks = _chunk_risk_text(risk_text)
+        if len(chunks) == 1:
+            prompts = [
+                RISK_NARRATIVE_PROMPT.format(
+                    company_name=company_name, risk_text=risk_text, categories=_CATEGORIES_TEXT,
+                )
+            ]
+        else:
+            prompts = [
+                RISK_EXCERPT_PROMPT.format(
+                    part=i, total=len(chunks), company_name=company_name,
+                    risk_text=chunk, categories=_CATEGORIES_TEXT,
+                )
+                for i, chunk in enumerate(chunks, 1)
+            ]
+        results = await asyncio.gather(
+            *(ainvoke_structured("gpt-4o", 0, RiskFactorAnalysis, prompt) for prompt in prompts),
+            return_exceptions=True,
         )
-        try:
-            result = await structured_llm.ainvoke(prompt)
-            factors = [f.model_dump() for f in result.risk_factors]
-        except Exception as e:
-            logger.error(f"LLM risk narrative failed: {e}")
-            factors = [RiskFactorItem(
-                category="operational", title="General Business Risk",
-                summary="Risk factors were identified but require LLM for classification.",
-                severity=3, is_novel=False,
-            ).model_dump()]
-            errors.append(f"Risk factors LLM failed: {e}")
+        analyses = [r for r in results if not isinstance(r, BaseException)]
+        for i, r in enumerate(results, 1):
+            if isinstance(r, BaseException):
+                logger.error(f"LLM risk narrative failed on chunk {i}/{len(chunks)}: {r}")
+                errors.append(f"Risk factors LLM failed on chunk {i}/{len(chunks)}: {r}")
+        if analyses:
+            factors = _merge_risk_factors(analyses)
+        else:
+            factors = [_PLACEHOLDER_FACTOR.model_dump()]
 
     writer = CsvWriter(ticker)
     path = writer.write_silver("risk_factors", factors, source_bronze="bronze_10k_risk_text.csv")
@@ -104,6 +176,9 @@ async def silver_risk_factors_agent(state: PipelineState) -> dict:
     return {
         "silver_risk_factors": factors,
         "silver_risk_factors_path": str(path),
+        # This agent is the 10-K text's only reader: drop it from state now
+        # (it stays on disk in bronze_10k_risk_text.csv)
+        "bronze_10k_risk_text": "",
         "errors": errors,
         "progress_messages": [f"Classified {len(factors)} risk factors"],
     }
@@ -4,15 +4,26 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import re
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 
+from backend.agents._llm_clients import aclose_http_client
+from backend.data.csv_writer import DEFAULT_OUTPUT_DIR
+from backend.data.edgar_client import get_shared_client
 from backend.graph import run_pipeline
 from backend.models import PipelineProgress
 
@@ -21,10 +32,35 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class OrjsonResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson.
+
+    Results payloads carry every silver/gold table for a run; orjson encodes
+    them several times faster than the stdlib encoder. Kept local because
+    FastAPI's own ``ORJSONResponse`` is deprecated.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Close the shared OpenAI and EDGAR connection pools on shutdown."""
+    yield
+    await aclose_http_client()
+    await get_shared_client().aclose()
+
+
 app = FastAPI(
     title="DiligenceOps API",
     description="AI-Powered Multi-Workstream Due Diligence Pipeline for M&A",
     version="0.3.0",
+    default_response_class=OrjsonResponse,
+    lifespan=_lifespan,
 )
 
 app.add_middleware(
@@ -36,8 +72,73 @@ app.add_middleware(
 )
 
 # In-memory stores
-_runs: dict[str, dict] = {}  # run_id → {state, status, ticker}
-_ws_connections: dict[str, list[WebSocket]] = {}  # run_id → [websockets]
+_runs: OrderedDict[str, dict] = OrderedDict()  # run_id → {state, status, ticker}, LRU order
+_ws_connections: dict[str, set[WebSocket]] = {}  # run_id → {websockets}
+
+WS_SEND_TIMEOUT = 2.0  # seconds before a stalled WebSocket client is dropped
+
+# Finished runs kept in memory; older ones are evicted to RUNS_DIR and
+# reloaded on demand, so resident memory no longer grows with every run.
+# Runs expire RUN_TTL_SECONDS after they finish, in memory and on disk.
+MAX_RUNS_IN_MEMORY = 128
+RUN_TTL_SECONDS = 3600
+RUNS_DIR = Path(DEFAULT_OUTPUT_DIR) / ".runs"
+_RUN_ID_RE = re.compile(r"^[\w-]+$")
+
+# 1-5 letter symbol plus an optional share-class suffix, e.g. "BRK-B"
+_TICKER_RE = re.compile(r"^[A-Z]{1,5}(?:-[A-Z])?$")
+
+
+# Downloadable file key → PipelineState path field, all layers
+_FILE_KEY_TO_STATE: tuple[tuple[str, str], ...] = (
+    # Bronze
+    ("bronze_company_info", "bronze_company_info_path"),
+    ("bronze_xbrl_facts", "bronze_xbrl_facts_path"),
+    ("bronze_10k_risk_text", "bronze_10k_risk_text_path"),
+    ("bronze_form4_transactions", "bronze_form4_path"),
+    ("bronze_13f_holdings", "bronze_13f_path"),
+    ("bronze_8k_filings", "bronze_8k_path"),
+    ("bronze_def14a_proxy", "bronze_def14a_path"),
+    # Silver
+    ("silver_financial_kpis", "silver_kpis_path"),
+    ("silver_risk_factors", "silver_risk_factors_path"),
+    ("silver_insider_transactions", "silver_insider_trades_path"),
+    ("silver_institutional_holders", "silver_institutional_path"),
+    ("silver_material_events", "silver_events_path"),
+    ("silver_governance", "silver_governance_path"),
+    # Gold
+    ("gold_risk_assessment", "gold_risk_path"),
+    ("gold_cross_workstream_flags", "gold_cross_workstream_path"),
+    # Results
+    ("results_diligence_memo", "result_memo_path"),
+    ("memo_md", "result_memo_path"),
+)
+
+
+def _build_file_map(state: dict) -> dict[str, str | None]:
+    """Map each downloadable file key to its output path in *state*."""
+    return {key: state.get(field) for key, field in _FILE_KEY_TO_STATE}
+
+
+# Silver insider trade fields renamed to the frontend's names:
+# (frontend key, silver field, default)
+_TRADE_VIEW_FIELDS: tuple[tuple[str, str, object], ...] = (
+    ("insider_name", "insider_name", ""),
+    ("title", "insider_title", ""),
+    ("tx_date", "transaction_date", ""),
+    ("tx_code", "transaction_code", ""),
+    ("shares", "shares", 0),
+    ("price", "price_per_share", None),
+    ("value", "value", None),
+)
+
+
+def _insider_trades_view(trades: list[dict]) -> list[dict]:
+    """Silver insider trades with fields renamed for the frontend."""
+    return [
+        {key: t.get(field, default) for key, field, default in _TRADE_VIEW_FIELDS}
+        for t in trades
+    ]
 
 
 class AnalyzeRequest(BaseModel):
@@ -58,9 +159,10 @@ async def health_check():
 @app.post("/api/analyze", response_model=AnalyzeResponse)
 async def start_analysis(request: AnalyzeRequest):
     """Start a new pipeline analysis for a ticker."""
-    ticker = request.ticker.upper().strip()
-    if not ticker or len(ticker) > 5:
-        return JSONResponse(
+    # SEC's ticker list spells share classes with a dash ("BRK.B" → "BRK-B")
+    ticker = request.ticker.upper().strip().replace(".", "-")
+    if not _TICKER_RE.match(ticker):
+        return OrjsonResponse(
             status_code=400,
             content={"error": "Invalid ticker symbol"},
         )
@@ -86,7 +188,12 @@ async def _execute_pipeline(run_id: str, ticker: str):
             ticker, progress_callback=progress_callback, run_id=run_id
         )
         _runs[run_id]["state"] = state
+        # Built once here: the frontend re-polls results, and the view is static
+        _runs[run_id]["insider_trades_view"] = _insider_trades_view(
+            state.get("silver_insider_trades", [])
+        )
         _runs[run_id]["status"] = "complete"
+        await _retire_run(run_id)
 
         await _broadcast_ws(
             run_id,
@@ -102,6 +209,7 @@ async def _execute_pipeline(run_id: str, ticker: str):
         logger.error(f"Pipeline failed for {ticker}: {e}")
         _runs[run_id]["status"] = "error"
         _runs[run_id]["error"] = str(e)
+        await _retire_run(run_id)
         await _broadcast_ws(
             run_id,
             PipelineProgress(
@@ -114,19 +222,125 @@ async def _execute_pipeline(run_id: str, ticker: str):
         )
 
 
-async def _broadcast_ws(run_id: str, data: dict):
-    """Send data to all WebSocket connections for a run."""
-    import json
+def _run_path(run_id: str) -> Path | None:
+    """On-disk location of a finished run, or None for an unsafe run_id."""
+    return RUNS_DIR / f"{run_id}.json" if _RUN_ID_RE.match(run_id) else None
 
-    connections = _ws_connections.get(run_id, [])
-    dead: list[WebSocket] = []
-    for ws in connections:
-        try:
-            await ws.send_text(json.dumps(data))
-        except Exception:
-            dead.append(ws)
-    for ws in dead:
-        connections.remove(ws)
+
+def _is_expired(finished_at: float | None) -> bool:
+    return finished_at is not None and time.time() - finished_at > RUN_TTL_SECONDS
+
+
+def _expire_run_files() -> None:
+    """Delete persisted runs older than RUN_TTL_SECONDS."""
+    try:
+        with os.scandir(RUNS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and _is_expired(entry.stat().st_mtime):
+                    Path(entry.path).unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+
+
+def _persist_run(run_id: str, run: dict) -> None:
+    """Save a finished run's results payload as JSON, then expire old runs.
+
+    Only the payload is kept (not the PipelineState), so a reload never
+    deserializes anything but JSON.
+    """
+    path = _run_path(run_id)
+    if path is None:
+        return
+    saved = {
+        "ticker": run["ticker"],
+        "status": run["status"],
+        "results": _build_results(run_id, run),
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(
+            orjson.dumps(
+                saved, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        )
+        tmp.replace(path)
+        _expire_run_files()
+    except Exception as e:
+        logger.warning(f"Could not persist run {run_id}: {e}")
+
+
+def _load_run(run_id: str) -> dict | None:
+    path = _run_path(run_id)
+    if path is None or not path.exists():
+        return None
+    try:
+        finished_at = path.stat().st_mtime
+        if _is_expired(finished_at):
+            path.unlink(missing_ok=True)
+            return None
+        run = orjson.loads(path.read_bytes())
+    except Exception as e:
+        logger.warning(f"Could not load run {run_id}: {e}")
+        return None
+    run["finished_at"] = finished_at
+    return run
+
+
+def _evict_finished_runs() -> None:
+    """Drop the least recently used finished runs beyond MAX_RUNS_IN_MEMORY."""
+    excess = len(_runs) - MAX_RUNS_IN_MEMORY
+    if excess <= 0:
+        return
+    finished = [rid for rid, run in _runs.items() if run["status"] != "running"]
+    for rid in finished[:excess]:
+        del _runs[rid]
+
+
+async def _retire_run(run_id: str) -> None:
+    """Persist a finished run to disk, then enforce the in-memory bound."""
+    _runs[run_id]["finished_at"] = time.time()
+    await asyncio.to_thread(_persist_run, run_id, _runs[run_id])
+    _evict_finished_runs()
+
+
+async def _get_run(run_id: str) -> dict | None:
+    """Look up a run in memory, falling back to its persisted copy."""
+    run = _runs.get(run_id)
+    if run is not None:
+        if _is_expired(run.get("finished_at")):
+            del _runs[run_id]
+            return None
+        _runs.move_to_end(run_id)
+        return run
+    run = await asyncio.to_thread(_load_run, run_id)
+    if run is not None:
+        _runs[run_id] = run
+        _evict_finished_runs()
+    return run
+
+
+async def _broadcast_ws(run_id: str, data: dict):
+    """Send data to all WebSocket connections for a run.
+
+    Sends go out concurrently, each capped at WS_SEND_TIMEOUT, so one slow
+    client can't hold up progress for the rest; failed or stalled
+    connections are dropped.
+    """
+    connections = _ws_connections.get(run_id)
+    if not connections:
+        return
+    # Serialize once for every subscriber. Sent as a text frame because the
+    # frontend JSON.parse()s event.data, which would be a Blob for binary.
+    payload = orjson.dumps(data).decode()
+    targets = list(connections)
+    results = await asyncio.gather(
+        *(asyncio.wait_for(ws.send_text(payload), WS_SEND_TIMEOUT) for ws in targets),
+        return_exceptions=True,
+    )
+    for ws, result in zip(targets, results):
+        if isinstance(result, Exception):
+            connections.discard(ws)
 
 
 @app.websocket("/ws/pipeline/{run_id}")
@@ -134,9 +348,7 @@ async def pipeline_ws(websocket: WebSocket, run_id: str):
     """WebSocket endpoint for real-time pipeline progress."""
     await websocket.accept()
 
-    if run_id not in _ws_connections:
-        _ws_connections[run_id] = []
-    _ws_connections[run_id].append(websocket)
+    _ws_connections.setdefault(run_id, set()).add(websocket)
 
     try:
         # Keep connection alive until client disconnects
@@ -146,19 +358,21 @@ async def pipeline_ws(websocket: WebSocket, run_id: str):
     except WebSocketDisconnect:
         pass
     finally:
-        if run_id in _ws_connections:
-            conns = _ws_connections[run_id]
-            if websocket in conns:
-                conns.remove(websocket)
+        conns = _ws_connections.get(run_id)
+        if conns is not None:
+            conns.discard(websocket)
+            if not conns:
+                del _ws_connections[run_id]
 
 
-@app.get("/api/results/{run_id}")
-async def get_results(run_id: str):
-    """Get results for a completed pipeline run."""
-    if run_id not in _runs:
-        return JSONResponse(status_code=404, content={"error": "Run not found"})
+def _build_results(run_id: str, run: dict) -> dict:
+    """The results payload for *run*, as plain JSON data.
+
+    A run reloaded from disk carries the payload saved when it finished.
+    """
+    if "results" in run:
+        return run["results"]
 
-    run = _runs[run_id]
     state = run.get("state")
 
     result = {
@@ -195,20 +409,11 @@ async def get_results(run_id: str):
         insider_signal = state.get("silver_insider_signal")
         result["insider_signal"] = insider_signal if insider_signal else None
 
-        # Transform insider trades to match frontend field names
-        raw_trades = state.get("silver_insider_trades", [])
-        result["insider_trades"] = [
-            {
-                "insider_name": t.get("insider_name", ""),
-                "title": t.get("insider_title", ""),
-                "tx_date": t.get("transaction_date", ""),
-                "tx_code": t.get("transaction_code", ""),
-                "shares": t.get("shares", 0),
-                "price": t.get("price_per_share"),
-                "value": t.get("value"),
-            }
-            for t in raw_trades
-        ]
+        # Renamed for the frontend once at completion (see _execute_pipeline)
+        trades_view = run.get("insider_trades_view")
+        if trades_view is None:
+            trades_view = _insider_trades_view(state.get("silver_insider_trades", []))
+        result["insider_trades"] = trades_view
 
         result["institutional_holders"] = state.get(
             "silver_institutional_holders", []
@@ -225,29 +430,7 @@ async def get_results(run_id: str):
         result["deal_recommendation"] = state.get("deal_recommendation", "")
 
         # File paths — all layers
-        result["files"] = {
-            # Bronze
-            "bronze_company_info": state.get("bronze_company_info_path"),
-            "bronze_xbrl_facts": state.get("bronze_xbrl_facts_path"),
-            "bronze_10k_risk_text": state.get("bronze_10k_risk_text_path"),
-            "bronze_form4_transactions": state.get("bronze_form4_path"),
-            "bronze_13f_holdings": state.get("bronze_13f_path"),
-            "bronze_8k_filings": state.get("bronze_8k_path"),
-            "bronze_def14a_proxy": state.get("bronze_def14a_path"),
-            # Silver
-            "silver_financial_kpis": state.get("silver_kpis_path"),
-            "silver_risk_factors": state.get("silver_risk_factors_path"),
-            "silver_insider_transactions": state.get("silver_insider_trades_path"),
-            "silver_institutional_holders": state.get("silver_institutional_path"),
-            "silver_material_events": state.get("silver_events_path"),
-            "silver_governance": state.get("silver_governance_path"),
-            # Gold
-            "gold_risk_assessment": state.get("gold_risk_path"),
-            "gold_cross_workstream_flags": state.get("gold_cross_workstream_path"),
-            # Results
-            "results_diligence_memo": state.get("result_memo_path"),
-            "memo_md": state.get("result_memo_path"),
-        }
+        result["files"] = _build_file_map(state)
 
         result["confidence"] = state.get("confidence", 0)
         result["errors"] = state.get("errors", [])
@@ -255,46 +438,39 @@ async def get_results(run_id: str):
     return result
 
 
+@app.get("/api/results/{run_id}")
+async def get_results(run_id: str):
+    """Get results for a completed pipeline run."""
+    run = await _get_run(run_id)
+    if run is None:
+        return OrjsonResponse(status_code=404, content={"error": "Run not found"})
+
+    # Returned as a response so FastAPI skips its jsonable_encoder pass over
+    # the whole payload; everything here is already plain JSON data
+    return OrjsonResponse(_build_results(run_id, run))
+
+
 @app.get("/api/download/{run_id}/{file_type}")
 async def download_file(run_id: str, file_type: str):
     """Download a pipeline output file."""
-    if run_id not in _runs:
-        return JSONResponse(status_code=404, content={"error": "Run not found"})
-
-    state = _runs[run_id].get("state")
-    if not state:
-        return JSONResponse(status_code=404, content={"error": "No results available"})
-
-    file_map = {
-        # Bronze
-        "bronze_company_info": state.get("bronze_company_info_path"),
-        "bronze_xbrl_facts": state.get("bronze_xbrl_facts_path"),
-        "bronze_10k_risk_text": state.get("bronze_10k_risk_text_path"),
-        "bronze_form4_transactions": state.get("bronze_form4_path"),
-        "bronze_13f_holdings": state.get("bronze_13f_path"),
-        "bronze_8k_filings": state.get("bronze_8k_path"),
-        "bronze_def14a_proxy": state.get("bronze_def14a_path"),
-        # Silver
-        "silver_financial_kpis": state.get("silver_kpis_path"),
-        "silver_risk_factors": state.get("silver_risk_factors_path"),
-        "silver_insider_transactions": state.get("silver_insider_trades_path"),
-        "silver_institutional_holders": state.get("silver_institutional_path"),
-        "silver_material_events": state.get("silver_events_path"),
-        "silver_governance": state.get("silver_governance_path"),
-        # Gold
-        "gold_risk_assessment": state.get("gold_risk_path"),
-        "gold_cross_workstream_flags": state.get("gold_cross_workstream_path"),
-        # Results
-        "results_diligence_memo": state.get("result_memo_path"),
-        "memo_md": state.get("result_memo_path"),
-    }
+    run = await _get_run(run_id)
+    if run is None:
+        return OrjsonResponse(status_code=404, content={"error": "Run not found"})
+
+    state = run.get("state")
+    if state:
+        file_map = _build_file_map(state)
+    else:
+        file_map = run.get("results", {}).get("files")
+    if not file_map:
+        return OrjsonResponse(status_code=404, content={"error": "No results available"})
 
     path_str = file_map.get(file_type)
     if not path_str:
-        return JSONResponse(status_code=404, content={"error": f"File type '{file_type}' not found"})
+        return OrjsonResponse(status_code=404, content={"error": f"File type '{file_type}' not found"})
 
     path = Path(path_str)
     if not path.exists():
-        return JSONResponse(status_code=404, content={"error": "File not found on disk"})
+        return OrjsonResponse(status_code=404, content={"error": "File not found on disk"})
 
     return FileResponse(path, filename=path.name)
@@ -19,21 +19,125 @@ Output structure:
         gold_cross_workstream_flags.csv
         results_diligence_memo.md
         run_metadata.json
+
+The CSVs are audit artifacts, not an interchange format between layers:
+silver and gold agents read their inputs from the in-memory PipelineState,
+so no stage re-parses these files. That is why they stay CSV (the UI offers
+them as "Bronze/Silver/Gold CSV" downloads) rather than Parquet.
 """
 
 from __future__ import annotations
 
-import json
+import os
+import re
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+# Values are pre-rendered the way pandas writes them and quoting is left off,
+# so the Arrow path produces byte-for-byte the same file as ``to_csv``
+_ARROW_CSV_OPTIONS = pa_csv.WriteOptions(
+    include_header=False, quoting_style="none", eol=os.linesep
+)
+
+# Characters that make pandas (QUOTE_MINIMAL) quote a field
+_NEEDS_QUOTING = r'[,"\r\n]'
+
+# Python's repr switches to exponent notation from here on
+_REPR_EXPONENT_AT = 1e16
+
+
+def _pandas_float_strings(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Render a float column as ``DataFrame.to_csv`` does (``repr``, NaN blank).
+
+    Whole values below 1e16 (almost every XBRL amount) are formatted in
+    bulk as ``"<int>.0"``; only the remainder goes through ``repr``.
+    """
+    whole = pc.fill_null(
+        pc.and_(
+            pc.equal(pc.trunc(column), column),
+            pc.and_(
+                pc.less(pc.abs(column), _REPR_EXPONENT_AT),
+                pc.not_equal(column, 0),  # keeps -0.0 on the repr path
+            ),
+        ),
+        False,
+    )
+    as_int = pc.cast(pc.if_else(whole, column, 0.0), pa.int64())
+    rendered = pc.binary_join_element_wise(pc.cast(as_int, pa.string()), ".0", "")
+    rest = pc.and_(pc.invert(whole), pc.is_valid(column))
+    others = [repr(v) for v in pc.filter(column, rest).to_pylist()]
+    rendered = pc.replace_with_mask(
+        rendered.combine_chunks(), rest.combine_chunks(), pa.array(others, pa.string())
+    )
+    return pc.if_else(pc.is_valid(column), rendered, pa.scalar(None, pa.string()))
+
+
+def _pandas_style_table(table: pa.Table) -> pa.Table | None:
+    """Re-render *table* so Arrow writes what ``to_csv`` would, or ``None``.
+
+    ``None`` means some value would need quoting or has a type whose pandas
+    rendering isn't reproduced here; the caller falls back to pandas.
+    """
+    columns = []
+    for column in table.columns:
+        kind = column.type
+        if pa.types.is_floating(kind):
+            column = _pandas_float_strings(column)
+        elif pa.types.is_boolean(kind):
+            column = pc.if_else(column, "True", "False")
+        elif pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            if pc.any(pc.match_substring_regex(column, _NEEDS_QUOTING)).as_py():
+                return None
+        elif not pa.types.is_integer(kind):
+            return None
+        columns.append(column)
+    return pa.table(columns, names=table.column_names)
+
+
+def _write_csv_arrow(df: pd.DataFrame, path: Path) -> None:
+    """Write ``df`` with Arrow's C++ CSV writer, in ``to_csv``'s exact format.
+
+    Bronze tables (XBRL facts, Form 4 transactions) run to tens of thousands
+    of rows, where Arrow is several times faster than ``DataFrame.to_csv``.
+    Falls back to pandas for empty frames, for object columns Arrow cannot
+    type (e.g. mixed str/number values) and for tables with values pandas
+    would quote, so the output never depends on which writer ran.
+    """
+    # pandas quotes blank fields of a one-column frame, so rows stay visible
+    if (
+        df.empty
+        or len(df.columns) < 2
+        or any(re.search(_NEEDS_QUOTING, str(name)) for name in df.columns)
+    ):
+        df.to_csv(path, index=False)
+        return
+    try:
+        table = _pandas_style_table(pa.Table.from_pandas(df, preserve_index=False))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        table = None
+    if table is None:
+        df.to_csv(path, index=False)
+        return
+    with open(path, "wb") as f:
+        f.write((",".join(map(str, df.columns)) + os.linesep).encode())
+        pa_csv.write_csv(table, f, write_options=_ARROW_CSV_OPTIONS)
+
+
+# Root of every run's artifacts, one subdirectory per ticker
+DEFAULT_OUTPUT_DIR = "pipeline_output"
 
 
 class CsvWriter:
     """Writes pipeline artifacts to per-ticker directory with layer prefixes."""
 
-    def __init__(self, ticker: str, output_dir: str = "pipeline_output"):
+    def __init__(self, ticker: str, output_dir: str = DEFAULT_OUTPUT_DIR):
         self.ticker = ticker.upper().strip()
         self.output_dir = Path(output_dir) / self.ticker
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -60,7 +164,7 @@ class CsvWriter:
             df["source_url"] = source_url
 
         path = self.output_dir / f"bronze_{table_name}.csv"
-        df.to_csv(path, index=False)
+        _write_csv_arrow(df, path)
         return path
 
     # ── Silver Layer ─────────────────────────────────────────────────────
@@ -124,25 +228,23 @@ class CsvWriter:
         errors: list[str] | None = None,
     ) -> Path:
         """Write run metadata JSON."""
-        # Count files by layer
-        all_files = list(self.output_dir.iterdir())
-        bronze_count = sum(1 for f in all_files if f.name.startswith("bronze_"))
-        silver_count = sum(1 for f in all_files if f.name.startswith("silver_"))
-        gold_count = sum(1 for f in all_files if f.name.startswith("gold_"))
-        results_count = sum(1 for f in all_files if f.name.startswith("results_"))
+        # Count files by layer prefix in one directory pass. Counted on disk,
+        # not per instance: every agent writes through its own CsvWriter.
+        with os.scandir(self.output_dir) as entries:
+            layer_counts = Counter(entry.name.partition("_")[0] for entry in entries)
 
         metadata = {
             "run_id": run_id,
             "ticker": self.ticker,
             "started_at": started_at,
             "completed_at": self._now_iso(),
-            "bronze_count": bronze_count,
-            "silver_count": silver_count,
-            "gold_count": gold_count,
-            "results_count": results_count,
+            "bronze_count": layer_counts["bronze"],
+            "silver_count": layer_counts["silver"],
+            "gold_count": layer_counts["gold"],
+            "results_count": layer_counts["results"],
             "errors": errors or [],
         }
 
         path = self.output_dir / "run_metadata.json"
-        path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+        path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
         return path
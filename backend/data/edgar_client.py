@@ -4,67 +4,171 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 
 import httpx
+import orjson
 import pandas as pd
 
+from backend.data.http_cache import DEFAULT_CACHE_DIR, ResponseCache
+from backend.data.rate_limit import SEC_THROTTLE
 from backend.models import CompanyInfo, FinancialFact
 
 logger = logging.getLogger(__name__)
 
-# SEC EDGAR rate limit: 10 requests/second
-_RATE_LIMIT = asyncio.Semaphore(10)
 _MAX_RETRIES = 3
+# How long a cached response is served without asking SEC at all: the
+# ticker map changes rarely, filings indexes at most a few times a day
+_TICKERS_TTL = 24 * 3600.0  # seconds
+_FILINGS_TTL = 6 * 3600.0
 _BACKOFF_BASE = 1.0  # seconds
+# Request rate is paced by SEC_THROTTLE (10 req/s); in-flight requests are
+# capped by the pool, and retry backoff no longer holds a concurrency slot
+_POOL_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+
+# Column dtypes for reading bronze_xbrl_facts.csv back into FinancialFacts
+_BRONZE_FACT_DTYPES = {
+    field: str for field in FinancialFact.model_fields if field not in ("value", "fy")
+} | {"value": "float64", "fy": "int64"}
+# Nullable text fields, written to CSV as blanks
+_OPTIONAL_FACT_FIELDS = ("start", "frame")
 
 
 class EdgarClientError(Exception):
     """Raised when an EDGAR API request fails."""
 
 
+def _iter_facts(data: dict) -> Iterator[FinancialFact]:
+    """Walk a companyfacts payload, yielding 10-K facts from us-gaap and dei."""
+    for taxonomy in ("us-gaap", "dei"):
+        taxonomy_data = data.get("facts", {}).get(taxonomy, {})
+        for tag_name, tag_data in taxonomy_data.items():
+            label = tag_data.get("label") or tag_name
+            for unit_type, entries in tag_data.get("units", {}).items():
+                for entry in entries:
+                    # Only keep 10-K annual filings
+                    if entry.get("form") != "10-K":
+                        continue
+                    try:
+                        yield FinancialFact(
+                            tag=tag_name,
+                            label=label,
+                            value=float(entry["val"]),
+                            unit=unit_type,
+                            start=entry.get("start"),
+                            end=entry["end"],
+                            fy=entry["fy"],
+                            fp=entry.get("fp", "FY"),
+                            form=entry["form"],
+                            filed=entry["filed"],
+                            accession=entry["accn"],
+                            frame=entry.get("frame"),
+                            taxonomy=taxonomy,
+                        )
+                    except (KeyError, ValueError, TypeError) as e:
+                        logger.warning(f"Skipping malformed fact {tag_name}: {e}")
+
+
 class EdgarClient:
     """Async client for SEC EDGAR XBRL and submissions APIs."""
 
     BASE_URL = "https://data.sec.gov"
     TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 
-    def __init__(self, user_agent: str = "DiligenceOps/0.1 (contact@example.com)"):
+    def __init__(
+        self,
+        user_agent: str = "DiligenceOps/0.1 (contact@example.com)",
+        cache_dir: str | Path | None = DEFAULT_CACHE_DIR,
+    ):
         self.user_agent = user_agent
+        # Conditional-GET response cache; cache_dir=None disables it
+        self._cache = ResponseCache(cache_dir) if cache_dir is not None else None
         self._tickers_cache: dict[str, dict] | None = None
+        self._http_client: httpx.AsyncClient | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
 
     def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
-            headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"},
-            timeout=30.0,
-        )
+        """Return the keep-alive session, rebuilding it if the event loop changed.
+
+        httpx pools are bound to the loop that opened their connections, so a
+        client reused by a later ``asyncio.run`` gets a fresh session.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._http_client is None
+            or self._http_client.is_closed
+            or self._http_loop is not loop
+        ):
+            self._http_client = httpx.AsyncClient(
+                headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"},
+                timeout=30.0,
+                limits=_POOL_LIMITS,
+            )
+            self._http_loop = loop
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._http_loop = None
 
-    async def _get_json(self, url: str) -> dict:
-        """Fetch JSON with rate limiting and exponential backoff."""
+    async def __aenter__(self) -> EdgarClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def _get_json(self, url: str, *, force_refresh: bool = False) -> dict:
+        """Fetch JSON, paced by the shared SEC throttle, with exponential backoff.
+
+        A cached copy younger than its TTL is returned without a request
+        unless ``force_refresh`` is set. An older copy is revalidated with a
+        conditional GET, and a 304 reply is served from the cache.
+        """
+        cached = self._cache.get(url) if self._cache else None
+        if cached is not None and not force_refresh:
+            ttl = _TICKERS_TTL if url == self.TICKERS_URL else _FILINGS_TTL
+            if cached.is_fresh(ttl):
+                return orjson.loads(cached.body)
+        headers = cached.conditional_headers() if cached else {}
         for attempt in range(_MAX_RETRIES):
-            async with _RATE_LIMIT:
-                async with self._client() as client:
-                    try:
-                        resp = await client.get(url)
-                        if resp.status_code == 429:
-                            wait = _BACKOFF_BASE * (2**attempt)
-                            logger.warning(f"Rate limited, retrying in {wait}s...")
-                            await asyncio.sleep(wait)
-                            continue
-                        resp.raise_for_status()
-                        return resp.json()
-                    except httpx.HTTPStatusError as e:
-                        if attempt == _MAX_RETRIES - 1:
-                            raise EdgarClientError(
-                                f"EDGAR API error {e.response.status_code}: {url}"
-                            ) from e
-                        await asyncio.sleep(_BACKOFF_BASE * (2**attempt))
-                    except httpx.RequestError as e:
-                        if attempt == _MAX_RETRIES - 1:
-                            raise EdgarClientError(
-                                f"Network error fetching {url}: {e}"
-                            ) from e
-                        await asyncio.sleep(_BACKOFF_BASE * (2**attempt))
+            try:
+                async with SEC_THROTTLE:
+                    resp = await self._client().get(url, headers=headers)
+                if resp.status_code == 304 and cached is not None:
+                    self._cache.touch(url)
+                    return orjson.loads(cached.body)
+                if resp.status_code == 429:
+                    wait = _BACKOFF_BASE * (2**attempt)
+                    logger.warning(f"Rate limited, retrying in {wait}s...")
+                    await asyncio.sleep(wait)
+                    continue
+                resp.raise_for_status()
+                if self._cache:
+                    self._cache.put(
+                        url,
+                        resp.content,
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
+                    )
+                # orjson parses the raw bytes directly; companyfacts
+                # payloads run to tens of MB for large filers
+                return orjson.loads(resp.content)
+            except httpx.HTTPStatusError as e:
+                if attempt == _MAX_RETRIES - 1:
+                    raise EdgarClientError(
+                        f"EDGAR API error {e.response.status_code}: {url}"
+                    ) from e
+                await asyncio.sleep(_BACKOFF_BASE * (2**attempt))
+            except httpx.RequestError as e:
+                if attempt == _MAX_RETRIES - 1:
+                    raise EdgarClientError(
+                        f"Network error fetching {url}: {e}"
+                    ) from e
+                await asyncio.sleep(_BACKOFF_BASE * (2**attempt))
         raise EdgarClientError(f"Max retries exceeded for {url}")
 
     async def _load_tickers(self) -> dict[str, dict]:
@@ -117,46 +221,24 @@ class EdgarClient:
             latest_10k_date=latest_10k_date,
         )
 
+    async def iter_company_facts(self, cik: str) -> AsyncIterator[FinancialFact]:
+        """Yield 10-K XBRL facts for ``cik`` one at a time.
+
+        Facts are produced lazily from the parsed payload, so consumers that
+        write or aggregate as they go never hold a second full-size list.
+        """
+        url = f"{self.BASE_URL}/api/xbrl/companyfacts/CIK{cik}.json"
+        data = await self._get_json(url)
+        for fact in _iter_facts(data):
+            yield fact
+
     async def get_company_facts(self, cik: str) -> list[FinancialFact]:
         """
         Fetch all XBRL company facts and return as FinancialFact list.
 
         Filters to 10-K (annual) filings only from us-gaap and dei taxonomies.
         """
-        url = f"{self.BASE_URL}/api/xbrl/companyfacts/CIK{cik}.json"
-        data = await self._get_json(url)
-
-        facts: list[FinancialFact] = []
-        for taxonomy in ("us-gaap", "dei"):
-            taxonomy_data = data.get("facts", {}).get(taxonomy, {})
-            for tag_name, tag_data in taxonomy_data.items():
-                label = tag_data.get("label") or tag_name
-                for unit_type, entries in tag_data.get("units", {}).items():
-                    for entry in entries:
-                        # Only keep 10-K annual filings
-                        if entry.get("form") != "10-K":
-                            continue
-                        try:
-                            facts.append(
-                                FinancialFact(
-                                    tag=tag_name,
-                                    label=label,
-                                    value=float(entry["val"]),
-                                    unit=unit_type,
-                                    start=entry.get("start"),
-                                    end=entry["end"],
-                                    fy=entry["fy"],
-                                    fp=entry.get("fp", "FY"),
-                                    form=entry["form"],
-                                    filed=entry["filed"],
-                                    accession=entry["accn"],
-                                    frame=entry.get("frame"),
-                                    taxonomy=taxonomy,
-                                )
-                            )
-                        except (KeyError, ValueError, TypeError) as e:
-                            logger.warning(f"Skipping malformed fact {tag_name}: {e}")
-        return facts
+        return [fact async for fact in self.iter_company_facts(cik)]
 
     async def fetch_for_ticker(
         self, ticker: str
@@ -169,27 +251,61 @@ class EdgarClient:
         )
         return company_info, facts
 
+    async def fetch_for_tickers(
+        self, tickers: list[str]
+    ) -> list[tuple[CompanyInfo, list[FinancialFact]] | EdgarClientError]:
+        """``fetch_for_ticker`` for many tickers at once, in input order.
+
+        All requests are issued concurrently and paced by SEC_THROTTLE, so the
+        batch takes roughly (requests / 10) seconds rather than the sum of
+        per-ticker latencies. A ticker that fails yields its
+        ``EdgarClientError`` in place of a result instead of aborting the batch.
+        """
+        # Load the ticker map once up front rather than racing N fetches of it
+        await self._load_tickers()
+        results = await asyncio.gather(
+            *(self.fetch_for_ticker(t) for t in tickers), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, EdgarClientError
+            ):
+                raise result
+        return results
+
     @staticmethod
     def load_bronze_csv(path: Path) -> list[FinancialFact]:
         """Load bronze CSV as fallback (offline mode)."""
-        df = pd.read_csv(path)
-        facts = []
-        for _, row in df.iterrows():
-            facts.append(
-                FinancialFact(
-                    tag=row["tag"],
-                    label=row["label"],
-                    value=float(row["value"]),
-                    unit=row["unit"],
-                    start=row.get("start") if pd.notna(row.get("start")) else None,
-                    end=row["end"],
-                    fy=int(row["fy"]),
-                    fp=row["fp"],
-                    form=row["form"],
-                    filed=row["filed"],
-                    accession=row["accession"],
-                    frame=row.get("frame") if pd.notna(row.get("frame")) else None,
-                    taxonomy=row.get("taxonomy", "us-gaap"),
-                )
-            )
-        return facts
+        # Only the FinancialFact columns, typed up front: text stays text (""
+        # for blanks rather than NaN) and value/fy parse straight to numbers
+        df = pd.read_csv(
+            path,
+            usecols=lambda col: col in FinancialFact.model_fields,
+            dtype=_BRONZE_FACT_DTYPES,
+            keep_default_na=False,
+        )
+        # Whole columns as Python lists, zipped row-wise: no per-row Series
+        columns = {col: df[col].tolist() for col in df.columns}
+        for col in _OPTIONAL_FACT_FIELDS:
+            if col in columns:
+                columns[col] = [v or None for v in columns[col]]
+        names = list(columns)
+        return [
+            FinancialFact(**dict(zip(names, row)))
+            for row in zip(*columns.values())
+        ]
+
+
+_shared_client: EdgarClient | None = None
+
+
+def get_shared_client() -> EdgarClient:
+    """Return the process-wide EdgarClient.
+
+    Sharing one instance lets the resolver and XBRL agents reuse the same
+    keep-alive session and the cached ticker→CIK map.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = EdgarClient()
+    return _shared_client
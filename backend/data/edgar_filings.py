@@ -11,11 +11,24 @@ import asyncio
 import logging
 import math
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from functools import partial
 
 logger = logging.getLogger(__name__)
 
+# edgartools blocks on network I/O. The six bronze agents fan out in the same
+# LangGraph superstep, so they get a dedicated pool sized for that fan-out
+# instead of contending with other work on the loop's default executor.
+_EDGAR_MAX_WORKERS = 8
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_EDGAR_MAX_WORKERS, thread_name_prefix="edgartools"
+)
+
+# Per-call fan-out for filing body downloads (Form 4, SC 13G). edgartools'
+# own throttle still caps the aggregate request rate.
+_FILING_FETCH_WORKERS = 8
+
 
 def _safe_float(val) -> float | None:
     """Convert to float, returning None for NaN/Inf/missing values."""
@@ -129,6 +142,55 @@ def extract_proxy_sections(full_text: str, budget: int = 50_000) -> tuple[str, l
     return separator.join(extracted), found_sections
 
 
+def _parse_form4(item: tuple[object, str]) -> list[dict]:
+    """Download one Form 4 filing and flatten its transactions into rows."""
+    filing, filing_date = item
+    rows: list[dict] = []
+    try:
+        form4 = filing.obj()
+
+        # Extract owner info from reporting_owners (plural)
+        owner_name = getattr(form4, "insider_name", "") or ""
+        owner_title = ""
+        if hasattr(form4, "reporting_owners"):
+            for owner in form4.reporting_owners:
+                owner_name = owner_name or getattr(owner, "name", "")
+                owner_title = getattr(owner, "officer_title", "") or ""
+                if not owner_title:
+                    if getattr(owner, "is_director", False):
+                        owner_title = "Director"
+                    elif getattr(owner, "is_ten_pct_owner", False):
+                        owner_title = "10% Owner"
+                break  # Use first owner
+
+        # Non-derivative transactions, then derivative ones (option exercises, etc.)
+        for table_attr in ("non_derivative_table", "derivative_table"):
+            table = getattr(form4, table_attr, None)
+            if not (table and hasattr(table, "has_transactions") and table.has_transactions):
+                continue
+            for txn in table.transactions:
+                shares = _safe_float(txn.shares) if hasattr(txn, "shares") else None
+                shares = shares or 0
+                price = _safe_float(txn.price) if hasattr(txn, "price") else None
+                val = abs(shares * price) if price and shares else None
+                txn_date = str(txn.date) if hasattr(txn, "date") and txn.date else filing_date
+                rows.append({
+                    "insider_name": owner_name,
+                    "insider_title": str(owner_title),
+                    "transaction_date": txn_date,
+                    "transaction_code": getattr(txn, "transaction_code", ""),
+                    "shares": shares,
+                    "price_per_share": price,
+                    "value": val,
+                    "shares_owned_after": _safe_float(txn.remaining) if hasattr(txn, "remaining") else None,
+                    "is_direct": getattr(txn, "direct_indirect", "D") == "D",
+                    "filing_date": filing_date,
+                })
+    except Exception as e:
+        logger.warning(f"Failed to parse Form 4 filing: {e}")
+    return rows
+
+
 class EdgarFilingsError(Exception):
     """Raised when an edgartools operation fails."""
 
@@ -147,9 +209,9 @@ class EdgarFilingsClient:
 
     @staticmethod
     async def _run_sync(fn, *args, **kwargs):
-        """Run a synchronous edgartools call in a thread executor."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, partial(fn, *args, **kwargs))
+        """Run a synchronous edgartools call on the dedicated edgartools pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_EXECUTOR, partial(fn, *args, **kwargs))
 
     async def get_10k_risk_factors(self, ticker: str) -> str:
         """Fetch Item 1A (Risk Factors) text from the latest 10-K filing."""
@@ -193,76 +255,20 @@ class EdgarFilingsClient:
             if not filings:
                 return transactions
 
-            filings_processed = 0
+            # Select the in-window filings first (cheap index metadata), then
+            # download and parse their bodies concurrently
+            selected: list[tuple[object, str]] = []
             for filing in filings:
-                if filings_processed >= max_filings:
+                if len(selected) >= max_filings:
                     break
-                filings_processed += 1
                 filing_date = str(filing.filing_date) if hasattr(filing, "filing_date") else ""
                 if filing_date and filing_date < cutoff_str:
                     break
-                try:
-                    form4 = filing.obj()
-
-                    # Extract owner info from reporting_owners (plural)
-                    owner_name = getattr(form4, "insider_name", "") or ""
-                    owner_title = ""
-                    if hasattr(form4, "reporting_owners"):
-                        for owner in form4.reporting_owners:
-                            owner_name = owner_name or getattr(owner, "name", "")
-                            owner_title = getattr(owner, "officer_title", "") or ""
-                            if not owner_title:
-                                if getattr(owner, "is_director", False):
-                                    owner_title = "Director"
-                                elif getattr(owner, "is_ten_pct_owner", False):
-                                    owner_title = "10% Owner"
-                            break  # Use first owner
-
-                    # Extract non-derivative transactions
-                    ndt = getattr(form4, "non_derivative_table", None)
-                    if ndt and hasattr(ndt, "has_transactions") and ndt.has_transactions:
-                        for txn in ndt.transactions:
-                            shares = _safe_float(txn.shares) if hasattr(txn, "shares") else None
-                            shares = shares or 0
-                            price = _safe_float(txn.price) if hasattr(txn, "price") else None
-                            val = abs(shares * price) if price and shares else None
-                            txn_date = str(txn.date) if hasattr(txn, "date") and txn.date else filing_date
-                            transactions.append({
-                                "insider_name": owner_name,
-                                "insider_title": str(owner_title),
-                                "transaction_date": txn_date,
-                                "transaction_code": getattr(txn, "transaction_code", ""),
-                                "shares": shares,
-                                "price_per_share": price,
-                                "value": val,
-                                "shares_owned_after": _safe_float(txn.remaining) if hasattr(txn, "remaining") else None,
-                                "is_direct": getattr(txn, "direct_indirect", "D") == "D",
-                                "filing_date": filing_date,
-                            })
+                selected.append((filing, filing_date))
 
-                    # Also extract derivative transactions (option exercises, etc.)
-                    dt = getattr(form4, "derivative_table", None)
-                    if dt and hasattr(dt, "has_transactions") and dt.has_transactions:
-                        for txn in dt.transactions:
-                            shares = _safe_float(txn.shares) if hasattr(txn, "shares") else None
-                            shares = shares or 0
-                            price = _safe_float(txn.price) if hasattr(txn, "price") else None
-                            val = abs(shares * price) if price and shares else None
-                            txn_date = str(txn.date) if hasattr(txn, "date") and txn.date else filing_date
-                            transactions.append({
-                                "insider_name": owner_name,
-                                "insider_title": str(owner_title),
-                                "transaction_date": txn_date,
-                                "transaction_code": getattr(txn, "transaction_code", ""),
-                                "shares": shares,
-                                "price_per_share": price,
-                                "value": val,
-                                "shares_owned_after": _safe_float(txn.remaining) if hasattr(txn, "remaining") else None,
-                                "is_direct": getattr(txn, "direct_indirect", "D") == "D",
-                                "filing_date": filing_date,
-                            })
-                except Exception as e:
-                    logger.warning(f"Failed to parse Form 4 filing: {e}")
+            with ThreadPoolExecutor(max_workers=_FILING_FETCH_WORKERS) as pool:
+                for rows in pool.map(_parse_form4, selected):
+                    transactions.extend(rows)
             return transactions
 
         return await self._run_sync(_fetch, ticker, months)
@@ -308,6 +314,29 @@ class EdgarFilingsClient:
                     pass
             return shares, pct
 
+        def _filer_name(filing) -> str | None:
+            """Filer name from the filing header; None if the header fails to load."""
+            try:
+                filer_name = "Unknown"
+                header = filing.header
+                if header and header.filers:
+                    filer_str = str(header.filers[0])
+                    match = re.search(r"([\w\s&,.']+)\s*\[\d+\]", filer_str)
+                    if match:
+                        filer_name = match.group(1).strip()
+                return filer_name
+            except Exception as e:
+                logger.warning(f"Failed to parse SC 13G filing: {e}")
+                return None
+
+        def _filing_text(filing) -> str | None:
+            """First 8K chars of the filing body; None if the download fails."""
+            try:
+                return filing.text()[:8000] if hasattr(filing, "text") else ""
+            except Exception as e:
+                logger.warning(f"Failed to parse SC 13G filing: {e}")
+                return None
+
         def _fetch(t: str) -> list[dict]:
             from edgar import Company
 
@@ -319,46 +348,55 @@ class EdgarFilingsClient:
                 if not filings or len(filings) == 0:
                     return holders
 
-                # Iterate recent filings to collect the latest from each filer.
-                # SC 13G filings are typically filed annually in Feb; we only
-                # need the most recent per institution.  Cap total filings
-                # parsed to avoid excessive SEC requests.
-                max_filings = 30
-                filings_parsed = 0
+                # Collect the latest filing from each filer.  SC 13G filings
+                # are typically filed annually in Feb; we only need the most
+                # recent per institution.  Cap total filings parsed to avoid
+                # excessive SEC requests.  Filings are downloaded in rounds
+                # sized to the holders still missing, so no more headers are
+                # fetched than needed and a failed body is topped up from the
+                # next filings; dedup runs in filing order so "most recent
+                # per filer" is preserved.
+                max_filings, max_holders = 30, 20
+                recent = []
                 for filing in filings:
-                    if len(holders) >= 20 or filings_parsed >= max_filings:
+                    if len(recent) >= max_filings:
                         break
-                    filings_parsed += 1
-                    try:
-                        filer_name = "Unknown"
-                        header = filing.header
-                        if header and header.filers:
-                            filer_str = str(header.filers[0])
-                            match = re.search(r"([\w\s&,.']+)\s*\[\d+\]", filer_str)
-                            if match:
-                                filer_name = match.group(1).strip()
-                        # Deduplicate by filer (keep only the most recent)
-                        filer_key = filer_name.upper()
-                        if filer_key in seen_filers:
-                            continue
-                        seen_filers.add(filer_key)
-
-                        filing_date = str(filing.filing_date) if hasattr(filing, "filing_date") else ""
-                        text = filing.text()[:8000] if hasattr(filing, "text") else ""
-                        shares, pct = _parse_shares_from_text(text)
-
-                        holders.append({
-                            "holder_name": filer_name,
-                            "shares": shares or 0,
-                            "value": None,
-                            "pct_of_portfolio": pct,
-                            "change_shares": None,
-                            "change_pct": None,
-                            "holder_type": "institutional",
-                            "filing_date": filing_date,
-                        })
-                    except Exception as e:
-                        logger.warning(f"Failed to parse SC 13G filing: {e}")
+                    recent.append(filing)
+
+                with ThreadPoolExecutor(max_workers=_FILING_FETCH_WORKERS) as pool:
+                    next_filing = 0
+                    while len(holders) < max_holders and next_filing < len(recent):
+                        batch = recent[next_filing:next_filing + max_holders - len(holders)]
+                        next_filing += len(batch)
+
+                        selected: list[tuple[object, str]] = []
+                        for filing, filer_name in zip(batch, pool.map(_filer_name, batch)):
+                            if filer_name is None:
+                                continue
+                            # Deduplicate by filer (keep only the most recent)
+                            filer_key = filer_name.upper()
+                            if filer_key in seen_filers:
+                                continue
+                            seen_filers.add(filer_key)
+                            selected.append((filing, filer_name))
+
+                        for (filing, filer_name), text in zip(
+                            selected, pool.map(_filing_text, [f for f, _ in selected])
+                        ):
+                            if text is None:
+                                continue
+                            filing_date = str(filing.filing_date) if hasattr(filing, "filing_date") else ""
+                            shares, pct = _parse_shares_from_text(text)
+                            holders.append({
+                                "holder_name": filer_name,
+                                "shares": shares or 0,
+                                "value": None,
+                                "pct_of_portfolio": pct,
+                                "change_shares": None,
+                                "change_pct": None,
+                                "holder_type": "institutional",
+                                "filing_date": filing_date,
+                            })
             except Exception as e:
                 logger.warning(f"Failed to fetch SC 13G holders for {t}: {e}")
             return holders
@@ -419,3 +457,18 @@ class EdgarFilingsClient:
             }
 
         return await self._run_sync(_fetch, ticker)
+
+
+_shared_client: EdgarFilingsClient | None = None
+
+
+def get_shared_client() -> EdgarFilingsClient:
+    """Return the process-wide EdgarFilingsClient.
+
+    edgartools keeps its own global HTTP session; sharing the wrapper means
+    the SEC identity is set once rather than by every bronze agent.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = EdgarFilingsClient()
+    return _shared_client
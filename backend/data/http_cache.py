@@ -0,0 +1,124 @@
+"""On-disk HTTP response cache with conditional revalidation.
+
+EDGAR payloads (company_tickers.json, submissions, companyfacts) rarely change
+between runs. Each cached entry keeps the response body alongside its
+``ETag`` / ``Last-Modified`` validators so a repeat request can be sent as a
+conditional GET; a ``304 Not Modified`` reply then costs a few hundred bytes
+instead of re-downloading multi-MB JSON. Entries younger than the caller's
+TTL are served without any request at all. The file's mtime records when the
+body was last fetched or revalidated.
+
+File layout (one file per URL, named by the SHA-1 of the URL):
+    .cache/edgar/{sha1}.resp   — one JSON header line, then the body bytes
+                                 (gzip-compressed when the header says so)
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(".cache") / "edgar"
+
+# Fast compression: JSON bodies shrink ~10x even at level 1, and a multi-MB
+# companyfacts entry must stay cheaper to load than to re-download
+_GZIP_LEVEL = 1
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cached response body and the validators it was served with."""
+
+    url: str
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0  # Epoch seconds of the last fetch or revalidation
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Whether the entry is younger than ``ttl`` seconds."""
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that turn a GET for this URL into a conditional request."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Stores response bodies on disk, keyed by full URL."""
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.resp"
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Return the cached entry for ``url``, or None on a miss or bad file."""
+        path = self._path(url)
+        try:
+            fetched_at = path.stat().st_mtime
+            raw = path.read_bytes()
+            header_line, body = raw.split(b"\n", 1)
+            header = json.loads(header_line)
+            if header.get("gzip"):
+                body = gzip.decompress(body)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, zlib.error) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+        if header.get("url") != url:
+            return None
+        return CachedResponse(
+            url=url,
+            body=body,
+            etag=header.get("etag"),
+            last_modified=header.get("last_modified"),
+            fetched_at=fetched_at,
+        )
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store a response body, gzip-compressed, stamped as fetched now."""
+        header = json.dumps(
+            {"url": url, "etag": etag, "last_modified": last_modified, "gzip": True}
+        ).encode("utf-8")
+        path = self._path(url)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(
+                header + b"\n" + gzip.compress(body, compresslevel=_GZIP_LEVEL)
+            )
+            os.replace(tmp, path)  # Atomic: readers never see a partial entry
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry for {url}: {e}")
+            tmp.unlink(missing_ok=True)
+
+    def touch(self, url: str) -> None:
+        """Mark the entry for ``url`` as just revalidated (e.g. after a 304)."""
+        try:
+            os.utime(self._path(url))
+        except OSError as e:
+            logger.warning(f"Failed to refresh cache entry for {url}: {e}")
@@ -0,0 +1,83 @@
+"""Persistent exact-match cache for structured LLM responses.
+
+Gold risk scoring and memo generation send prompts that are fully determined
+by the silver outputs, so re-running a ticker whose filings have not changed
+produces byte-identical prompts. Caching the validated Pydantic payload by a
+hash of (model, temperature, schema, prompt) turns those repeat calls into a
+local SQLite lookup instead of a multi-second, token-billed round-trip.
+
+Storage:
+    .cache/llm.sqlite3  — table ``responses(key TEXT PRIMARY KEY, value TEXT)``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CACHE_PATH = Path(".cache") / "llm.sqlite3"
+
+
+def cache_key(model: str, temperature: float, schema: type, prompt: Any) -> str:
+    """SHA-256 over everything that determines the structured response."""
+    payload = json.dumps(
+        [model, temperature, schema.__name__, _prompt_text(prompt)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _prompt_text(prompt: Any) -> Any:
+    """Stable, JSON-serializable form of a string or message-list prompt."""
+    if isinstance(prompt, str):
+        return prompt
+    if isinstance(prompt, (list, tuple)):
+        return [_prompt_text(part) for part in prompt]
+    content = getattr(prompt, "content", None)
+    if content is not None:
+        return [getattr(prompt, "type", type(prompt).__name__), content]
+    return repr(prompt)
+
+
+class LlmCache:
+    """Key/value store of serialized LLM responses backed by SQLite."""
+
+    def __init__(self, path: str | Path = DEFAULT_LLM_CACHE_PATH):
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        return conn
+
+    def get(self, key: str) -> str | None:
+        """Return the stored value for ``key``, or None on a miss or DB error."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key``, replacing any previous entry."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                    (key, value),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
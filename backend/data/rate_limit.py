@@ -0,0 +1,51 @@
+"""Process-wide request pacing for SEC EDGAR endpoints.
+
+SEC fair-access policy caps automated clients at 10 requests/second per IP.
+Every outbound request made by our own HTTP code goes through the shared
+``SEC_THROTTLE`` so concurrent bronze agents cannot burst past that ceiling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class SecThrottle:
+    """Async token bucket: ``rate`` tokens/second, at most ``burst`` banked.
+
+    Each ``acquire`` takes a token immediately and, if the bucket is in
+    deficit, sleeps until that token would have been refilled. The bucket
+    update never awaits, so concurrent callers on one event loop are
+    serialized without a lock and the throttle is not bound to any loop.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until the caller may send one request."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    async def __aenter__(self) -> SecThrottle:
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+# Shared by every EDGAR caller in the process
+SEC_THROTTLE = SecThrottle(rate=10.0)
@@ -9,6 +9,7 @@ v0.3 architecture (bronze → silver → gold → results):
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import Callable
 from typing import Any
@@ -147,6 +148,14 @@ _NODE_META: dict[str, dict[str, Any]] = {
 }
 
 
+# Tickers run concurrently by run_portfolio. Each pipeline issues up to ~8
+# OpenAI calls; the process-wide LLM semaphore keeps the total bounded.
+PORTFOLIO_MAX_CONCURRENCY = 4
+
+# State fields declared with an operator.add reducer in PipelineState
+_APPEND_KEYS = ("errors", "progress_messages")
+
+
 async def run_pipeline(
     ticker: str,
     progress_callback: Callable[[PipelineProgress], Any] | None = None,
@@ -163,7 +172,9 @@ async def run_pipeline(
         Final PipelineState with all results
     """
     state = initial_state(ticker)
-    final_state = state
+    # Accumulate into private copies of the reducer-backed lists so appends
+    # can extend in place instead of re-copying the whole list per node
+    final_state = {**state, **{key: list(state[key]) for key in _APPEND_KEYS}}
 
     async for event in pipeline.astream(state, stream_mode="updates"):
         for node_name, node_output in event.items():
@@ -171,8 +182,8 @@ async def run_pipeline(
             # operator.add reducers for list fields (errors, progress_messages)
             if isinstance(node_output, dict):
                 for key, value in node_output.items():
-                    if key in ("errors", "progress_messages") and isinstance(value, list):
-                        final_state[key] = final_state.get(key, []) + value
+                    if key in _APPEND_KEYS and isinstance(value, list):
+                        final_state[key].extend(value)
                     else:
                         final_state[key] = value
 
@@ -211,3 +222,45 @@ async def run_pipeline(
             await result
 
     return final_state
+
+
+async def run_portfolio(
+    tickers: list[str],
+    progress_callback: Callable[[PipelineProgress], Any] | None = None,
+    max_concurrency: int = PORTFOLIO_MAX_CONCURRENCY,
+) -> dict[str, PipelineState]:
+    """Run the pipeline for several tickers concurrently.
+
+    Pipelines share the process-wide EDGAR throttle and OpenAI clients, so
+    overlapping them fills the idle time one ticker spends waiting on the
+    network without exceeding either rate limit.
+
+    Args:
+        tickers: Stock ticker symbols; duplicates run once
+        progress_callback: Optional callback passed to each run_pipeline call
+        max_concurrency: Max pipelines in flight at once
+
+    Returns:
+        Final PipelineState per ticker, in input order. A ticker whose
+        pipeline raised gets its initial state with the failure in
+        ``errors`` and ``current_stage`` set to ``"error"``.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    unique = list(dict.fromkeys(t.strip().upper() for t in tickers))
+
+    async def _run(ticker: str) -> PipelineState:
+        async with semaphore:
+            try:
+                return await run_pipeline(
+                    ticker, progress_callback=progress_callback, run_id=ticker
+                )
+            except Exception as e:
+                # One failed ticker must not discard the others' results
+                logger.error(f"Pipeline failed for {ticker}: {e}")
+                state = initial_state(ticker)
+                state["errors"] = [f"Pipeline failed: {e}"]
+                state["current_stage"] = "error"
+                return state
+
+    states = await asyncio.gather(*(_run(t) for t in unique))
+    return dict(zip(unique, states))
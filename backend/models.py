@@ -312,7 +312,7 @@ class PipelineState(TypedDict, total=False):
     bronze_facts: list[FinancialFact]
     bronze_company_info_path: str | None
     bronze_xbrl_facts_path: str | None
-    bronze_10k_risk_text: str  # raw Item 1A text
+    bronze_10k_risk_text: str  # raw Item 1A text (cleared by silver_risk_factors)
     bronze_10k_risk_text_path: str | None
     bronze_form4_transactions: list[dict]
     bronze_form4_path: str | None
@@ -320,11 +320,12 @@ class PipelineState(TypedDict, total=False):
     bronze_13f_path: str | None
     bronze_8k_filings: list[dict]
     bronze_8k_path: str | None
-    bronze_def14a_proxy: dict  # {filing_date, text}
+    bronze_def14a_proxy: dict  # {filing_date, text}; text dropped by silver_governance
     bronze_def14a_path: str | None
 
     # ── Silver layer (cleaned, transformed) ──────────────────────────
     silver_kpis: FinancialKPIs | None
+    silver_kpis_summary: str  # _format_kpis_for_prompt(silver_kpis), shared by gold
     silver_kpis_path: str | None
     silver_risk_factors: list[dict]
     silver_risk_factors_path: str | None
@@ -334,6 +335,7 @@ class PipelineState(TypedDict, total=False):
     silver_institutional_holders: list[dict]
     silver_institutional_path: str | None
     silver_material_events: list[dict]
+    silver_material_events_by_code: dict[str, list[dict]]  # same dicts, keyed by item_code
     silver_events_path: str | None
     silver_governance: dict  # GovernanceData as dict
     silver_governance_path: str | None
@@ -357,7 +359,11 @@ class PipelineState(TypedDict, total=False):
 
 
 def initial_state(ticker: str) -> PipelineState:
-    """Create a fresh pipeline state for a ticker."""
+    """Create a fresh pipeline state for a ticker.
+
+    The ticker is normalized (upper-cased, stripped) here once; agents use
+    ``state["ticker"]`` as-is.
+    """
     return PipelineState(
         ticker=ticker.upper().strip(),
         # Bronze
@@ -377,6 +383,7 @@ def initial_state(ticker: str) -> PipelineState:
         bronze_def14a_path=None,
         # Silver
         silver_kpis=None,
+        silver_kpis_summary="",
         silver_kpis_path=None,
         silver_risk_factors=[],
         silver_risk_factors_path=None,
@@ -386,6 +393,7 @@ def initial_state(ticker: str) -> PipelineState:
         silver_institutional_holders=[],
         silver_institutional_path=None,
         silver_material_events=[],
+        silver_material_events_by_code={},
         silver_events_path=None,
         silver_governance={},
         silver_governance_path=None,
@@ -29,7 +29,7 @@ async def test_bronze_resolver_agent(sample_company_info, tmp_path):
 
     state = initial_state("AAPL")
 
-    with patch("backend.agents.bronze.resolver.EdgarClient") as MockClient, \
+    with patch("backend.agents.bronze.resolver.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.resolver.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -54,7 +54,7 @@ async def test_bronze_resolver_offline_fallback():
 
     state = initial_state("AAPL")
 
-    with patch("backend.agents.bronze.resolver.EdgarClient") as MockClient, \
+    with patch("backend.agents.bronze.resolver.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.resolver.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -82,7 +82,7 @@ async def test_bronze_xbrl_agent(sample_company_info, sample_facts, tmp_path):
     state = initial_state("AAPL")
     state["company_info"] = sample_company_info
 
-    with patch("backend.agents.bronze.xbrl_facts.EdgarClient") as MockClient, \
+    with patch("backend.agents.bronze.xbrl_facts.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.xbrl_facts.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -187,6 +187,31 @@ def test_kpi_extraction_derived_metrics(sample_facts):
     assert kpis.free_cash_flow > 0
 
 
+def test_kpi_batch_extraction_matches_per_ticker(sample_facts):
+    """Batched extraction equals per-ticker extraction, including empty inputs."""
+    from backend.agents.silver.financial_kpis import _extract_kpis, extract_kpis_batch
+
+    no_revenue = [f for f in sample_facts if "Revenue" not in f.tag]
+    batch = [sample_facts, [], no_revenue]
+
+    kpis = extract_kpis_batch(batch)
+
+    assert kpis == [_extract_kpis(facts) for facts in batch]
+    assert kpis[1] == FinancialKPIs()
+    assert kpis[2].gross_margin is None
+    assert "gross_margin" not in kpis[2].source_tags
+    assert kpis[2].debt_to_equity == kpis[0].debt_to_equity
+
+
+def test_kpi_extraction_with_prebuilt_index(sample_facts):
+    """A prebuilt fact index gives the same KPIs without rescanning facts."""
+    from backend.agents.silver.financial_kpis import _extract_kpis, _index_facts
+
+    index = _index_facts(sample_facts)
+
+    assert _extract_kpis([], index=index) == _extract_kpis(sample_facts)
+
+
 def test_annual_end_dates_excludes_dei(sample_facts):
     """Verify that DEI facts don't pollute annual end date detection."""
     from backend.agents.silver.financial_kpis import _get_annual_end_dates
@@ -263,6 +288,41 @@ def test_placeholder_risk_scoring(sample_kpis):
     assert liquidity.score >= 3
 
 
+@pytest.mark.asyncio
+async def test_risk_batch_chunks_tickers_and_keeps_order(sample_kpis, sample_risk_assessment):
+    """Batch scoring issues one call per k companies and falls back per chunk."""
+    from backend.agents.gold.risk_assessment import (
+        RiskAssessmentBatch,
+        gold_risk_assessment_batch,
+    )
+
+    states = []
+    for ticker in ("AAA", "BBB", "CCC", "DDD", "EEE"):
+        state = initial_state(ticker)
+        state["silver_kpis"] = sample_kpis
+        states.append(state)
+    states.insert(2, initial_state("NOKPI"))
+
+    async def fake_invoke(model, temperature, schema, prompt):
+        assert schema is RiskAssessmentBatch
+        n = sum(line.startswith("# Company ") for line in prompt[1][1].splitlines())
+        if "EEE" in prompt[1][1]:
+            return RiskAssessmentBatch(assessments=[])  # Wrong count → placeholder
+        return RiskAssessmentBatch(assessments=[sample_risk_assessment] * n)
+
+    invoke = AsyncMock(side_effect=fake_invoke)
+    with patch("backend.agents.gold.risk_assessment.ainvoke_structured", invoke), \
+         patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+        results = await gold_risk_assessment_batch(states, k=2)
+
+    assert invoke.await_count == 3
+    assert results[2] is None
+    assert [r == sample_risk_assessment for r in results] == [
+        True, True, False, True, True, False,
+    ]
+    assert isinstance(results[5], RiskAssessment)
+
+
 # ---------------------------------------------------------------------------
 # Gold: Memo Writer
 # ---------------------------------------------------------------------------
@@ -311,6 +371,73 @@ async def test_gold_memo_handles_missing_data():
     assert result["confidence"] == 0.0
 
 
+@pytest.mark.asyncio
+async def test_memo_escalates_to_next_tier_when_incomplete():
+    """A hollow gpt-4o-mini memo is retried on gpt-4o before being accepted."""
+    from backend.agents.gold.memo_writer import MEMO_MODEL_TIERS, _generate_memo
+
+    hollow = DiligenceMemo(
+        executive_summary="", company_overview="", financial_analysis="",
+        risk_assessment="", key_findings=[], recommendation="",
+    )
+    full = DiligenceMemo(
+        executive_summary="Summary", company_overview="Overview",
+        financial_analysis="Financials", risk_assessment="Risks",
+        key_findings=["Finding"], recommendation="Proceed",
+    )
+    invoke = AsyncMock(side_effect=[hollow, full])
+    store = AsyncMock()
+
+    with patch("backend.agents.gold.memo_writer.lookup_cached", AsyncMock(return_value=None)), \
+         patch("backend.agents.gold.memo_writer.store_cached", store), \
+         patch("backend.agents.gold.memo_writer.ainvoke_structured", invoke):
+        memo = await _generate_memo([("system", "s"), ("human", "h")])
+
+    assert memo is full
+    assert [c.args[0] for c in invoke.await_args_list] == list(MEMO_MODEL_TIERS)
+    assert all(c.args[1] == 0 for c in invoke.await_args_list)
+    # Only the accepted memo is cached under the tier list
+    store.assert_awaited_once()
+    assert store.await_args.args[-1] is full
+
+
+@pytest.mark.asyncio
+async def test_memo_fingerprint_hit_skips_llm():
+    """A memo cached for an identical prompt is returned without any LLM call."""
+    from backend.agents.gold.memo_writer import _generate_memo
+
+    cached = DiligenceMemo(
+        executive_summary="Summary", company_overview="Overview",
+        financial_analysis="Financials", risk_assessment="Risks",
+        key_findings=["Finding"], recommendation="Proceed",
+    )
+    invoke = AsyncMock()
+
+    with patch("backend.agents.gold.memo_writer.lookup_cached", AsyncMock(return_value=cached)), \
+         patch("backend.agents.gold.memo_writer.ainvoke_structured", invoke):
+        memo = await _generate_memo([("system", "s"), ("human", "h")])
+
+    assert memo is cached
+    invoke.assert_not_awaited()
+
+
+def test_memo_prompt_keeps_static_prefix(sample_state_v2):
+    """The LLM memo prompt is a constant system message plus per-ticker data."""
+    from backend.agents.gold.memo_writer import MEMO_V2_SYSTEM_PROMPT, _memo_prompt
+
+    (sys_role, system), (user_role, data) = _memo_prompt(
+        sample_state_v2, "Apple Inc.", "Signal: bullish, Buys: 3, Sells: 1",
+        ["- Vanguard: 1,000 shares (institution)"], [],
+    )
+
+    assert (sys_role, system) == ("system", MEMO_V2_SYSTEM_PROMPT)
+    assert user_role == "human"
+    assert "Apple Inc. (AAPL)" in data
+    assert "Signal: bullish, Buys: 3, Sells: 1, Buy/Sell Ratio:" in data
+    assert "- Vanguard: 1,000 shares (institution)" in data
+    assert "No material events in the past 12 months." in data
+
+
 def test_confidence_calculation(sample_state_v2):
     """Verify confidence scoring logic with full state."""
     from backend.agents.gold.memo_writer import _calculate_confidence, DiligenceMemo
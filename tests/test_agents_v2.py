@@ -33,7 +33,7 @@ async def test_bronze_10k_agent(tmp_path):
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.ten_k.EdgarFilingsClient") as MockClient, \
+    with patch("backend.agents.bronze.ten_k.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.ten_k.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -84,6 +84,48 @@ async def test_silver_risk_factors_no_bronze_data(sample_company_info):
     assert result["silver_risk_factors_path"] is None
 
 
+@pytest.mark.asyncio
+async def test_silver_risk_factors_classifies_long_text_in_chunks(sample_company_info, tmp_path):
+    """Long Item 1A text is classified per chunk and the results merged."""
+    from backend.agents.silver import risk_factors
+    from backend.models import RiskFactorItem
+
+    def item(title, severity):
+        return RiskFactorItem(
+            category="financial", title=title, summary="s", severity=severity, is_novel=False,
+        )
+
+    tail = "Tail-only risk: liquidity coverage shortfall."
+    risk_text = "Risk. " * 8_000 + tail
+    chunks = risk_factors._chunk_risk_text(risk_text)
+    assert len(chunks) > 1
+    assert all(len(c) == risk_factors.RISK_CHUNK_CHARS for c in chunks)
+    assert chunks[-1].endswith(tail)
+
+    responses = [
+        risk_factors.RiskFactorAnalysis(risk_factors=[item("Credit Risk", 3), item("Rates", 2)]),
+        RuntimeError("rate limited"),
+    ] + [
+        risk_factors.RiskFactorAnalysis(risk_factors=[item("Credit-risk.", 4), item("Liquidity", 5)])
+    ] * (len(chunks) - 2)
+    state = _make_state(company_info=sample_company_info, bronze_10k_risk_text=risk_text)
+
+    with patch.object(risk_factors, "ainvoke_structured", AsyncMock(side_effect=responses)) as call, \
+         patch.object(risk_factors, "CsvWriter") as MockWriter, \
+         patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+        MockWriter.return_value.write_silver.return_value = tmp_path / "silver_risk_factors.csv"
+        result = await risk_factors.silver_risk_factors_agent(state)
+
+    assert call.await_count == len(chunks)
+    prompts = [c.args[3] for c in call.await_args_list]
+    assert all("List every distinct risk factor" in p for p in prompts)
+    assert f"excerpt {len(chunks)} of {len(chunks)}" in prompts[-1]
+    assert [(f["title"], f["severity"]) for f in result["silver_risk_factors"]] == [
+        ("Liquidity", 5), ("Credit-risk.", 4), ("Rates", 2),
+    ]
+    assert len(result["errors"]) == 1 and "rate limited" in result["errors"][0]
+
+
 # ---------------------------------------------------------------------------
 # Bronze: Form 4 + Silver: Insider Signal
 # ---------------------------------------------------------------------------
@@ -96,7 +138,7 @@ async def test_bronze_form4_agent(sample_insider_trades, tmp_path):
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.form4.EdgarFilingsClient") as MockClient, \
+    with patch("backend.agents.bronze.form4.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.form4.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -119,7 +161,7 @@ async def test_bronze_form4_edgar_error():
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.form4.EdgarFilingsClient") as MockClient:
+    with patch("backend.agents.bronze.form4.get_shared_client") as MockClient:
         client = MockClient.return_value
         client.get_form4_filings = AsyncMock(side_effect=EdgarFilingsError("timeout"))
 
@@ -218,7 +260,7 @@ async def test_bronze_13f_agent(tmp_path):
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.thirteen_f.EdgarFilingsClient") as MockClient, \
+    with patch("backend.agents.bronze.thirteen_f.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.thirteen_f.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -293,7 +335,7 @@ async def test_bronze_8k_agent(tmp_path):
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.eight_k.EdgarFilingsClient") as MockClient, \
+    with patch("backend.agents.bronze.eight_k.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.eight_k.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -335,6 +377,26 @@ async def test_silver_material_events_rule_based(tmp_path):
     assert "5.02" in codes
 
 
+@pytest.mark.asyncio
+async def test_silver_material_events_llm_falls_back_to_rules(tmp_path):
+    """A failed LLM classification (via the shared limiter) falls back to rules."""
+    from backend.agents.silver import material_events
+
+    raw_events = [{"filing_date": "2025-07-01", "description": "Item 5.02 Departure of CEO"}]
+    state = _make_state(bronze_8k_filings=raw_events)
+
+    with patch.object(material_events, "ainvoke_structured",
+                      AsyncMock(side_effect=RuntimeError("rate limited"))) as call, \
+         patch.object(material_events, "CsvWriter") as MockWriter, \
+         patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+        MockWriter.return_value.write_silver.return_value = tmp_path / "silver_material_events.csv"
+        result = await material_events.silver_material_events_agent(state)
+
+    call.assert_awaited_once()
+    assert [e["item_code"] for e in result["silver_material_events"]] == ["5.02"]
+    assert "rate limited" in result["errors"][0]
+
+
 @pytest.mark.asyncio
 async def test_silver_material_events_no_data():
     """Silver material events handles no bronze 8-K data."""
@@ -363,6 +425,11 @@ def test_rule_based_classify_matches_item_codes():
     assert classified[0]["severity"] == 5
     assert classified[1]["item_code"] == "1.01"
     assert classified[2]["item_code"] == "8.01"  # Default fallback
+    # Rows are built without the model, so check they still round-trip through it
+    from backend.models import MaterialEvent
+
+    assert all(MaterialEvent(**row).model_dump() == row for row in classified)
+    assert list(classified[0]) == list(MaterialEvent.model_fields)
 
 
 # ---------------------------------------------------------------------------
@@ -377,7 +444,7 @@ async def test_bronze_def14a_agent(tmp_path):
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.def14a.EdgarFilingsClient") as MockClient, \
+    with patch("backend.agents.bronze.def14a.get_shared_client") as MockClient, \
          patch("backend.agents.bronze.def14a.CsvWriter") as MockWriter:
 
         client = MockClient.return_value
@@ -400,7 +467,7 @@ async def test_bronze_def14a_edgar_error():
 
     state = _make_state()
 
-    with patch("backend.agents.bronze.def14a.EdgarFilingsClient") as MockClient:
+    with patch("backend.agents.bronze.def14a.get_shared_client") as MockClient:
         client = MockClient.return_value
         client.get_def14a = AsyncMock(side_effect=EdgarFilingsError("Network error"))
 
@@ -433,6 +500,36 @@ async def test_silver_governance_placeholder_mode(sample_company_info, tmp_path)
     assert result["silver_governance_path"] is not None
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n_paragraphs,chunked", [(100, False), (800, True)])
+async def test_silver_governance_single_call_cutoff(
+    sample_company_info, tmp_path, n_paragraphs, chunked
+):
+    """Proxies past SINGLE_CALL_TOKENS use map-reduce, even if they fit one chunk."""
+    from backend.agents.silver import governance
+
+    proxy_text = "\n\n".join(["The board met eight times during fiscal 2024."] * n_paragraphs)
+    assert governance.count_tokens(proxy_text) < governance.CHUNK_TOKENS
+    state = _make_state(
+        company_info=sample_company_info, bronze_def14a_proxy={"text": proxy_text},
+    )
+    structured_llm = MagicMock()
+    structured_llm.ainvoke = AsyncMock(
+        return_value=governance.GovernanceAnalysis(governance=GovernanceData())
+    )
+
+    with patch.object(governance, "get_structured_llm", return_value=structured_llm), \
+         patch.object(governance, "_chunked_extraction",
+                      AsyncMock(return_value=governance._empty_governance())) as chunked_call, \
+         patch.object(governance, "CsvWriter") as MockWriter, \
+         patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+        MockWriter.return_value.write_silver.return_value = tmp_path / "silver_governance.csv"
+        await governance.silver_governance_agent(state)
+
+    assert chunked_call.await_count == int(chunked)
+    assert structured_llm.ainvoke.await_count == int(not chunked)
+
+
 @pytest.mark.asyncio
 async def test_silver_governance_no_proxy_data(sample_company_info):
     """Silver governance returns empty GovernanceData when no bronze DEF 14A text."""
@@ -447,6 +544,248 @@ async def test_silver_governance_no_proxy_data(sample_company_info):
     assert result["silver_governance_path"] is None
 
 
+@pytest.mark.asyncio
+async def test_governance_map_phase_is_concurrency_capped():
+    """Map-phase chunk calls never exceed the semaphore and share one client."""
+    import asyncio
+
+    from backend.agents.silver import governance
+
+    in_flight = peak = 0
+
+    async def fake_ainvoke(prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(content='{"compensation": [], "directors": [], '
+                                 '"neo_compensation": [], "governance": []}')
+
+    map_llm = MagicMock()
+    map_llm.ainvoke = fake_ainvoke
+    errors: list[str] = []
+
+    with patch.object(governance, "_map_llm", return_value=map_llm), \
+         patch.object(governance, "_map_semaphore", return_value=asyncio.Semaphore(2)):
+        result = await governance._chunked_extraction("Apple Inc.", ["x"] * 6, errors)
+
+    assert peak == 2
+    assert result == GovernanceData().model_dump()
+    assert errors == ["Chunked extraction found no governance data"]
+
+
+
+def test_governance_map_cap_and_client_are_per_event_loop():
+    """Back-to-back asyncio.run calls each get their own semaphore and client."""
+    import asyncio
+
+    from backend.agents.silver import governance
+
+    in_flight = peak = 0
+
+    async def fake_ainvoke(prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(content="{}")
+
+    async def run_map():
+        with patch.object(governance, "_map_llm", return_value=MagicMock(ainvoke=fake_ainvoke)):
+            await governance._chunked_extraction("Apple Inc.", ["x"] * 20, [])
+        return governance._map_semaphore(), governance._map_llm()
+
+    with patch.dict("os.environ", {"GOV_MAP_CONCURRENCY": "2", "OPENAI_API_KEY": "sk-test"}):
+        first = asyncio.run(run_map())
+        second = asyncio.run(run_map())
+
+    assert peak == 2
+    assert first[0] is not second[0]
+    assert first[1] is not second[1]
+
+def test_prededuplicate_collapses_repeats_and_keeps_conflicts():
+    """Repeated data points collapse; distinct values survive for the LLM merge."""
+    from backend.agents.silver.governance import _prededuplicate
+
+    combined = {
+        "compensation": [
+            {"field": "ceo_total_comp", "value": 63209845, "year": 2024},
+            {"field": "ceo_total_comp", "value": "63209845", "year": 2024},
+            {"field": "ceo_total_comp", "value": 74609802, "year": 2024},
+        ],
+        "directors": [
+            {"name": "Al Gore", "director_since": 2003, "committees": []},
+            {"name": " al gore", "director_since": 2003, "committees": ["Audit"]},
+            {"name": "Sue Wagner", "director_since": 2014},
+        ],
+        "neo_compensation": [
+            {"name": "Tim Cook", "fiscal_year": 2024, "salary": 3000000},
+            {"name": "Tim Cook", "fiscal_year": [2024], "salary": 3000000},
+        ],
+        "governance": [
+            {"field": "has_poison_pill", "value": False},
+            {"field": "has_poison_pill", "value": "false"},
+        ],
+    }
+
+    deduped = _prededuplicate(combined)
+
+    assert [c["value"] for c in deduped["compensation"]] == [63209845, 74609802]
+    assert len(deduped["directors"]) == 2
+    assert deduped["directors"][0]["committees"] == ["Audit"]
+    assert len(deduped["neo_compensation"]) == 2
+    assert len(deduped["governance"]) == 1
+
+
+def test_parse_json_accepts_bare_and_fenced_replies():
+    from backend.agents.silver.governance import _parse_json
+
+    assert _parse_json('{"directors": []}') == {"directors": []}
+    assert _parse_json('```json\n{"directors": []}\n```') == {"directors": []}
+
+
+def test_build_governance_data_skips_only_invalid_items():
+    from backend.agents.silver.governance import _build_governance_data
+
+    gov = _build_governance_data({
+        "directors": [
+            {"name": "Tim Cook", "age": "63", "committees": []},
+            {"name": "Bad Row", "age": "unknown"},
+            "not a dict",
+            {"name": "Al Gore", "is_independent": True},
+        ],
+        "neo_compensation": [{"name": "Kevan Parekh", "salary": 800000}],
+    })
+
+    assert [d.name for d in gov.directors] == ["Tim Cook", "Al Gore"]
+    assert gov.directors[0].age == 63
+    assert gov.neo_compensation[0].salary == 800000.0
+
+
+def test_split_on_boundaries_prefers_paragraph_breaks():
+    """Chunks end on a paragraph break near the nominal size and lose no text."""
+    from backend.agents.silver.governance import _split_on_boundaries
+
+    paragraph = ("Director bio sentence. " * 40).strip()  # ~900 chars
+    text = "\n\n".join([paragraph] * 40)
+
+    chunks = _split_on_boundaries(text, 5_000, slack=1_000)
+
+    assert "".join(chunks) == text
+    assert all(c.endswith("\n\n") for c in chunks[:-1])
+    assert all(4_000 <= len(c) <= 6_000 for c in chunks[:-1])
+
+
+def test_split_on_boundaries_hard_cuts_unbroken_text():
+    from backend.agents.silver.governance import _split_on_boundaries
+
+    chunks = _split_on_boundaries("x" * 10_500, 5_000, slack=100)
+
+    assert [len(c) for c in chunks] == [5_000, 5_000, 500]
+
+
+def test_split_on_tokens_packs_paragraphs_to_budget():
+    """Whole paragraphs are packed up to the token budget; oversize ones are cut."""
+    from backend.agents._llm_clients import count_tokens
+    from backend.agents.silver.governance import _split_on_tokens
+
+    paragraph = ("The Board met ten times during fiscal 2024. " * 20).strip()
+    huge = "Compensation table row. " * 2_000
+    text = "\n\n".join([paragraph] * 30 + [huge] + [paragraph] * 5)
+    budget = count_tokens(paragraph) * 7
+
+    chunks = _split_on_tokens(text, budget)
+
+    assert "".join(chunks) == text
+    assert all(count_tokens(c) <= budget * 1.1 for c in chunks)
+    assert chunks[0].endswith("2024.\n\n")  # Ends on a whole paragraph
+    assert chunks[0].count("The Board met ten times") >= 20 * 6
+    assert _split_on_tokens("short proxy", budget) == ["short proxy"]
+
+
+@pytest.mark.asyncio
+async def test_governance_single_active_chunk_skips_llm_merge():
+    """When only one chunk yields data, the reduce runs in Python."""
+    import json
+
+    from backend.agents.silver import governance
+
+    payload = {
+        "compensation": [
+            {"field": "ceo_total_comp", "value": "$63,209,845", "year": 2024},
+            {"field": "ceo_total_comp", "value": 60_000_000, "year": 2024},
+            {"field": "ceo_comp_prior", "value": 50_000_000, "year": 2023},
+        ],
+        "directors": [
+            {"name": "Arthur Levinson", "is_independent": True, "role": "Chairman"},
+            {"name": "arthur levinson ", "is_independent": True, "role": "Chairman"},
+            {"name": "Tim Cook", "is_independent": False},
+        ],
+        "neo_compensation": [{"name": "Tim Cook", "title": "CEO", "total_comp": 63209845}],
+        "governance": [
+            {"field": "has_poison_pill", "value": "false"},
+            {"field": "has_staggered_board", "value": False},
+            {"field": "has_staggered_board", "value": "true"},
+            {"field": "anti_takeover_provision", "value": "Supermajority vote"},
+        ],
+    }
+    empty = {key: [] for key in governance._CHUNK_KEYS}
+    responses = iter([json.dumps(payload), json.dumps(empty), json.dumps(empty)])
+
+    async def fake_ainvoke(prompt):
+        return MagicMock(content=next(responses))
+
+    map_llm = MagicMock()
+    map_llm.ainvoke = fake_ainvoke
+
+    with patch.object(governance, "_map_llm", return_value=map_llm), \
+         patch.object(governance, "get_llm") as mock_get_llm:
+        result = await governance._chunked_extraction("Apple Inc.", ["x"] * 3, [])
+
+    mock_get_llm.assert_not_called()
+    assert result["ceo_name"] == "Tim Cook"
+    assert result["ceo_total_comp"] == 63_209_845
+    assert result["ceo_pay_growth"] == pytest.approx(0.264, abs=1e-3)
+    assert result["board_size"] == 2
+    assert result["independent_directors"] == 1
+    assert result["board_independence_pct"] == 0.5
+    assert result["has_poison_pill"] is False
+    assert result["has_staggered_board"] is True
+    assert result["has_dual_class"] is None
+    assert result["anti_takeover_provisions"] == ["Supermajority vote"]
+
+
+def test_governance_deterministic_merge_prefers_latest_year():
+    """Multi-year comp tables reduce to the latest year, with the prior derived."""
+    from backend.agents.silver import governance
+
+    combined = {key: [] for key in governance._CHUNK_KEYS}
+    combined["compensation"] = [
+        {"field": "ceo_total_comp", "value": 74_609_802, "year": 2024},
+        {"field": "ceo_total_comp", "value": 63_209_845, "year": 2023},
+        {"field": "ceo_total_comp", "value": 99_420_097, "year": 2022},
+        {"field": "ceo_pay_ratio", "value": "672:1", "year": 2023},
+        {"field": "ceo_pay_ratio", "value": "533:1", "year": 2024},
+    ]
+    combined["neo_compensation"] = [
+        {"name": "Tim Cook", "title": "CEO", "total_comp": 74_609_802, "fiscal_year": 2024},
+        {"name": "tim cook ", "title": "CEO", "total_comp": 63_209_845, "fiscal_year": 2023},
+        {"name": "Luca Maestri", "title": "CFO", "total_comp": 27_000_000, "fiscal_year": 2023},
+    ]
+
+    result = governance._deterministic_merge(combined)
+
+    assert result["ceo_total_comp"] == 74_609_802
+    assert result["ceo_comp_prior"] == 63_209_845
+    assert result["ceo_pay_growth"] == pytest.approx(74_609_802 / 63_209_845 - 1)
+    assert result["ceo_pay_ratio"] == 533
+    assert [(n["name"], n["fiscal_year"]) for n in result["neo_compensation"]] == [
+        ("Tim Cook", 2024), ("Luca Maestri", 2023),
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Gold: Cross-Workstream
 # ---------------------------------------------------------------------------
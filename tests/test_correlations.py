@@ -62,6 +62,18 @@ def test_rule2_critical_non_reliance(sample_kpis):
     assert any("Non-Reliance" in f["rule_name"] for f in critical_flags)
 
 
+def test_rules_use_silver_event_index(sample_kpis):
+    """Rules read the item-code index emitted by silver_material_events."""
+    event = {"item_code": "4.02", "filing_date": "2025-03-01"}
+    state = _make_state(
+        silver_kpis=sample_kpis,
+        silver_material_events=[event],
+        silver_material_events_by_code={"4.02": [event]},
+    )
+    flags = _evaluate_correlations(state)
+    assert any("Non-Reliance" in f["rule_name"] for f in flags)
+
+
 def test_rule3_high_pay_performance_mismatch(sample_kpis):
     """Rule 3: CEO pay growth >3x revenue growth + Low board independence -> High."""
     state = _make_state(
@@ -149,6 +161,22 @@ def test_no_false_positives_with_clean_data(sample_kpis):
     assert len(flags) == 0
 
 
+def test_flags_match_cross_workstream_flag_schema(sample_kpis):
+    """Flag dicts are built without the model but must stay in its exact shape."""
+    from pydantic import TypeAdapter
+
+    from backend.models import CrossWorkstreamFlag
+
+    state = _make_state(
+        silver_kpis=sample_kpis,
+        silver_material_events=[{"item_code": "4.02", "filing_date": "2025-03-01"}],
+    )
+    flags = _evaluate_correlations(state)
+    assert flags
+    validated = TypeAdapter(list[CrossWorkstreamFlag]).validate_python(flags)
+    assert [f.model_dump() for f in validated] == flags
+
+
 def test_no_flags_with_empty_state():
     """No flags when all workstream data is empty/default."""
     state = initial_state("TEST")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -131,6 +132,31 @@ async def test_fetch_for_ticker(mock_company_tickers, mock_submissions, mock_com
     assert len(facts) > 0
 
 
+@pytest.mark.asyncio
+async def test_fetch_for_tickers(mock_company_tickers, mock_submissions, mock_company_facts):
+    """Batch fetch loads the ticker map once and reports per-ticker failures."""
+    client = EdgarClient()
+    urls: list[str] = []
+
+    async def mock_get_json(url):
+        urls.append(url)
+        if "company_tickers" in url:
+            return mock_company_tickers
+        elif "submissions" in url:
+            return mock_submissions
+        elif "companyfacts" in url:
+            return mock_company_facts
+        raise ValueError(f"Unexpected URL: {url}")
+
+    with patch.object(client, "_get_json", side_effect=mock_get_json):
+        results = await client.fetch_for_tickers(["AAPL", "NOPE", "aapl"])
+
+    assert results[0][0].company_name == "Apple Inc."
+    assert isinstance(results[1], EdgarClientError)
+    assert results[2][0] == results[0][0]
+    assert sum("company_tickers" in u for u in urls) == 1
+
+
 @pytest.mark.asyncio
 async def test_load_bronze_csv(sample_facts, tmp_path):
     """Test roundtrip: write facts to CSV then load them back."""
@@ -144,3 +170,119 @@ async def test_load_bronze_csv(sample_facts, tmp_path):
     assert len(loaded) == len(sample_facts)
     assert loaded[0].tag == sample_facts[0].tag
     assert loaded[0].value == sample_facts[0].value
+
+
+def test_load_bronze_csv_keeps_text_columns_as_text(sample_facts, tmp_path):
+    """Blank optional fields load as None; numeric-looking text stays text."""
+    from backend.data.csv_writer import CsvWriter
+
+    facts = [
+        sample_facts[0].model_copy(update={"start": None, "frame": None, "label": ""}),
+        sample_facts[0].model_copy(update={"accession": "0000320193", "fp": "FY"}),
+    ]
+    writer = CsvWriter("AAPL", output_dir=str(tmp_path))
+    csv_path = writer.write_bronze("xbrl_facts", [f.model_dump() for f in facts])
+
+    assert EdgarClient.load_bronze_csv(csv_path) == facts
+
+
+@pytest.mark.asyncio
+async def test_http_session_reused_across_requests():
+    """One keep-alive session serves every request made on the same loop."""
+    client = EdgarClient()
+    try:
+        assert client._client() is client._client()
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_context_manager_closes_session():
+    async with EdgarClient() as client:
+        session = client._client()
+    assert session.is_closed
+    assert client._http_client is None
+
+
+def test_get_shared_client_is_singleton():
+    from backend.data.edgar_client import get_shared_client
+
+    assert get_shared_client() is get_shared_client()
+
+
+@pytest.mark.asyncio
+async def test_get_json_revalidates_cached_response(tmp_path):
+    """A cached body is revalidated with If-None-Match and served on 304."""
+    import asyncio
+
+    import httpx
+
+    seen_headers: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"name": "Apple Inc."}, headers={"ETag": '"v1"'})
+
+    client = EdgarClient(cache_dir=tmp_path)
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._http_loop = asyncio.get_running_loop()
+    url = "https://data.sec.gov/submissions/CIK1.json"
+    try:
+        first = await client._get_json(url)
+        # Age the entry past its TTL so the next call revalidates
+        os.utime(client._cache._path(url), (0, 0))
+        second = await client._get_json(url)
+    finally:
+        await client.aclose()
+
+    assert first == second == {"name": "Apple Inc."}
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    # The 304 restarted the entry's TTL
+    assert client._cache.get(url).is_fresh(60)
+
+
+@pytest.mark.asyncio
+async def test_get_json_serves_fresh_cache_without_request(tmp_path):
+    """Within the TTL no request is sent, unless force_refresh is set."""
+    import asyncio
+
+    import httpx
+
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"n": len(calls)})
+
+    client = EdgarClient(cache_dir=tmp_path)
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._http_loop = asyncio.get_running_loop()
+    url = "https://data.sec.gov/api/xbrl/companyfacts/CIK1.json"
+    try:
+        first = await client._get_json(url)
+        second = await client._get_json(url)
+        refreshed = await client._get_json(url, force_refresh=True)
+    finally:
+        await client.aclose()
+
+    assert first == second == {"n": 1}
+    assert refreshed == {"n": 2}
+    assert len(calls) == 2
+    # Stored compressed, read back intact
+    raw = client._cache._path(url).read_bytes()
+    assert b'"n"' not in raw.split(b"\n", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_iter_company_facts_matches_list(mock_company_facts):
+    client = EdgarClient()
+    with patch.object(client, "_get_json", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = mock_company_facts
+        streamed = [f async for f in client.iter_company_facts("0000320193")]
+        listed = await client.get_company_facts("0000320193")
+
+    assert streamed == listed
+    assert len(streamed) > 0
@@ -139,3 +139,91 @@ async def test_get_def14a_empty(client):
     """Returns empty dict when no DEF 14A exists."""
     result = await client._run_sync(lambda t: {}, "UNKNOWN")
     assert result == {}
+
+
+# ---------------------------------------------------------------------------
+# _run_sync
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_run_sync_overlaps_bronze_fanout(client):
+    """Six concurrent blocking calls overlap instead of running back-to-back."""
+    import asyncio
+    import threading
+
+    barrier = threading.Barrier(6, timeout=5)
+
+    def _blocking(t: str) -> str:
+        barrier.wait()  # Deadlocks (then times out) unless all six run at once
+        return t
+
+    tickers = ["A", "B", "C", "D", "E", "F"]
+    results = await asyncio.gather(*(client._run_sync(_blocking, t) for t in tickers))
+    assert results == tickers
+
+
+@pytest.mark.asyncio
+async def test_get_form4_filings_parses_concurrently_in_filing_order(client):
+    """Bodies are fetched in parallel but rows keep filing order; both tables parsed."""
+    from types import SimpleNamespace
+
+    def _txn(code: str, shares: float):
+        return SimpleNamespace(
+            shares=shares, price=10.0, date="2025-06-01", transaction_code=code,
+            remaining=1000.0, direct_indirect="D",
+        )
+
+    def _filing(name: str, date: str):
+        form4 = SimpleNamespace(
+            insider_name=name,
+            reporting_owners=[],
+            non_derivative_table=SimpleNamespace(has_transactions=True, transactions=[_txn("S", 100)]),
+            derivative_table=SimpleNamespace(has_transactions=True, transactions=[_txn("M", 50)]),
+        )
+        return SimpleNamespace(filing_date=date, obj=lambda: form4)
+
+    today = __import__("datetime").date.today().isoformat()
+    filings = [_filing("Alice", today), _filing("Bob", today), _filing("Old", "2000-01-01")]
+    company = MagicMock()
+    company.get_filings.return_value = filings
+
+    with patch("edgar.Company", return_value=company):
+        rows = await client.get_form4_filings("AAPL", months=12)
+
+    assert [r["insider_name"] for r in rows] == ["Alice", "Alice", "Bob", "Bob"]
+    assert [r["transaction_code"] for r in rows] == ["S", "M", "S", "M"]
+    assert rows[0]["value"] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_get_institutional_holders_tops_up_failed_downloads(client):
+    """A failed body download is replaced by the next filer; headers load lazily."""
+    headers_loaded: list[int] = []
+
+    class _Filing:
+        def __init__(self, i: int):
+            self.i = i
+            self.filing_date = "2025-02-14"
+
+        @property
+        def header(self):
+            headers_loaded.append(self.i)
+            return MagicMock(filers=[f"Holder {self.i} [{1000 + self.i}]"])
+
+        def text(self):
+            if self.i == 3:
+                raise ConnectionError("download failed")
+            return "9. AGGREGATE AMOUNT BENEFICIALLY OWNED\n 1,500,000\n"
+
+    company = MagicMock()
+    company.get_filings.return_value = [_Filing(i) for i in range(30)]
+
+    with patch("edgar.Company", return_value=company):
+        holders = await client.get_institutional_holders("AAPL")
+
+    assert len(holders) == 20
+    assert "Holder 3" not in {h["holder_name"] for h in holders}
+    assert holders[-1]["holder_name"] == "Holder 20"
+    assert holders[0]["shares"] == 1_500_000
+    assert sorted(headers_loaded) == list(range(21))
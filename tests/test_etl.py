@@ -216,7 +216,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.resolver", tmp_path),
-            patch("backend.agents.bronze.resolver.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.resolver.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.resolver import bronze_resolver_agent
 
@@ -248,7 +248,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.xbrl_facts", tmp_path),
-            patch("backend.agents.bronze.xbrl_facts.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.xbrl_facts.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.xbrl_facts import bronze_xbrl_agent
 
@@ -276,7 +276,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.ten_k", tmp_path),
-            patch("backend.agents.bronze.ten_k.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.ten_k.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.ten_k import bronze_10k_agent
 
@@ -303,7 +303,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.form4", tmp_path),
-            patch("backend.agents.bronze.form4.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.form4.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.form4 import bronze_form4_agent
 
@@ -331,7 +331,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.thirteen_f", tmp_path),
-            patch("backend.agents.bronze.thirteen_f.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.thirteen_f.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.thirteen_f import bronze_13f_agent
 
@@ -358,7 +358,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.eight_k", tmp_path),
-            patch("backend.agents.bronze.eight_k.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.eight_k.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.eight_k import bronze_8k_agent
 
@@ -385,7 +385,7 @@ class TestBronzeLayerCompleteness:
 
         with (
             _patch_csv_writer("backend.agents.bronze.def14a", tmp_path),
-            patch("backend.agents.bronze.def14a.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.def14a.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.def14a import bronze_def14a_agent
 
@@ -401,6 +401,40 @@ class TestBronzeLayerCompleteness:
         assert "ingested_at" in df.columns
         assert "source_url" in df.columns
 
+    def test_bronze_write_handles_mixed_type_columns(self, tmp_path):
+        """Columns Arrow cannot type still round-trip through the pandas fallback."""
+        from backend.data.csv_writer import CsvWriter
+
+        writer = CsvWriter(TICKER, output_dir=str(tmp_path))
+        path = writer.write_bronze(
+            "mixed", [{"a": 1, "b": "x"}, {"a": "two", "b": None}], source_url="test"
+        )
+
+        df = pd.read_csv(path)
+        assert list(df["a"].astype(str)) == ["1", "two"]
+        assert df["source_url"].tolist() == ["test", "test"]
+
+    def test_bronze_csv_bytes_match_pandas_format(self, tmp_path):
+        """The Arrow writer produces the exact bytes ``DataFrame.to_csv`` did."""
+        from backend.data.csv_writer import CsvWriter
+
+        writer = CsvWriter(TICKER, output_dir=str(tmp_path))
+        facts = [
+            {"concept": "Revenues", "value": 391035000000.0, "fy": 2024, "amended": False},
+            {"concept": "EarningsPerShareDiluted", "value": 6.08, "fy": 2024, "amended": True},
+            {"concept": "Goodwill", "value": None, "fy": 2023, "amended": False},
+        ]
+        with patch.object(writer, "_now_iso", return_value="2025-01-01T00:00:00+00:00"):
+            path = writer.write_bronze("xbrl_facts", facts, source_url="https://sec.gov/x")
+
+        ts, url = "2025-01-01T00:00:00+00:00", "https://sec.gov/x"
+        assert path.read_bytes() == (
+            "concept,value,fy,amended,ingested_at,source_url\n"
+            f"Revenues,391035000000.0,2024,False,{ts},{url}\n"
+            f"EarningsPerShareDiluted,6.08,2024,True,{ts},{url}\n"
+            f"Goodwill,,2023,False,{ts},{url}\n"
+        ).encode()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 2. SILVER LAYER COMPLETENESS
@@ -862,6 +896,12 @@ class TestGoldLayerCompleteness:
         content = memo_path.read_text(encoding="utf-8")
         assert "Due Diligence Report" in content
         assert "AAPL" in content
+        for n in range(1, 11):
+            assert f"\n## {n}. " in content
+        # Empty workstreams render their fallback lines
+        assert "No insider trading data available." in content
+        assert "No governance data available." in content
+        assert "No cross-workstream red flags identified." in content
 
     @pytest.mark.asyncio
     async def test_gold_memo_confidence_score(self, tmp_path, monkeypatch):
@@ -1019,7 +1059,7 @@ class TestPipelineStageCompletion:
 
         with (
             _patch_csv_writer("backend.agents.bronze.resolver", tmp_path),
-            patch("backend.agents.bronze.resolver.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.resolver.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.resolver import bronze_resolver_agent
 
@@ -1100,7 +1140,7 @@ class TestPipelineStageCompletion:
 
         with (
             _patch_csv_writer("backend.agents.bronze.resolver", tmp_path),
-            patch("backend.agents.bronze.resolver.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.resolver.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.resolver import bronze_resolver_agent
 
@@ -1175,7 +1215,7 @@ class TestErrorResilience:
 
         with (
             _patch_csv_writer("backend.agents.bronze.resolver", tmp_path),
-            patch("backend.agents.bronze.resolver.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.resolver.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.resolver import bronze_resolver_agent
 
@@ -1215,7 +1255,7 @@ class TestErrorResilience:
 
         with (
             _patch_csv_writer("backend.agents.bronze.ten_k", tmp_path),
-            patch("backend.agents.bronze.ten_k.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.ten_k.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.ten_k import bronze_10k_agent
 
@@ -1236,7 +1276,7 @@ class TestErrorResilience:
 
         with (
             _patch_csv_writer("backend.agents.bronze.form4", tmp_path),
-            patch("backend.agents.bronze.form4.EdgarFilingsClient", return_value=mock_client),
+            patch("backend.agents.bronze.form4.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.form4 import bronze_form4_agent
 
@@ -1338,7 +1378,7 @@ class TestErrorResilience:
 
         with (
             _patch_csv_writer("backend.agents.bronze.resolver", tmp_path),
-            patch("backend.agents.bronze.resolver.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.resolver.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.resolver import bronze_resolver_agent
 
@@ -1483,7 +1523,7 @@ class TestDataTypeValidation:
 
         with (
             _patch_csv_writer("backend.agents.bronze.xbrl_facts", tmp_path),
-            patch("backend.agents.bronze.xbrl_facts.EdgarClient", return_value=mock_client),
+            patch("backend.agents.bronze.xbrl_facts.get_shared_client", return_value=mock_client),
         ):
             from backend.agents.bronze.xbrl_facts import bronze_xbrl_agent
 
@@ -0,0 +1,43 @@
+"""Unit tests for the persistent structured-LLM response cache."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.agents import _llm_clients
+from backend.data.llm_cache import LlmCache, cache_key
+from backend.models import RiskDimension
+
+
+def test_roundtrip_and_miss(tmp_path):
+    cache = LlmCache(tmp_path / "llm.sqlite3")
+    assert cache.get("missing") is None
+    cache.put("k", '{"a": 1}')
+    assert cache.get("k") == '{"a": 1}'
+
+
+def test_key_depends_on_every_input():
+    base = cache_key("gpt-4o", 0, RiskDimension, "prompt")
+    assert base == cache_key("gpt-4o", 0, RiskDimension, "prompt")
+    assert base != cache_key("gpt-4o-mini", 0, RiskDimension, "prompt")
+    assert base != cache_key("gpt-4o", 0.3, RiskDimension, "prompt")
+    assert base != cache_key("gpt-4o", 0, RiskDimension, "prompt!")
+
+
+@pytest.mark.asyncio
+async def test_second_identical_call_is_served_from_cache(tmp_path):
+    dim = RiskDimension(
+        dimension="Financial", score=2, reasoning="ok", key_metrics=["margin"]
+    )
+    runnable = MagicMock()
+    runnable.ainvoke = AsyncMock(return_value=dim)
+
+    with patch.object(_llm_clients, "_LLM_CACHE", LlmCache(tmp_path / "llm.sqlite3")), \
+         patch.object(_llm_clients, "get_structured_llm", return_value=runnable):
+        first = await _llm_clients.ainvoke_structured("gpt-4o", 0, RiskDimension, "p")
+        second = await _llm_clients.ainvoke_structured("gpt-4o", 0, RiskDimension, "p")
+
+    assert runnable.ainvoke.await_count == 1
+    assert second == first
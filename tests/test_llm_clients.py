@@ -0,0 +1,82 @@
+"""Unit tests for the shared LLM helpers: token counting, truncation, clients."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from backend.agents._llm_clients import (
+    LLM_MAX_CONCURRENCY,
+    aclose_http_client,
+    ainvoke_limited,
+    count_tokens,
+    get_http_client,
+    get_structured_llm,
+    truncate_tokens,
+)
+from backend.agents.silver.material_events import EventClassification
+
+
+def test_short_text_is_not_truncated():
+    assert truncate_tokens("Supply chain risk.", 64) == "Supply chain risk."
+
+
+def test_long_text_is_cut_to_budget():
+    text = "The company depends on a small number of suppliers. " * 50
+    cut = truncate_tokens(text, 64)
+    assert cut.endswith("…")
+    assert count_tokens(cut[:-1]) <= 64
+    assert text.startswith(cut[:-1])
+
+
+def test_count_tokens_grows_with_text():
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("revenue") < count_tokens("revenue " * 20)
+
+
+def test_structured_llm_uses_strict_json_schema():
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+        runnable = get_structured_llm("gpt-4o", 0, EventClassification)
+    bound = runnable.first.kwargs
+    assert bound["response_format"] is EventClassification
+    assert bound["ls_structured_output_format"]["kwargs"] == {
+        "method": "json_schema", "strict": True,
+    }
+
+
+class _SlowRunnable:
+    """Records how many ``ainvoke`` calls overlap."""
+
+    def __init__(self):
+        self.active = self.peak = 0
+
+    async def ainvoke(self, prompt):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return prompt
+
+
+def test_llm_cap_holds_across_event_loops():
+    runnable = _SlowRunnable()
+
+    async def burst():
+        return await asyncio.gather(*(ainvoke_limited(runnable, i) for i in range(20)))
+
+    # A second asyncio.run must not reuse the first loop's semaphore
+    for _ in range(2):
+        assert asyncio.run(burst()) == list(range(20))
+    assert runnable.peak == LLM_MAX_CONCURRENCY
+
+
+def test_http_client_is_per_loop_and_closed_on_shutdown():
+    async def open_and_close():
+        client = get_http_client()
+        assert get_http_client() is client
+        await aclose_http_client()
+        return client
+
+    first, second = asyncio.run(open_and_close()), asyncio.run(open_and_close())
+    assert first is not second
+    assert first.is_closed and second.is_closed
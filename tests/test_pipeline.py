@@ -9,6 +9,7 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 
 from backend.models import (
@@ -136,13 +137,13 @@ async def test_full_pipeline_with_mocked_data(tmp_path):
     started_patches = [p.start() for p in csv_patches]
 
     try:
-        with patch("backend.agents.bronze.resolver.EdgarClient", return_value=edgar_mock), \
-             patch("backend.agents.bronze.xbrl_facts.EdgarClient", return_value=edgar_mock), \
-             patch("backend.agents.bronze.ten_k.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.form4.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.thirteen_f.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.eight_k.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.def14a.EdgarFilingsClient", return_value=filings_mock), \
+        with patch("backend.agents.bronze.resolver.get_shared_client", return_value=edgar_mock), \
+             patch("backend.agents.bronze.xbrl_facts.get_shared_client", return_value=edgar_mock), \
+             patch("backend.agents.bronze.ten_k.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.form4.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.thirteen_f.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.eight_k.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.def14a.get_shared_client", return_value=filings_mock), \
              patch.dict("os.environ", {"OPENAI_API_KEY": ""}):
 
             result = await run_pipeline(
@@ -165,11 +166,15 @@ async def test_full_pipeline_with_mocked_data(tmp_path):
     assert len(result["bronze_facts"]) > 0
 
     # Bronze: workstream data populated
-    assert result["bronze_10k_risk_text"] != ""
+    assert result["bronze_10k_risk_text_path"] is not None
     assert len(result["bronze_form4_transactions"]) > 0
     assert len(result["bronze_13f_holdings"]) > 0
     assert len(result["bronze_8k_filings"]) > 0
-    assert result["bronze_def14a_proxy"].get("text") is not None
+    assert result["bronze_def14a_path"] is not None
+
+    # Bronze: large filing text is released once its silver consumer ran
+    assert result["bronze_10k_risk_text"] == ""
+    assert "text" not in result["bronze_def14a_proxy"]
 
     # Silver: KPIs extracted
     kpis = result["silver_kpis"]
@@ -177,6 +182,8 @@ async def test_full_pipeline_with_mocked_data(tmp_path):
     assert kpis.revenue > 0
     assert kpis.net_income > 0
     assert kpis.gross_margin is not None
+    # Formatted once in silver for both gold prompts
+    assert result["silver_kpis_summary"].startswith(f"Fiscal Year: {kpis.fiscal_year}")
 
     # Silver: workstream outputs populated
     assert result.get("silver_risk_factors") is not None
@@ -246,13 +253,13 @@ async def test_pipeline_error_propagation(tmp_path):
     started = [p.start() for p in csv_patches]
 
     try:
-        with patch("backend.agents.bronze.resolver.EdgarClient", return_value=edgar_mock), \
-             patch("backend.agents.bronze.xbrl_facts.EdgarClient", return_value=edgar_mock), \
-             patch("backend.agents.bronze.ten_k.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.form4.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.thirteen_f.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.eight_k.EdgarFilingsClient", return_value=filings_mock), \
-             patch("backend.agents.bronze.def14a.EdgarFilingsClient", return_value=filings_mock), \
+        with patch("backend.agents.bronze.resolver.get_shared_client", return_value=edgar_mock), \
+             patch("backend.agents.bronze.xbrl_facts.get_shared_client", return_value=edgar_mock), \
+             patch("backend.agents.bronze.ten_k.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.form4.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.thirteen_f.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.eight_k.get_shared_client", return_value=filings_mock), \
+             patch("backend.agents.bronze.def14a.get_shared_client", return_value=filings_mock), \
              patch.dict("os.environ", {"OPENAI_API_KEY": ""}):
 
             result = await run_pipeline("AAPL", run_id="test-err")
@@ -264,3 +271,204 @@ async def test_pipeline_error_propagation(tmp_path):
     assert len(result.get("errors", [])) > 0
     assert any("EDGAR" in e or "error" in e.lower() or "resolver" in e.lower()
                for e in result.get("errors", []))
+
+
+@pytest.mark.asyncio
+async def test_run_portfolio_bounds_concurrency():
+    """run_portfolio dedups tickers, caps in-flight pipelines, keeps input order."""
+    import asyncio
+
+    from backend.graph import run_portfolio
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_run_pipeline(ticker, progress_callback=None, run_id=""):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"ticker": ticker}
+
+    with patch("backend.graph.run_pipeline", side_effect=fake_run_pipeline):
+        results = await run_portfolio(
+            ["aapl", "MSFT", "AAPL", "nvda", "goog"], max_concurrency=2
+        )
+
+    assert list(results) == ["AAPL", "MSFT", "NVDA", "GOOG"]
+    assert results["MSFT"]["ticker"] == "MSFT"
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_run_portfolio_keeps_results_when_one_ticker_fails():
+    """A pipeline that raises is recorded as an error state for its ticker only."""
+    from backend.graph import run_portfolio
+
+    async def fake_run_pipeline(ticker, progress_callback=None, run_id=""):
+        if ticker == "MSFT":
+            raise RuntimeError("EDGAR unavailable")
+        return {"ticker": ticker, "errors": [], "current_stage": "complete"}
+
+    with patch("backend.graph.run_pipeline", side_effect=fake_run_pipeline):
+        results = await run_portfolio(["AAPL", "MSFT", "NVDA"])
+
+    assert list(results) == ["AAPL", "MSFT", "NVDA"]
+    assert results["AAPL"]["current_stage"] == "complete"
+    assert results["NVDA"]["current_stage"] == "complete"
+    assert results["MSFT"]["ticker"] == "MSFT"
+    assert results["MSFT"]["current_stage"] == "error"
+    assert results["MSFT"]["errors"] == ["Pipeline failed: EDGAR unavailable"]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_ws_drops_failed_and_stalled_clients():
+    """Progress fans out to every socket; erroring or stalled ones are pruned."""
+    import asyncio
+
+    from backend import api
+
+    async def stall(payload):
+        await asyncio.sleep(10)
+
+    healthy, broken, stalled = MagicMock(), MagicMock(), MagicMock()
+    healthy.send_text = AsyncMock()
+    broken.send_text = AsyncMock(side_effect=RuntimeError("closed"))
+    stalled.send_text = stall
+
+    api._ws_connections["ws-test"] = {healthy, broken, stalled}
+    try:
+        with patch.object(api, "WS_SEND_TIMEOUT", 0.05):
+            await api._broadcast_ws("ws-test", {"stage": "bronze", "progress_pct": 10})
+        assert api._ws_connections["ws-test"] == {healthy}
+    finally:
+        api._ws_connections.pop("ws-test", None)
+
+    healthy.send_text.assert_awaited_once_with('{"stage":"bronze","progress_pct":10}')
+
+
+@pytest.mark.asyncio
+async def test_finished_runs_are_bounded_and_reloaded_from_disk(tmp_path, sample_state_v2):
+    """Finished runs beyond the memory cap are evicted and served from disk."""
+    from backend import api
+
+    kpis_csv = tmp_path / "silver_financial_kpis.csv"
+    kpis_csv.write_text("revenue\n1\n")
+    state = {**sample_state_v2, "silver_kpis_path": str(kpis_csv)}
+    runs_dir = tmp_path / ".runs"
+
+    with patch.object(api, "RUNS_DIR", runs_dir), \
+         patch.object(api, "MAX_RUNS_IN_MEMORY", 1), \
+         patch.object(api, "_runs", api.OrderedDict()):
+        api._runs["run-a"] = {"state": state, "status": "complete", "ticker": "AAPL"}
+        await api._retire_run("run-a")
+        api._runs["run-b"] = {"state": None, "status": "error", "ticker": "MSFT", "error": "x"}
+        await api._retire_run("run-b")
+
+        assert list(api._runs) == ["run-b"]
+        result = orjson.loads((await api.get_results("run-a")).body)
+        assert result["ticker"] == "AAPL"
+        assert result["kpis"] == sample_state_v2["silver_kpis"].model_dump()
+        assert list(api._runs) == ["run-a"]
+        download = await api.download_file("run-a", "silver_financial_kpis")
+        assert download.path == kpis_csv
+
+        assert await api._get_run("../etc/passwd") is None
+        assert sorted(p.name for p in runs_dir.iterdir()) == ["run-a.json", "run-b.json"]
+
+
+@pytest.mark.asyncio
+async def test_finished_runs_expire_after_ttl(tmp_path):
+    """Runs older than RUN_TTL_SECONDS are dropped from memory and disk."""
+    import os
+    import time
+
+    from backend import api
+
+    with patch.object(api, "RUNS_DIR", tmp_path), \
+         patch.object(api, "_runs", api.OrderedDict()):
+        api._runs["run-old"] = {"state": None, "status": "error", "ticker": "AAPL", "error": "x"}
+        await api._retire_run("run-old")
+        stale = time.time() - api.RUN_TTL_SECONDS - 1
+        os.utime(tmp_path / "run-old.json", (stale, stale))
+
+        # A later run sweeps the expired file
+        api._runs["run-new"] = {"state": None, "status": "error", "ticker": "MSFT", "error": "y"}
+        await api._retire_run("run-new")
+        assert [p.name for p in tmp_path.iterdir()] == ["run-new.json"]
+
+        # ...and the in-memory copy expires with it
+        api._runs["run-old"]["finished_at"] = stale
+        assert await api._get_run("run-old") is None
+        assert await api._get_run("run-new") is not None
+
+
+@pytest.mark.asyncio
+async def test_completed_run_precomputes_insider_trades_view(tmp_path, sample_state_v2):
+    """The frontend insider-trade view is built once when the run completes."""
+    from backend import api
+
+    with patch.object(api, "RUNS_DIR", tmp_path), \
+         patch.object(api, "_runs", api.OrderedDict()), \
+         patch.object(api, "run_pipeline", AsyncMock(return_value=sample_state_v2)):
+        api._runs["run-v"] = {"state": None, "status": "running", "ticker": "AAPL"}
+        await api._execute_pipeline("run-v", "AAPL")
+
+        view = api._runs["run-v"]["insider_trades_view"]
+        trade = sample_state_v2["silver_insider_trades"][0]
+        assert view[0] == {
+            "insider_name": trade["insider_name"],
+            "title": trade["insider_title"],
+            "tx_date": trade["transaction_date"],
+            "tx_code": trade["transaction_code"],
+            "shares": trade["shares"],
+            "price": trade["price_per_share"],
+            "value": trade["value"],
+        }
+        result = orjson.loads((await api.get_results("run-v")).body)
+        assert result["insider_trades"] == view
+
+
+@pytest.mark.parametrize("ticker", ["", "TOOLONG", "AA PL", "AAPL1", "../X", "BRK.BB"])
+def test_start_analysis_rejects_invalid_tickers(ticker):
+    """Malformed tickers are rejected before any pipeline work starts."""
+    from fastapi.testclient import TestClient
+
+    from backend import api
+
+    with patch.object(api, "_execute_pipeline") as execute:
+        resp = TestClient(api.app).post("/api/analyze", json={"ticker": ticker})
+
+    assert resp.status_code == 400
+    assert resp.json() == {"error": "Invalid ticker symbol"}
+    execute.assert_not_called()
+
+
+@pytest.mark.parametrize("ticker,expected", [(" aapl ", "AAPL"), ("brk.b", "BRK-B")])
+def test_start_analysis_normalizes_valid_tickers(ticker, expected):
+    from fastapi.testclient import TestClient
+
+    from backend import api
+
+    with patch.object(api, "_execute_pipeline", AsyncMock()), \
+         patch.object(api, "_runs", api.OrderedDict()):
+        resp = TestClient(api.app).post("/api/analyze", json={"ticker": ticker})
+
+    assert resp.status_code == 200
+    assert resp.json()["ticker"] == expected
+
+
+def test_shutdown_closes_shared_http_clients():
+    from fastapi.testclient import TestClient
+
+    from backend import api
+
+    edgar = MagicMock(aclose=AsyncMock())
+    with patch.object(api, "aclose_http_client", AsyncMock()) as close_openai, \
+         patch.object(api, "get_shared_client", return_value=edgar):
+        with TestClient(api.app):
+            pass
+
+    close_openai.assert_awaited_once()
+    edgar.aclose.assert_awaited_once()
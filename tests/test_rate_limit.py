@@ -0,0 +1,42 @@
+"""Unit tests for the SEC request throttle."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from backend.data.rate_limit import SecThrottle
+
+
+@pytest.mark.asyncio
+async def test_first_request_is_immediate():
+    throttle = SecThrottle(rate=10.0)
+    start = time.monotonic()
+    await throttle.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_paced():
+    """Five concurrent acquires at 50/s need at least four refill intervals."""
+    throttle = SecThrottle(rate=50.0)
+    start = time.monotonic()
+    await asyncio.gather(*(throttle.acquire() for _ in range(5)))
+    assert time.monotonic() - start >= 4 / 50 - 0.01
+
+
+@pytest.mark.asyncio
+async def test_burst_allows_banked_tokens():
+    throttle = SecThrottle(rate=1.0, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        async with throttle:
+            pass
+    assert time.monotonic() - start < 0.05
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        SecThrottle(rate=0)